@@ -0,0 +1,296 @@
+"""
+   Bulk market data dumps ::
+
+       python -m bittrex candles --base BTC --interval hour -o btc-hour.ndjson --stats
+       python -m bittrex history --markets BTC-LTC BTC-ETH -f csv -o trades.csv
+       python -m bittrex candles --base USDT -f columnar -o archive --progress usdt.progress
+
+   Markets are fetched by worker threads that share one token bucket, so the
+   combined call rate stays under --calls-per-second.  Rows are written as
+   soon as a market's response arrives.  With --progress, finished markets
+   are recorded in a file and skipped when the same command is run again;
+   NDJSON and CSV output is then appended to instead of overwritten.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    from Queue import Queue
+except ImportError:
+    from queue import Queue
+
+from bittrex.bittrex import Bittrex, API_V1_1, API_V2_0, TICKINTERVAL_ONEMIN, TICKINTERVAL_FIVEMIN, \
+    TICKINTERVAL_THIRTYMIN, TICKINTERVAL_HOUR, TICKINTERVAL_DAY, using_requests_session
+from bittrex.archive import ColumnWriter, SCHEMAS as ARCHIVE_SCHEMAS, MARKET_HISTORY, TIME, DICT, FLOAT
+from bittrex.candles import parse_timestamp
+from bittrex.ratelimit import TokenBucket
+
+CANDLES = 'candles'
+HISTORY = 'history'
+
+NDJSON = 'ndjson'
+CSV = 'csv'
+COLUMNAR = 'columnar'
+
+INTERVALS = {
+    'oneMin': TICKINTERVAL_ONEMIN,
+    'fiveMin': TICKINTERVAL_FIVEMIN,
+    'thirtyMin': TICKINTERVAL_THIRTYMIN,
+    'hour': TICKINTERVAL_HOUR,
+    'day': TICKINTERVAL_DAY,
+}
+
+# columns of the csv and columnar outputs
+SCHEMAS = {
+    CANDLES: [('T', TIME), ('MarketName', DICT), ('O', FLOAT), ('H', FLOAT), ('L', FLOAT), ('C', FLOAT),
+              ('V', FLOAT), ('BV', FLOAT)],
+    HISTORY: ARCHIVE_SCHEMAS[MARKET_HISTORY],
+}
+
+_STOP = object()
+
+
+def fetch_markets(bittrex, base=None):
+    """
+    Names of the active markets, optionally only those of a base currency
+    """
+    response = bittrex.get_markets()
+    if not response['success']:
+        raise Exception('get_markets failed: {}'.format(response['message']))
+    markets = []
+    for market in response['result']:
+        market = market.get('Market', market)
+        if market.get('IsActive') is False:
+            continue
+        if base is None or market['BaseCurrency'] == base.upper():
+            markets.append(market['MarketName'])
+    return sorted(markets)
+
+
+def load_progress(path):
+    """
+    Markets recorded as done in a progress file
+    """
+    if path is None or not os.path.exists(path):
+        return set()
+    with open(path) as infile:
+        return set(line.strip() for line in infile if line.strip())
+
+
+class JsonLinesOutput(object):
+
+    def __init__(self, path, name, schema, append):
+        self.file = open(path, 'a' if append else 'w') if path != '-' else sys.stdout
+
+    def write(self, rows):
+        for row in rows:
+            self.file.write(json.dumps(row))
+            self.file.write('\n')
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class CsvOutput(object):
+
+    def __init__(self, path, name, schema, append):
+        header = not (append and os.path.exists(path) and os.path.getsize(path))
+        self.file = open(path, 'a' if append else 'w') if path != '-' else sys.stdout
+        self.writer = csv.DictWriter(self.file, [name for name, _ in schema], extrasaction='ignore')
+        if header:
+            self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class ColumnarOutput(object):
+    """
+    bittrex.archive files in the output directory, read them back with
+    bittrex.archive.scan
+    """
+
+    def __init__(self, path, name, schema, append):
+        self.writer = ColumnWriter(path, name, schema)
+        self.times = [column for column, kind in schema if kind == TIME]
+
+    def write(self, rows):
+        for row in rows:
+            for column in self.times:
+                row[column] = parse_timestamp(row[column])
+        self.writer.extend(rows)
+        # dump records the market as done once write returns
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+
+
+OUTPUTS = {
+    NDJSON: JsonLinesOutput,
+    CSV: CsvOutput,
+    COLUMNAR: ColumnarOutput,
+}
+
+
+class Stats(object):
+    """
+    Call latencies and row counts of a dump
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.latencies = []
+        self.rows = 0
+        self.errors = 0
+
+    def report(self, out=sys.stderr):
+        elapsed = time.time() - self.started
+        latencies = sorted(self.latencies)
+        calls = len(latencies)
+        out.write('calls: {} ({} failed) in {:.1f}s, {:.2f} calls/s\n'.format(
+            calls, self.errors, elapsed, calls / elapsed if elapsed else 0.0))
+        out.write('rows: {}, {:.0f} rows/s\n'.format(self.rows, self.rows / elapsed if elapsed else 0.0))
+        if latencies:
+            out.write('latency ms: mean {:.0f}, p50 {:.0f}, p95 {:.0f}, max {:.0f}\n'.format(
+                1000 * sum(latencies) / calls, 1000 * latencies[calls // 2],
+                1000 * latencies[min(calls - 1, int(calls * 0.95))], 1000 * latencies[-1]))
+
+
+def _worker(markets, results, fetch, client_options):
+    options = dict(client_options)
+    if 'dispatch' not in options:
+        options['dispatch'] = using_requests_session()
+    bittrex = Bittrex(**options)
+    while True:
+        market = markets.get()
+        if market is _STOP:
+            return
+        started = time.time()
+        try:
+            response = fetch(bittrex, market)
+        except Exception as e:
+            response = {'success': False, 'message': str(e), 'result': None}
+        results.put((market, response, time.time() - started))
+
+
+def _fetch_candles(interval):
+    def fetch(bittrex, market):
+        return bittrex.get_candles(market, interval)
+
+    return fetch
+
+
+def _fetch_history(bittrex, market):
+    return bittrex.get_market_history(market)
+
+
+def dump(markets, fetch, output, client_options, workers=4, progress=None, stats=None):
+    """
+    Fetch every market in worker threads and write the rows of each
+    response to output as it arrives
+
+    :param fetch: called as fetch(bittrex, market) in the workers
+    :type fetch: callable
+    :param client_options: Bittrex arguments of the workers' clients, each
+        gets its own requests session unless a dispatch is given
+    :type client_options: dict
+    :param progress: file recording finished markets
+    :type progress: str
+    :return: markets that failed
+    :rtype: list
+    """
+    stats = stats or Stats()
+    pending, results = Queue(), Queue()
+    for market in markets:
+        pending.put(market)
+    for _ in range(min(workers, len(markets))):
+        pending.put(_STOP)
+        thread = threading.Thread(target=_worker, args=(pending, results, fetch, client_options))
+        thread.daemon = True
+        thread.start()
+
+    failed = []
+    progress_file = open(progress, 'a') if progress else None
+    try:
+        for _ in markets:
+            market, response, latency = results.get()
+            stats.latencies.append(latency)
+            if not response['success']:
+                stats.errors += 1
+                failed.append(market)
+                sys.stderr.write('{}: {}\n'.format(market, response['message']))
+                continue
+            rows = []
+            for row in response['result'] or ():
+                row = dict(row)
+                row['MarketName'] = market
+                rows.append(row)
+            output.write(rows)
+            stats.rows += len(rows)
+            if progress_file is not None:
+                progress_file.write(market + '\n')
+                progress_file.flush()
+    finally:
+        if progress_file is not None:
+            progress_file.close()
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bittrex', description='Bulk Bittrex market data dumps')
+    parser.add_argument('command', choices=(CANDLES, HISTORY))
+    parser.add_argument('--markets', nargs='+', help='markets to dump, ex: BTC-LTC')
+    parser.add_argument('--base', help='dump all active markets of a base currency, ex: BTC')
+    parser.add_argument('--interval', choices=sorted(INTERVALS), default='hour', help='candle interval')
+    parser.add_argument('-f', '--format', choices=sorted(OUTPUTS), default=NDJSON)
+    parser.add_argument('-o', '--output', default='-', help='file, or directory for columnar output')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--calls-per-second', type=float, default=1.0)
+    parser.add_argument('--progress', help='file recording finished markets, to resume interrupted dumps')
+    parser.add_argument('--stats', action='store_true', help='print timing statistics to stderr')
+    args = parser.parse_args(argv)
+
+    if args.format == COLUMNAR and args.output == '-':
+        parser.error('columnar output needs an output directory')
+
+    api_version = API_V2_0 if args.command == CANDLES else API_V1_1
+    limiter = TokenBucket(args.calls_per_second)
+    client_options = {'api_key': None, 'api_secret': None, 'api_version': api_version, 'rate_limiter': limiter}
+
+    markets = args.markets or fetch_markets(Bittrex(**client_options), args.base)
+    done = load_progress(args.progress)
+    markets = [market for market in markets if market not in done]
+
+    if args.command == CANDLES:
+        fetch = _fetch_candles(INTERVALS[args.interval])
+    else:
+        fetch = _fetch_history
+
+    output = OUTPUTS[args.format](args.output, args.command, SCHEMAS[args.command], bool(done))
+
+    stats = Stats()
+    try:
+        failed = dump(markets, fetch, output, client_options, args.workers, args.progress, stats)
+    finally:
+        output.close()
+    if args.stats:
+        stats.report()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
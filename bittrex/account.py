@@ -0,0 +1,304 @@
+"""
+   Client side cache of balances and open orders.
+
+   AccountCache is seeded from get_balances and get_open_orders and then
+   kept current by the trading calls made through it: funds are reserved
+   when an order is placed, released when it is cancelled and removed when
+   they are withdrawn.  Fills happen on the exchange, so the cache is
+   reconciled with the API on a slower cadence, by default in a background
+   thread ::
+
+       account = AccountCache(my_bittrex, reconcile_interval=60).start()
+       if account.available('BTC') >= 0.01:
+           account.buy_limit('BTC-LTC', 1.0, 0.01)
+       account.get_open_orders('BTC-LTC')   # answered from the cache
+"""
+
+import threading
+import time
+
+from bittrex.bittrex import ORDERTYPE_MARKET
+from bittrex.normalize import normalize, flat_balance
+
+DEFAULT_COMMISSION = 0.0025
+
+
+def _response(result):
+    return {'success': True, 'message': '', 'result': result}
+
+
+def _currencies(market):
+    """
+    (base currency, market currency) of a market, ex: BTC-LTC -> (BTC, LTC)
+    """
+    base, currency = market.split('-', 1)
+    return base, currency
+
+
+class AccountCache(object):
+    """
+    Balances and open orders of one account, updated optimistically by the
+    trading calls made through the cache.
+
+    A currency whose effect could not be computed, e.g. after a market
+    order, is marked stale and fetched again on its next get_balance.
+    Fills are only seen at the next refresh, until then a cancel releases
+    the remaining quantity known to the cache.  Updates made while a
+    refresh is in flight are applied again to the fetched state; when it is
+    unknown whether the fetched state already holds one, the cache errs
+    towards reporting less available.
+    Until a refresh succeeded, reads return the failed response of the API.
+    Balances and orders are returned in the v1.1 layout; they are shared
+    with the cache and must not be modified.
+    """
+
+    def __init__(self, bittrex, reconcile_interval=60.0, commission=DEFAULT_COMMISSION, clock=time.time):
+        self.bittrex = bittrex
+        self.reconcile_interval = reconcile_interval
+        self.commission = commission
+        self.clock = clock
+        self.balances = {}
+        self.orders = {}
+        self.refreshed = None
+        self.stale = set()
+        self.updates = 0  # optimistic updates since the last refresh
+        self.generation = 0  # bumped by every optimistic update
+        self._journal = []  # (generation, apply, args) of the updates made while refreshes are in flight
+        self._refreshing = 0
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._worker = None
+
+    def refresh(self):
+        """
+        Replace the cached state with get_balances and get_open_orders
+
+        :return: whether both calls succeeded
+        :rtype: bool
+        """
+        return self._refresh() is None
+
+    def _refresh(self):
+        """
+        :return: None, or the response of the call that failed
+        """
+        with self._lock:
+            started = self.generation
+            self._refreshing += 1
+        try:
+            balances = normalize('get_balances', self.bittrex.api_version, self.bittrex.get_balances())
+            orders = self.bittrex.get_open_orders() if balances['success'] else None
+        except Exception:
+            with self._lock:
+                self._done_refreshing()
+            raise
+        with self._lock:
+            journal = [(apply, args) for generation, apply, args in self._journal if generation > started]
+            self._done_refreshing()
+            if not balances['success']:
+                return balances
+            if not orders['success']:
+                return orders
+            self.balances = dict((balance['Currency'], dict(balance)) for balance in balances['result'] or ())
+            self.orders = dict((order['OrderUuid'], order) for order in orders['result'] or ())
+            self.refreshed = self.clock()
+            self.stale = set()
+            self.updates = 0
+            for apply, args in journal:
+                apply(*args)
+        return None
+
+    def _done_refreshing(self):
+        self._refreshing -= 1
+        if not self._refreshing:
+            self._journal = []
+
+    def _update(self, apply, *args):
+        """
+        Apply an optimistic update, under the lock, and record it for the refreshes in flight
+        """
+        self.generation += 1
+        if self._refreshing:
+            self._journal.append((self.generation, apply, args))
+        apply(*args)
+
+    def staleness(self):
+        """
+        :return: {'refreshed': epoch of the last refresh, 'age': seconds since,
+            'updates': optimistic updates since, 'stale': currencies to fetch again}
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'refreshed': self.refreshed,
+                'age': None if self.refreshed is None else self.clock() - self.refreshed,
+                'updates': self.updates,
+                'stale': sorted(self.stale),
+            }
+
+    def _ensure(self):
+        """
+        Seed the cache on first use
+
+        :return: None, or the failed response while no refresh succeeded
+        """
+        if self.refreshed is None:
+            return self._refresh()
+        return None
+
+    def _balance(self, currency):
+        balance = self.balances.get(currency)
+        if balance is None:
+            balance = self.balances[currency] = {'Currency': currency, 'Balance': 0.0, 'Available': 0.0,
+                                                 'Pending': 0.0, 'CryptoAddress': None}
+        return balance
+
+    def _adjust(self, currency, available=0.0, balance=0.0):
+        entry = self._balance(currency)
+        entry['Available'] = (entry['Available'] or 0.0) + available
+        entry['Balance'] = (entry['Balance'] or 0.0) + balance
+        self.updates += 1
+
+    def available(self, currency):
+        """
+        Cached available amount of a currency, 0 while the balance is unknown
+        """
+        response = self.get_balance(currency)
+        if not response['success']:
+            return 0.0
+        return response['result']['Available'] or 0.0
+
+    def get_balance(self, currency):
+        """
+        get_balance answered from the cache unless the currency is stale
+        """
+        failure = self._ensure()
+        if failure is not None:
+            return failure
+        with self._lock:
+            if currency not in self.stale:
+                return _response(self._balance(currency))
+        response = self.bittrex.get_balance(currency)
+        if response['success']:
+            with self._lock:
+                self.balances[currency] = dict(flat_balance(response['result']))
+                self.stale.discard(currency)
+                return _response(self.balances[currency])
+        return response
+
+    def get_balances(self):
+        failure = self._ensure()
+        if failure is not None:
+            return failure
+        with self._lock:
+            return _response(list(self.balances.values()))
+
+    def get_open_orders(self, market=None):
+        failure = self._ensure()
+        if failure is not None:
+            return failure
+        with self._lock:
+            return _response([order for order in self.orders.values()
+                              if market is None or order['Exchange'] == market])
+
+    def _reserve(self, market, side, quantity, rate, uuid):
+        with self._lock:
+            self._update(self._apply_reserve, market, side, quantity, rate, uuid)
+
+    def _apply_reserve(self, market, side, quantity, rate, uuid):
+        base, currency = _currencies(market)
+        if rate is None:
+            # market order, the price is only known after the fill
+            self.stale.update((base, currency))
+            return
+        # a refresh may already hold the reservation, reserving twice under-reports the available funds
+        if side == 'BUY':
+            self._adjust(base, available=-quantity * rate * (1 + self.commission))
+        else:
+            self._adjust(currency, available=-quantity)
+        if uuid is not None and uuid not in self.orders:
+            self.orders[uuid] = {
+                'OrderUuid': uuid,
+                'Exchange': market,
+                'OrderType': 'LIMIT_' + side,
+                'Quantity': quantity,
+                'QuantityRemaining': quantity,
+                'Limit': rate,
+                'Opened': None,
+            }
+
+    def buy_limit(self, market, quantity, rate):
+        response = self.bittrex.buy_limit(market, quantity, rate)
+        if response['success']:
+            self._reserve(market, 'BUY', quantity, rate, (response['result'] or {}).get('uuid'))
+        return response
+
+    def sell_limit(self, market, quantity, rate):
+        response = self.bittrex.sell_limit(market, quantity, rate)
+        if response['success']:
+            self._reserve(market, 'SELL', quantity, rate, (response['result'] or {}).get('uuid'))
+        return response
+
+    def trade_buy(self, market=None, order_type=None, quantity=None, rate=None, time_in_effect=None,
+                  condition_type=None, target=0.0):
+        response = self.bittrex.trade_buy(market, order_type, quantity, rate, time_in_effect, condition_type, target)
+        if response['success']:
+            self._reserve(market, 'BUY', quantity, None if order_type == ORDERTYPE_MARKET else rate,
+                          (response['result'] or {}).get('OrderId'))
+        return response
+
+    def trade_sell(self, market=None, order_type=None, quantity=None, rate=None, time_in_effect=None,
+                   condition_type=None, target=0.0):
+        response = self.bittrex.trade_sell(market, order_type, quantity, rate, time_in_effect, condition_type, target)
+        if response['success']:
+            self._reserve(market, 'SELL', quantity, None if order_type == ORDERTYPE_MARKET else rate,
+                          (response['result'] or {}).get('OrderId'))
+        return response
+
+    def cancel(self, uuid):
+        response = self.bittrex.cancel(uuid)
+        if response['success']:
+            with self._lock:
+                self._update(self._apply_cancel, uuid)
+        return response
+
+    def _apply_cancel(self, uuid):
+        # an order missing from a refresh was already released in its balances
+        order = self.orders.pop(uuid, None)
+        if order is None:
+            return
+        base, currency = _currencies(order['Exchange'])
+        remaining = order['QuantityRemaining'] or 0.0
+        if order['OrderType'].endswith('BUY'):
+            self._adjust(base, available=remaining * order['Limit'] * (1 + self.commission))
+        else:
+            self._adjust(currency, available=remaining)
+
+    def withdraw(self, currency, quantity, address):
+        response = self.bittrex.withdraw(currency, quantity, address)
+        if response['success']:
+            with self._lock:
+                self._update(self._adjust, currency, -quantity, -quantity)
+        return response
+
+    def run(self):
+        while not self._stop.is_set():
+            if self.refreshed is None or self.clock() - self.refreshed >= self.reconcile_interval:
+                self.refresh()
+            age = self.clock() - self.refreshed if self.refreshed is not None else 0.0
+            self._stop.wait(max(1.0, self.reconcile_interval - age))
+
+    def start(self):
+        """
+        Reconcile every reconcile_interval seconds in a background thread
+        """
+        self._stop.clear()
+        self._worker = threading.Thread(target=self.run, name='bittrex-account')
+        self._worker.daemon = True
+        self._worker.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
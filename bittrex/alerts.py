@@ -0,0 +1,206 @@
+"""
+   Alert rules evaluated on get_market_summaries snapshots.
+
+   Rules are compiled into groups sharing a field, an operator and a
+   market.  Each group keeps its thresholds sorted, so one bisect per group
+   and market finds every rule that holds instead of testing the rules one
+   by one.  A rule triggers when its condition becomes true and is re-armed
+   only once the value moved back past the threshold by its hysteresis ::
+
+       engine = AlertEngine()
+       engine.add(Rule('xrp', 'BTC-XRP', 'Last', ABOVE, 0.0001))
+       engine.add(Rule('volume', ALL_MARKETS, 'BaseVolume', ABOVE, 1000))
+       engine.add(Rule('spread', ALL_MARKETS, SPREAD, ABOVE, 2.0, hysteresis=0.5))
+       for rule, market, value in engine.evaluate(my_bittrex.get_market_summaries()['result']):
+           ...
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+ABOVE = '>'
+BELOW = '<'
+
+ALL_MARKETS = '*'
+
+# derived fields
+SPREAD = 'Spread'  # (Ask - Bid) / mid, in percent
+CHANGE = 'Change'  # (Last - PrevDay) / PrevDay, in percent
+
+
+def _spread(summary):
+    bid, ask = summary.get('Bid'), summary.get('Ask')
+    if not bid or not ask:
+        return None
+    return 200.0 * (ask - bid) / (ask + bid)
+
+
+def _change(summary):
+    last, previous = summary.get('Last'), summary.get('PrevDay')
+    if last is None or not previous:
+        return None
+    return 100.0 * (last - previous) / previous
+
+
+DERIVED = {
+    SPREAD: _spread,
+    CHANGE: _change,
+}
+
+
+class Rule(object):
+    """
+    field op threshold, for one market or ALL_MARKETS
+    """
+    __slots__ = ('id', 'market', 'field', 'op', 'threshold', 'hysteresis')
+
+    def __init__(self, id, market, field, op, threshold, hysteresis=0.0):
+        if op not in (ABOVE, BELOW):
+            raise ValueError('op must be ABOVE or BELOW')
+        self.id = id
+        self.market = market
+        self.field = field
+        self.op = op
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+
+    def __repr__(self):
+        return 'Rule({!r}, {} {} {} {})'.format(self.id, self.market, self.field, self.op, self.threshold)
+
+
+class _Group(object):
+    """
+    Rules of one field, op and market sorted by threshold
+    """
+    __slots__ = ('field', 'op', 'market', 'rules', 'thresholds', 'positions', 'on')
+
+    def __init__(self, field, op, market, rules):
+        self.field = field
+        self.op = op
+        self.market = market
+        self.rules = sorted(rules, key=lambda rule: rule.threshold)
+        self.thresholds = [rule.threshold for rule in self.rules]
+        self.positions = dict((rule.id, index) for index, rule in enumerate(self.rules))
+        self.on = {}  # market -> ids of the rules that triggered and are not re-armed yet
+
+    def holding(self, value):
+        """
+        Index range of the rules whose condition holds for value
+        """
+        if self.op == ABOVE:
+            return 0, bisect_left(self.thresholds, value)
+        return bisect_right(self.thresholds, value), len(self.rules)
+
+
+class AlertEngine(object):
+    """
+    Evaluates many alert rules against market summary snapshots
+    """
+
+    def __init__(self):
+        self.rules = {}
+        self._groups = {}  # field -> [_Group]
+        self._dirty = False
+
+    def add(self, rule):
+        self.rules[rule.id] = rule
+        self._dirty = True
+
+    def remove(self, rule_id):
+        self.rules.pop(rule_id, None)
+        self._dirty = True
+
+    def _compile(self):
+        by_key = {}
+        for rule in self.rules.values():
+            by_key.setdefault((rule.field, rule.op, rule.market), []).append(rule)
+        # rules that survive the compile keep their trigger state
+        previous = dict(((group.field, group.op, group.market), group)
+                        for groups in self._groups.values() for group in groups)
+        groups = {}
+        for key, rules in by_key.items():
+            group = _Group(key[0], key[1], key[2], rules)
+            old = previous.get(key)
+            if old is not None:
+                kept = set(rule.id for rule in group.rules
+                           if rule.id in old.positions and old.rules[old.positions[rule.id]] is rule)
+                for market, on in old.on.items():
+                    if on & kept:
+                        group.on[market] = on & kept
+            groups.setdefault(key[0], []).append(group)
+        self._groups = groups
+        self._dirty = False
+
+    def table(self, summaries):
+        """
+        Column table of a snapshot for the fields used by the rules
+
+        :param summaries: get_market_summaries result (v1.1 or v2.0)
+        :type summaries: list
+        :return: ([market names], {field: array('d')}), NaN where a value is missing
+        :rtype: tuple
+        """
+        fields = list(self._groups)
+        derived = [DERIVED.get(field) for field in fields]
+        markets = []
+        columns = [array('d') for _ in fields]
+        nan = float('nan')
+        for summary in summaries:
+            # v2.0 wraps every summary as {'Market': {...}, 'Summary': {...}}
+            summary = summary.get('Summary', summary)
+            markets.append(summary['MarketName'])
+            for field, derive, column in zip(fields, derived, columns):
+                value = derive(summary) if derive is not None else summary.get(field)
+                column.append(nan if value is None else value)
+        return markets, dict(zip(fields, columns))
+
+    def evaluate(self, summaries):
+        """
+        Triggers of a snapshot
+
+        :param summaries: get_market_summaries result (v1.1 or v2.0)
+        :type summaries: list
+        :return: [(rule, market, value)] of the rules that became true
+        :rtype: list
+        """
+        if self._dirty:
+            self._compile()
+        triggers = []
+        markets, columns = self.table(summaries)
+        index = None
+        for field, groups in self._groups.items():
+            column = columns[field]
+            for group in groups:
+                if group.market == ALL_MARKETS:
+                    values = zip(markets, column)
+                else:
+                    if index is None:
+                        index = dict((market, i) for i, market in enumerate(markets))
+                    i = index.get(group.market)
+                    if i is None:
+                        continue
+                    values = ((group.market, column[i]),)
+                for market, value in values:
+                    if value == value:  # not NaN
+                        self._evaluate(group, market, value, triggers)
+        return triggers
+
+    @staticmethod
+    def _evaluate(group, market, value, triggers):
+        start, end = group.holding(value)
+        on = group.on.get(market)
+        if on:
+            # re-arm the rules that moved back past threshold and hysteresis
+            for rule_id in [rule_id for rule_id in on if not start <= group.positions[rule_id] < end]:
+                rule = group.rules[group.positions[rule_id]]
+                if (value < rule.threshold - rule.hysteresis if group.op == ABOVE
+                        else value > rule.threshold + rule.hysteresis):
+                    on.discard(rule_id)
+        if start == end:
+            return
+        if on is None:
+            on = group.on[market] = set()
+        for rule in group.rules[start:end]:
+            if rule.id not in on:
+                on.add(rule.id)
+                triggers.append((rule, market, value))
@@ -0,0 +1,373 @@
+"""
+   Compact columnar archive of market data snapshots.
+
+   Rows are buffered and written as blocks of columns.  Strings such as
+   market names are dictionary encoded, timestamps are delta encoded
+   milliseconds, numbers are packed arrays and every column is zlib
+   compressed.  Each block header records its time range so scans over a
+   time window skip whole blocks without decompressing them.  Files are
+   rotated by age or size ::
+
+       snapshotter = Snapshotter(my_bittrex, 'archive', markets=['BTC-LTC', 'BTC-ETH'], interval=60)
+       snapshotter.start()
+       ...
+       for row in scan('archive', SUMMARIES, start=time.time() - 3600):
+           ...
+"""
+
+import glob
+import json
+import multiprocessing
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+
+from bittrex.candles import parse_timestamp
+from bittrex.bittrex import BUY_ORDERBOOK, SELL_ORDERBOOK
+
+MAGIC = b'BTXC'
+EXTENSION = '.btxc'
+
+# column kinds
+TIME = 'time'  # epoch seconds, stored as delta encoded milliseconds
+DICT = 'dict'  # dictionary encoded strings
+FLOAT = 'float'
+INT = 'int'
+
+SUMMARIES = 'summaries'
+ORDERBOOKS = 'orderbooks'
+MARKET_HISTORY = 'history'
+
+SCHEMAS = {
+    SUMMARIES: [('TimeStamp', TIME), ('MarketName', DICT), ('High', FLOAT), ('Low', FLOAT), ('Volume', FLOAT),
+                ('Last', FLOAT), ('BaseVolume', FLOAT), ('Bid', FLOAT), ('Ask', FLOAT), ('OpenBuyOrders', INT),
+                ('OpenSellOrders', INT)],
+    ORDERBOOKS: [('TimeStamp', TIME), ('MarketName', DICT), ('Side', DICT), ('Rate', FLOAT), ('Quantity', FLOAT)],
+    MARKET_HISTORY: [('TimeStamp', TIME), ('MarketName', DICT), ('Id', INT), ('Price', FLOAT), ('Quantity', FLOAT),
+                     ('Total', FLOAT), ('FillType', DICT), ('OrderType', DICT)],
+}
+
+_HEADER_SIZE = struct.Struct('<4sI')
+
+
+def _to_bytes(values):
+    return values.tobytes() if hasattr(values, 'tobytes') else values.tostring()
+
+
+def _from_bytes(typecode, data, byteorder):
+    values = array(typecode)
+    if hasattr(values, 'frombytes'):
+        values.frombytes(data)
+    else:
+        values.fromstring(data)
+    if byteorder != sys.byteorder:
+        values.byteswap()
+    return values
+
+
+def _encode(kind, values):
+    """
+    :return: (payload, extra header fields)
+    """
+    if kind == TIME:
+        millis = [int(round(value * 1000)) for value in values]
+        deltas = array('q', millis[:1])
+        deltas.extend(b - a for a, b in zip(millis, millis[1:]))
+        return _to_bytes(deltas), {}
+    if kind == DICT:
+        dictionary, codes = {}, array('i')
+        for value in values:
+            codes.append(dictionary.setdefault(value, len(dictionary)))
+        return _to_bytes(codes), {'dictionary': sorted(dictionary, key=dictionary.get)}
+    if kind == INT:
+        return _to_bytes(array('q', [value or 0 for value in values])), {}
+    nan = float('nan')
+    return _to_bytes(array('d', [nan if value is None else value for value in values])), {}
+
+
+def _decode(column, data, byteorder):
+    kind = column['kind']
+    if kind == TIME:
+        total, values = 0, []
+        for delta in _from_bytes('q', data, byteorder):
+            total += delta
+            values.append(total / 1000.0)
+        return values
+    if kind == DICT:
+        dictionary = column['dictionary']
+        return [dictionary[code] for code in _from_bytes('i', data, byteorder)]
+    if kind == INT:
+        return _from_bytes('q', data, byteorder)
+    return _from_bytes('d', data, byteorder)
+
+
+def summary_rows(summaries):
+    """
+    Archive rows of a get_market_summaries result (v1.1 or v2.0)
+    """
+    for summary in summaries:
+        if 'Summary' in summary:
+            summary = summary['Summary']
+        row = dict(summary)
+        row['TimeStamp'] = parse_timestamp(summary['TimeStamp'])
+        yield row
+
+
+def orderbook_rows(market, orderbook, timestamp):
+    """
+    Archive rows of a get_orderbook(market, BOTH_ORDERBOOK) result, one per level
+    """
+    for side in (BUY_ORDERBOOK, SELL_ORDERBOOK):
+        for level in orderbook.get(side) or ():
+            yield {'TimeStamp': timestamp, 'MarketName': market, 'Side': side,
+                   'Rate': level['Rate'], 'Quantity': level['Quantity']}
+
+
+def history_rows(market, trades):
+    """
+    Archive rows of a get_market_history result
+    """
+    for trade in trades:
+        row = dict(trade)
+        row['MarketName'] = market
+        row['TimeStamp'] = parse_timestamp(trade['TimeStamp'])
+        yield row
+
+
+class ColumnWriter(object):
+    """
+    Buffers rows of one schema and writes them as compressed column blocks
+    to files named <name>-<start time><EXTENSION> in directory.
+    """
+
+    def __init__(self, directory, name, schema=None, block_rows=10000, rotate_seconds=3600,
+                 rotate_bytes=64 * 1024 * 1024, compression=6, clock=time.time):
+        self.directory = directory
+        self.name = name
+        self.schema = schema or SCHEMAS[name]
+        self.block_rows = block_rows
+        self.rotate_seconds = rotate_seconds
+        self.rotate_bytes = rotate_bytes
+        self.compression = compression
+        self.clock = clock
+        self.rows = []
+        self.path = None
+        self._file = None
+        self._opened = None
+        self._lock = threading.Lock()
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def __getstate__(self):
+        # a writer sent to a spawned process opens its own file
+        state = dict(self.__dict__)
+        del state['_lock']
+        state.update(path=None, _file=None, _opened=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def append(self, row):
+        with self._lock:
+            self.rows.append(row)
+            if len(self.rows) >= self.block_rows:
+                self._flush()
+
+    def extend(self, rows):
+        with self._lock:
+            self.rows.extend(rows)
+            if len(self.rows) >= self.block_rows:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _open(self):
+        now = self.clock()
+        if self._file is not None:
+            if now - self._opened < self.rotate_seconds and self._file.tell() < self.rotate_bytes:
+                return
+            self._file.close()
+        stamp = time.strftime('%Y%m%dT%H%M%S', time.gmtime(now))
+        self.path = os.path.join(self.directory, '{}-{}{}'.format(self.name, stamp, EXTENSION))
+        self._file = open(self.path, 'ab')
+        self._opened = now
+
+    def _flush(self):
+        if not self.rows:
+            return
+        rows, self.rows = self.rows, []
+        columns, payloads = [], []
+        timestamps = None
+        for name, kind in self.schema:
+            values = [row.get(name) for row in rows]
+            if kind == TIME:
+                timestamps = timestamps or values
+            data, extra = _encode(kind, values)
+            payload = zlib.compress(data, self.compression)
+            column = {'name': name, 'kind': kind, 'size': len(payload)}
+            column.update(extra)
+            columns.append(column)
+            payloads.append(payload)
+        header = json.dumps({
+            'rows': len(rows),
+            'byteorder': sys.byteorder,
+            'start': min(timestamps) if timestamps else None,
+            'end': max(timestamps) if timestamps else None,
+            'columns': columns,
+        }).encode('utf-8')
+
+        self._open()
+        self._file.write(_HEADER_SIZE.pack(MAGIC, len(header)))
+        self._file.write(header)
+        for payload in payloads:
+            self._file.write(payload)
+        self._file.flush()
+
+
+def read_blocks(path, start=None, end=None, columns=None):
+    """
+    Column blocks of one archive file overlapping [start, end]
+
+    :param columns: names of the columns to decode, all of them when None
+    :type columns: list
+    :return: generator of {column name: values}
+    """
+    with open(path, 'rb') as infile:
+        while True:
+            prefix = infile.read(_HEADER_SIZE.size)
+            if len(prefix) < _HEADER_SIZE.size:
+                return
+            magic, length = _HEADER_SIZE.unpack(prefix)
+            if magic != MAGIC:
+                raise Exception('{} is not a bittrex archive or is corrupted'.format(path))
+            header = json.loads(infile.read(length).decode('utf-8'))
+            size = sum(column['size'] for column in header['columns'])
+            if (start is not None and header['end'] is not None and header['end'] < start) or \
+                    (end is not None and header['start'] is not None and header['start'] > end):
+                infile.seek(size, os.SEEK_CUR)
+                continue
+            block = {}
+            for column in header['columns']:
+                if columns is not None and column['name'] not in columns:
+                    infile.seek(column['size'], os.SEEK_CUR)
+                    continue
+                block[column['name']] = _decode(column, zlib.decompress(infile.read(column['size'])),
+                                                header['byteorder'])
+            yield block
+
+
+def scan(directory, name, start=None, end=None, markets=None):
+    """
+    Rows of an archive between start and end epochs, optionally only for
+    some markets
+
+    :rtype: generator of dict
+    """
+    markets = set(markets) if markets else None
+    for path in sorted(glob.glob(os.path.join(directory, '{}-*{}'.format(name, EXTENSION)))):
+        for block in read_blocks(path, start, end):
+            names = list(block)
+            for values in zip(*(block[column] for column in names)):
+                row = dict(zip(names, values))
+                timestamp = row.get('TimeStamp')
+                if timestamp is not None and ((start is not None and timestamp < start) or
+                                              (end is not None and timestamp > end)):
+                    continue
+                if markets is not None and row.get('MarketName') not in markets:
+                    continue
+                yield row
+
+
+class Snapshotter(object):
+    """
+    Periodically archives get_market_summaries and, for the given markets,
+    get_orderbook and get_market_history responses.
+    """
+
+    def __init__(self, bittrex, directory, markets=(), interval=60.0, clock=time.time, context=None,
+                 **writer_options):
+        """
+        :param context: multiprocessing context of the background process, the default start method when None
+        """
+        self.bittrex = bittrex
+        self.markets = list(markets)
+        self.interval = interval
+        self.clock = clock
+        self.writers = dict((name, ColumnWriter(directory, name, clock=clock, **writer_options))
+                            for name in SCHEMAS)
+        self._last_trade = {}
+        self._context = context or multiprocessing
+        self._stop = self._context.Event()
+        self._worker = None
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.update(_context=None, _worker=None)
+        return state
+
+    def collect_once(self):
+        response = self.bittrex.get_market_summaries()
+        if response['success']:
+            self.writers[SUMMARIES].extend(summary_rows(response['result'] or ()))
+        for market in self.markets:
+            now = self.clock()
+            response = self.bittrex.get_orderbook(market)
+            if response['success']:
+                self.writers[ORDERBOOKS].extend(orderbook_rows(market, response['result'], now))
+            response = self.bittrex.get_market_history(market)
+            if response['success']:
+                # the endpoint returns the latest trades, only keep the unseen ones
+                last = self._last_trade.get(market, -1)
+                trades = [trade for trade in response['result'] or () if trade['Id'] > last]
+                if trades:
+                    self._last_trade[market] = max(trade['Id'] for trade in trades)
+                    self.writers[MARKET_HISTORY].extend(history_rows(market, trades))
+
+    def run(self):
+        try:
+            while not self._stop.is_set():
+                started = self.clock()
+                self.collect_once()
+                delay = self.interval - (self.clock() - started)
+                if delay > 0:
+                    self._stop.wait(delay)
+        finally:
+            self.close()
+
+    def start(self, process=True):
+        """
+        Collect in a background daemon process, or a thread when process is
+        False.  A process keeps JSON decoding and encoding off the caller's
+        interpreter; the client then has to be picklable on platforms that
+        spawn rather than fork.  The writers are sent without their open
+        files and open new ones in the process.
+        """
+        worker = self._context.Process if process else threading.Thread
+        self._worker = worker(target=self.run, name='bittrex-snapshotter')
+        self._worker.daemon = True
+        self._worker.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
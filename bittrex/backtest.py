@@ -0,0 +1,139 @@
+"""
+   Backtesting of trading signals over stored get_candles data.
+
+   A signal is a function taking a Candles object (plus keyword parameters)
+   and returning the target position, between -1 and 1, at the close of
+   every candle.  Signals are called once per run with whole columns
+   instead of once per candle; simulate then compounds the returns in a
+   single pass over the bars.  Independent markets / parameter sets are
+   spread over a process pool ::
+
+       candles = {'BTC-LTC': Candles.from_result(my_bittrex.get_candles('BTC-LTC', TICKINTERVAL_HOUR)['result'])}
+       reports = run_backtests(candles, sma_crossover, {'fast': [5, 10], 'slow': [30, 60]})
+"""
+
+import itertools
+import multiprocessing
+
+DEFAULT_COMMISSION = 0.0025
+
+
+def sma(column, period):
+    """
+    Simple moving average of a column; None until period values are seen
+
+    :rtype: list
+    """
+    averages = [None] * min(period - 1, len(column))
+    if len(column) < period:
+        return averages
+    total = sum(column[:period])
+    averages.append(total / period)
+    for old, new in zip(column, column[period:]):
+        total += new - old
+        averages.append(total / period)
+    return averages
+
+
+def sma_crossover(candles, fast=10, slow=30):
+    """
+    Long while the fast SMA of the close is above the slow one, flat otherwise
+    """
+    return [1.0 if f is not None and s is not None and f > s else 0.0
+            for f, s in zip(sma(candles.C, fast), sma(candles.C, slow))]
+
+
+def simulate(candles, positions, commission=DEFAULT_COMMISSION):
+    """
+    Run target positions over the candles
+
+    The position decided at the close of candle i is held over candle i + 1.
+    Changing the position costs commission on the traded fraction.  Equity,
+    fees and drawdown compound from bar to bar and are computed in one loop.
+
+    :param candles: candles of one market
+    :type candles: bittrex.candles.Candles
+    :param positions: target position at the close of each candle
+    :type positions: list
+    :param commission: commission rate
+    :type commission: float
+    :return: pnl, max_drawdown, turnover, fees and trades of the run
+    :rtype: dict
+    """
+    close = candles.C
+    previous = [0.0]
+    previous.extend(positions[:-1])
+    returns = [0.0]
+    returns.extend(c1 / c0 - 1.0 if c0 else 0.0 for c0, c1 in zip(close, close[1:]))
+    changes = [abs(new - old) for old, new in zip(previous, positions)]
+    gross = [1.0 + held * ret for held, ret in zip(previous, returns)]
+    net = [g * (1.0 - change * commission) for g, change in zip(gross, changes)]
+
+    equity = peak = 1.0
+    max_drawdown = fees = 0.0
+    for factor, g in zip(net, gross):
+        fees += equity * (g - factor)
+        equity *= factor
+        if equity > peak:
+            peak = equity
+        elif 1.0 - equity / peak > max_drawdown:
+            max_drawdown = 1.0 - equity / peak
+
+    return {
+        'pnl': equity - 1.0,
+        'max_drawdown': max_drawdown,
+        'turnover': sum(changes),
+        'fees': fees,
+        'trades': sum(1 for change in changes if change),
+        'bars': len(close),
+    }
+
+
+def _expand(param_grid):
+    if param_grid is None:
+        return [{}]
+    if isinstance(param_grid, dict):
+        names = sorted(param_grid)
+        return [dict(zip(names, values)) for values in itertools.product(*(param_grid[name] for name in names))]
+    return list(param_grid)
+
+
+def _run_job(job):
+    market, candles, signal, params, commission = job
+    report = simulate(candles, list(signal(candles, **params)), commission)
+    report['market'] = market
+    report['params'] = params
+    return report
+
+
+def run_backtests(candles_by_market, signal, param_grid=None, commission=DEFAULT_COMMISSION, processes=None):
+    """
+    Backtest a signal over every market and parameter set
+
+    :param candles_by_market: market name -> Candles
+    :type candles_by_market: dict
+    :param signal: module level function (it has to be picklable) returning positions
+    :type signal: callable
+    :param param_grid: {'name': [values]} expanded to every combination, or a list of kwargs dicts
+    :type param_grid: dict or list
+    :param commission: commission rate
+    :type commission: float
+    :param processes: worker processes, 1 runs in the calling process, None uses every core
+    :type processes: int
+    :return: one report per (market, params) as returned by simulate
+        with 'market' and 'params' added
+    :rtype: list
+    """
+    jobs = [(market, candles, signal, params, commission)
+            for market, candles in sorted(candles_by_market.items())
+            for params in _expand(param_grid)]
+    if processes == 1 or len(jobs) < 2:
+        return [_run_job(job) for job in jobs]
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        chunksize = max(1, len(jobs) // (4 * (processes or multiprocessing.cpu_count())))
+        return pool.map(_run_job, jobs, chunksize)
+    finally:
+        pool.close()
+        pool.join()
@@ -3,28 +3,53 @@
 """
 
 import time
-import hmac
-import hashlib
-
-try:
-    from urllib import urlencode
-    from urlparse import urljoin
-except ImportError:
-    from urllib.parse import urlencode
-    from urllib.parse import urljoin
-
-try:
-    from Crypto.Cipher import AES
-except ImportError:
-    encrypted = False
-else:
-    import getpass
-    import ast
-    import json
 
-    encrypted = True
+# requests, pycrypto, urllib and the hmac/hashlib signing modules are
+# imported on first use so that importing this module, e.g. for its
+# constants, stays cheap
+
+
+def _module_available(name):
+    """
+    Whether a top level module can be imported, without importing it
+    """
+    try:
+        from importlib.machinery import PathFinder
+    except ImportError:  # Python 2
+        import imp
+        try:
+            imp.find_module(name)
+        except ImportError:
+            return False
+        return True
+    return PathFinder.find_spec(name) is not None
+
+
+encrypted = _module_available('Crypto')
+
+
+def urlencode(query):
+    """
+    urllib's urlencode, imported on first use and then bound in its place
+    """
+    global urlencode
+    try:
+        from urllib.parse import urlencode
+    except ImportError:  # Python 2
+        from urllib import urlencode
+    return urlencode(query)
+
+
+def _aes():
+    """
+    The pycrypto AES cipher, imported on first use
+    """
+    try:
+        from Crypto.Cipher import AES
+    except ImportError:
+        raise ImportError('"pycrypto" module has to be installed')
+    return AES
 
-import requests
 
 BUY_ORDERBOOK = 'buy'
 SELL_ORDERBOOK = 'sell'
@@ -58,9 +83,57 @@ BASE_URL_V2_0 = 'https://bittrex.com/api/v2.0{path}?'
 PROTECTION_PUB = 'pub'  # public methods
 PROTECTION_PRV = 'prv'  # authenticated methods
 
+# request priorities, lower ones are served first by a PriorityLimiter (see bittrex.ratelimit)
+PRIORITY_ORDER = 0  # placing and cancelling orders
+PRIORITY_ORDER_STATUS = 1
+PRIORITY_ACCOUNT = 2
+PRIORITY_MARKET_DATA = 3
+
+ORDER_PATHS = frozenset(['/market/buylimit', '/market/selllimit', '/market/cancel',
+                         '/key/market/tradebuy', '/key/market/tradesell', '/key/market/tradecancel'])
+ORDER_STATUS_PATHS = frozenset(['/account/getorder', '/account/getorderhistory', '/market/getopenorders',
+                                '/key/orders/getorder', '/key/orders/getorderhistory', '/key/market/getopenorders'])
+
+
+def request_priority(protection, path):
+    """
+    Priority class of an endpoint
+
+    :param path: endpoint path, ex: /market/cancel
+    :type path: str
+    :rtype: int
+    """
+    if path in ORDER_PATHS:
+        return PRIORITY_ORDER
+    if path in ORDER_STATUS_PATHS:
+        return PRIORITY_ORDER_STATUS
+    if protection == PROTECTION_PUB:
+        return PRIORITY_MARKET_DATA
+    return PRIORITY_ACCOUNT
+
+
+def request_endpoint(request_url):
+    """
+    Protection and endpoint path of a request URL or path
+
+    Example ::
+        >>> request_endpoint('https://bittrex.com/api/v1.1/public/getticker?market=BTC-LTC')
+        ('pub', '/public/getticker')
+
+    :rtype: tuple
+    """
+    path = request_url.split('?', 1)[0]
+    path = path[path.index('/api/') + 5:]
+    endpoint = path[path.index('/'):]
+    public = endpoint.startswith('/public/') or endpoint.startswith('/pub/')
+    return PROTECTION_PUB if public else PROTECTION_PRV, endpoint
+
 
 def encrypt(api_key, api_secret, export=True, export_fn='secrets.json'):
-    cipher = AES.new(getpass.getpass(
+    import getpass
+    import json
+
+    cipher = _aes().new(getpass.getpass(
         'Input encryption password (string will not show)'))
     api_key_n = cipher.encrypt(api_key)
     api_secret_n = cipher.encrypt(api_secret)
@@ -72,28 +145,107 @@ def encrypt(api_key, api_secret, export=True, export_fn='secrets.json'):
 
 
 def using_requests(request_url, apisign):
+    import requests
+
     return requests.get(
         request_url,
         headers={"apisign": apisign}
     ).json()
 
 
+def using_requests_session(session=None):
+    """
+    Builds a dispatch that reuses the pooled keep-alive connections of a
+    requests.Session instead of opening a new connection for every call
+
+    :param session: session to use, a new one when omitted
+    :type session: requests.Session
+    :return: dispatch function for Bittrex
+    """
+    if session is None:
+        import requests
+
+        session = requests.Session()
+
+    def dispatch(request_url, apisign):
+        return session.get(
+            request_url,
+            headers={"apisign": apisign}
+        ).json()
+
+    return dispatch
+
+
+def using_httpx(client=None, http2=True):
+    """
+    Builds a dispatch on an httpx.Client, which speaks HTTP/2 when the
+    server offers it.  Concurrent calls from several threads are then
+    multiplexed as streams over a single connection instead of taking one
+    pooled socket each.  asyncio code can share it through the default
+    executor, ex: loop.run_in_executor(None, my_bittrex.get_ticker, 'BTC-LTC')
+
+    Requires httpx with its http2 extra (pip install httpx[http2])
+
+    :param client: client to use, a new one when omitted
+    :type client: httpx.Client
+    :param http2: negotiate HTTP/2 when creating the client
+    :type http2: bool
+    :return: dispatch function for Bittrex
+    """
+    if client is None:
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError('"httpx" module has to be installed')
+
+        client = httpx.Client(http2=http2)
+
+    def dispatch(request_url, apisign):
+        return client.get(
+            request_url,
+            headers={"apisign": apisign}
+        ).json()
+
+    return dispatch
+
+
 class Bittrex(object):
     """
     Used for requesting Bittrex with API key and API secret
     """
 
-    def __init__(self, api_key, api_secret, calls_per_second=1, dispatch=using_requests, api_version=API_V1_1):
+    def __init__(self, api_key, api_secret, calls_per_second=1, dispatch=using_requests, api_version=API_V1_1,
+                 rate_limiter=None, coalesce=False, clock=None):
         self.api_key = str(api_key) if api_key is not None else ''
         self.api_secret = str(api_secret) if api_secret is not None else ''
         self.dispatch = dispatch
         self.call_rate = 1.0 / calls_per_second
         self.last_call = None
         self.api_version = api_version
+        # shared limiter (see bittrex.ratelimit) replacing calls_per_second
+        self.rate_limiter = rate_limiter
+        # identical public requests made concurrently share one call
+        self._in_flight = None
+        if coalesce:
+            import threading
+
+            self._in_flight = {}
+            self._in_flight_lock = threading.Lock()
+            self._in_flight_event = threading.Event
+        # server clock estimate (see bittrex.clock) nonces are taken from, local time when None
+        self.clock = clock
+        if clock is not None:
+            import threading
+
+            self._last_nonce = 0
+            self._nonce_lock = threading.Lock()
 
     def decrypt(self):
         if encrypted:
-            cipher = AES.new(getpass.getpass(
+            import getpass
+            import ast
+
+            cipher = _aes().new(getpass.getpass(
                 'Input decryption password (string will not show)'))
             try:
                 if isinstance(self.api_key, str):
@@ -107,7 +259,16 @@ class Bittrex(object):
         else:
             raise ImportError('"pycrypto" module has to be installed')
 
-    def wait(self):
+    def wait(self, priority=PRIORITY_MARKET_DATA):
+        """
+        Block until the next call is allowed
+
+        :return: False when the rate limiter dropped the call
+        :rtype: bool
+        """
+        if self.rate_limiter is not None:
+            return self.rate_limiter.wait(priority)
+
         if self.last_call is None:
             self.last_call = time.time()
         else:
@@ -118,6 +279,7 @@ class Bittrex(object):
                 time.sleep(self.call_rate - passed)
 
             self.last_call = time.time()
+        return True
 
     def _api_query(self, protection=None, path_dict=None, options=None):
         """
@@ -135,23 +297,74 @@ class Bittrex(object):
         if self.api_version not in path_dict:
             raise Exception('method call not available under API version {}'.format(self.api_version))
 
+        path = path_dict[self.api_version]
         request_url = BASE_URL_V2_0 if self.api_version == API_V2_0 else BASE_URL_V1_1
-        request_url = request_url.format(path=path_dict[self.api_version])
-
-        nonce = str(int(time.time() * 1000))
+        request_url = request_url.format(path=path)
+        priority = request_priority(protection, path)
 
         if protection != PROTECTION_PUB:
-            request_url = "{0}apikey={1}&nonce={2}&".format(request_url, self.api_key, nonce)
+            # the nonce is only taken once the call holds its token, see _call
+            return self._call(request_url, priority, options)
 
         request_url += urlencode(options)
+        if self._in_flight is not None:
+            return self._coalesced(request_url, priority)
+        return self._call(request_url, priority)
+
+    def public_query(self, request_url):
+        """
+        Queries a fully-formed public URL, ex: one received by a proxy.
+        With coalesce, identical calls in flight share one call.
+
+        :param request_url: public endpoint URL under BASE_URL_V1_1 or BASE_URL_V2_0
+        :type request_url: str
+        :return: JSON response from Bittrex
+        :rtype : dict
+        """
+        protection, path = request_endpoint(request_url)
+        if protection != PROTECTION_PUB:
+            raise ValueError('{} is not a public endpoint'.format(path))
+        priority = request_priority(protection, path)
+        if self._in_flight is not None:
+            return self._coalesced(request_url, priority)
+        return self._call(request_url, priority)
+
+    def _nonce(self):
+        """
+        Millisecond nonce, strictly increasing when taken from clock
+        """
+        if self.clock is None:
+            return int(time.time() * 1000)
+        with self._nonce_lock:
+            self._last_nonce = max(int(self.clock() * 1000), self._last_nonce + 1)
+            return self._last_nonce
+
+    def _call(self, request_url, priority, options=None):
+        """
+        Wait for a token, then sign and dispatch the request.  With options,
+        the request is private: its nonce is taken after the wait, so that
+        calls the rate limiter reorders still reach the server with
+        increasing nonces.
+        """
+        import hmac
+        import hashlib
 
         try:
+            if not self.wait(priority):
+                return {
+                    'success': False,
+                    'message': 'REQUEST_DROPPED',
+                    'result': None
+                }
+
+            if options is not None:
+                request_url = "{0}apikey={1}&nonce={2}&{3}".format(
+                    request_url, self.api_key, self._nonce(), urlencode(options))
+
             apisign = hmac.new(self.api_secret.encode(),
                                request_url.encode(),
                                hashlib.sha512).hexdigest()
 
-            self.wait()
-
             return self.dispatch(request_url, apisign)
 
         except:
@@ -161,6 +374,27 @@ class Bittrex(object):
                 'result': None
             }
 
+    def _coalesced(self, request_url, priority):
+        """
+        Make the call unless the same request is already in flight, in which
+        case wait for its response
+        """
+        with self._in_flight_lock:
+            call = self._in_flight.get(request_url)
+            leader = call is None
+            if leader:
+                call = self._in_flight[request_url] = [self._in_flight_event(), None]
+        if not leader:
+            call[0].wait()
+            return dict(call[1])
+        try:
+            call[1] = self._call(request_url, priority)
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[request_url]
+            call[0].set()
+        return call[1]
+
     def get_markets(self):
         """
         Used to get the open and available trading markets
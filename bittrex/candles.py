@@ -0,0 +1,222 @@
+"""
+   Columnar storage for candles returned by get_candles / get_latest_candle,
+   and resampling of one minute candles into arbitrary intervals ::
+
+       minutes = Candles.from_result(my_bittrex.get_candles('BTC-LTC', TICKINTERVAL_ONEMIN)['result'])
+       four_hours = resample(minutes, 4 * HOUR)
+
+       resampler = Resampler([3 * MINUTE, 15 * MINUTE, 4 * HOUR, WEEK])
+       resampler.update(my_bittrex.get_latest_candle('BTC-LTC', TICKINTERVAL_ONEMIN)['result'][0])
+"""
+
+import calendar
+import time
+from array import array
+
+from bittrex.bittrex import TICKINTERVAL_ONEMIN, TICKINTERVAL_FIVEMIN, TICKINTERVAL_THIRTYMIN, TICKINTERVAL_HOUR, \
+    TICKINTERVAL_DAY
+
+TICKINTERVAL_SECONDS = {
+    TICKINTERVAL_ONEMIN: 60,
+    TICKINTERVAL_FIVEMIN: 5 * 60,
+    TICKINTERVAL_THIRTYMIN: 30 * 60,
+    TICKINTERVAL_HOUR: 60 * 60,
+    TICKINTERVAL_DAY: 24 * 60 * 60,
+}
+
+FIELDS = ('O', 'H', 'L', 'C', 'V', 'BV')
+
+
+def parse_timestamp(value):
+    """
+    Bittrex ISO timestamp to UTC epoch seconds
+
+    Example ::
+        >>> parse_timestamp('2017-08-31T01:29:50.427')
+        1504142990.427
+
+    :param value: ex: '2017-11-03T03:18:00'
+    :type value: str
+    :rtype: float
+    """
+    seconds = calendar.timegm((int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                               int(value[11:13]), int(value[14:16]), int(value[17:19]), 0, 0, 0))
+    if len(value) > 20:
+        return seconds + float(value[19:].rstrip('Z'))
+    return float(seconds)
+
+
+def format_timestamp(epoch):
+    """
+    UTC epoch seconds to a Bittrex ISO timestamp (whole seconds)
+    """
+    return '{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}'.format(*time.gmtime(epoch)[:6])
+
+
+class Candles(object):
+    """
+    Candles of one market stored column-wise: T holds epoch seconds, O, H,
+    L, C, V and BV are array('d') columns of the same length.
+    """
+
+    def __init__(self, market=None):
+        self.market = market
+        self.T = array('d')
+        self.O = array('d')
+        self.H = array('d')
+        self.L = array('d')
+        self.C = array('d')
+        self.V = array('d')
+        self.BV = array('d')
+
+    @classmethod
+    def from_result(cls, result, market=None):
+        """
+        :param result: the result list of get_candles
+        :type result: list
+        :rtype: Candles
+        """
+        candles = cls(market)
+        candles.T = array('d', [parse_timestamp(candle['T']) for candle in result])
+        for field in FIELDS:
+            setattr(candles, field, array('d', [candle[field] for candle in result]))
+        return candles
+
+    def append(self, candle):
+        """
+        Append one candle dict (as returned by get_latest_candle) or replace
+        the last one when it has the same timestamp
+        """
+        timestamp = candle['T']
+        if not isinstance(timestamp, float):
+            timestamp = parse_timestamp(timestamp)
+        if self.T and self.T[-1] == timestamp:
+            for field in FIELDS:
+                getattr(self, field)[-1] = candle[field]
+            return
+        self.T.append(timestamp)
+        for field in FIELDS:
+            getattr(self, field).append(candle[field])
+
+    def __len__(self):
+        return len(self.T)
+
+    def __getitem__(self, index):
+        candle = dict((field, getattr(self, field)[index]) for field in FIELDS)
+        candle['T'] = format_timestamp(self.T[index])
+        return candle
+
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+
+# epoch (1970-01-01) is a Thursday, weekly bars start on Mondays
+WEEK_ORIGIN = 4 * DAY
+
+
+def _bucket(timestamp, seconds):
+    origin = WEEK_ORIGIN if seconds % WEEK == 0 else 0
+    return timestamp - (timestamp - origin) % seconds
+
+
+def resample(candles, seconds):
+    """
+    Aggregate candles into coarser bars, ex: 1 minute candles into 15
+    minute (15 * MINUTE), 4 hour (4 * HOUR) or weekly (WEEK) bars.
+
+    Bars are labelled with their start time.  Weekly bars start on Monday.
+    The input has to be sorted by time.
+
+    :param candles: finer grained candles, typically TICKINTERVAL_ONEMIN
+    :type candles: Candles
+    :param seconds: length of the resampled bars
+    :type seconds: int
+    :rtype: Candles
+    """
+    buckets = [_bucket(timestamp, seconds) for timestamp in candles.T]
+    starts = [i for i, (previous, bucket) in enumerate(zip([None] + buckets, buckets)) if previous != bucket]
+    ends = starts[1:] + [len(buckets)]
+
+    bars = Candles(candles.market)
+    bars.T = array('d', [buckets[start] for start in starts])
+    bars.O = array('d', [candles.O[start] for start in starts])
+    bars.H = array('d', [max(candles.H[start:end]) for start, end in zip(starts, ends)])
+    bars.L = array('d', [min(candles.L[start:end]) for start, end in zip(starts, ends)])
+    bars.C = array('d', [candles.C[end - 1] for end in ends])
+    bars.V = array('d', [sum(candles.V[start:end]) for start, end in zip(starts, ends)])
+    bars.BV = array('d', [sum(candles.BV[start:end]) for start, end in zip(starts, ends)])
+    return bars
+
+
+def _merge(bar, candle):
+    if bar is None:
+        return dict(candle)
+    return {'T': bar['T'], 'O': bar['O'], 'H': max(bar['H'], candle['H']), 'L': min(bar['L'], candle['L']),
+            'C': candle['C'], 'V': bar['V'] + candle['V'], 'BV': bar['BV'] + candle['BV']}
+
+
+class Resampler(object):
+    """
+    Builds bars of several intervals from a single stream of one minute
+    candles, ex: the results of get_latest_candle(market, TICKINTERVAL_ONEMIN).
+
+    Completed bars are appended to bars[seconds], a Candles object.  A minute
+    candle with the same 'T' as the previous one (the still forming candle)
+    replaces it.
+    """
+
+    def __init__(self, intervals, market=None, on_bar=None):
+        """
+        :param intervals: bar lengths in seconds, ex: [3 * MINUTE, 4 * HOUR, WEEK]
+        :type intervals: list
+        :param on_bar: called as on_bar(seconds, bar) for every completed bar
+        :type on_bar: callable
+        """
+        self.intervals = list(intervals)
+        self.on_bar = on_bar
+        self.bars = dict((seconds, Candles(market)) for seconds in self.intervals)
+        # per interval: (bar without the last minute, last minute candle)
+        self._partial = dict((seconds, (None, None)) for seconds in self.intervals)
+
+    def current(self, seconds):
+        """
+        The bar still being built for an interval, None before the first candle
+        """
+        before, last = self._partial[seconds]
+        if last is None:
+            return None
+        if before is None:
+            return dict(last, T=_bucket(last['T'], seconds))
+        return _merge(before, last)
+
+    def update(self, candle):
+        """
+        :param candle: one minute candle dict
+        :type candle: dict
+        :return: [(seconds, bar)] of the bars completed by this candle
+        :rtype: list
+        """
+        timestamp = candle['T']
+        if not isinstance(timestamp, float):
+            timestamp = parse_timestamp(timestamp)
+        candle = dict(candle, T=timestamp)
+
+        completed = []
+        for seconds in self.intervals:
+            before, last = self._partial[seconds]
+            if last is not None and last['T'] == timestamp:
+                self._partial[seconds] = (before, candle)
+                continue
+            bar = self.current(seconds)
+            if bar is not None and bar['T'] != _bucket(timestamp, seconds):
+                self.bars[seconds].append(bar)
+                completed.append((seconds, bar))
+                bar = None
+            self._partial[seconds] = (bar, candle)
+
+        if self.on_bar is not None:
+            for seconds, bar in completed:
+                self.on_bar(seconds, bar)
+        return completed
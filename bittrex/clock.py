@@ -0,0 +1,197 @@
+"""
+   Round trip time and server clock offset estimation.
+
+   using_clock builds a dispatch that times every call and reads the Date
+   header of the response.  ClockEstimator keeps smoothed round trip times
+   and their variation per endpoint, and bounds the offset of the server
+   clock: the server stamped the response between the moment the request
+   was sent and the moment the response arrived, so every sample narrows
+   the interval the offset lies in, well below the one second resolution
+   of the header.
+
+   The estimator is a clock: pass it to Bittrex to generate nonces against
+   the server time, and to PacedLimiter to space calls by the observed
+   latency variation instead of a fixed safety margin ::
+
+       estimator = ClockEstimator()
+       limiter = PacedLimiter(rate=1, estimator=estimator)
+       my_bittrex = Bittrex(key, secret, rate_limiter=limiter, clock=estimator,
+                            dispatch=using_clock(estimator))
+"""
+
+import calendar
+import collections
+import threading
+import time
+from email.utils import parsedate
+
+from bittrex.bittrex import request_endpoint
+
+DATE_RESOLUTION = 1.0  # seconds, HTTP Date headers have no fraction
+
+
+def parse_http_date(value):
+    """
+    HTTP Date header to UTC epoch seconds, None when it cannot be parsed
+
+    Example ::
+        >>> parse_http_date('Sun, 06 Nov 1994 08:49:37 GMT')
+        784111777
+    """
+    parsed = parsedate(value) if value else None
+    if parsed is None:
+        return None
+    return calendar.timegm(parsed[:6] + (0, 0, 0))
+
+
+class _Latency(object):
+    """
+    Smoothed round trip time and variation, as TCP computes them (RFC 6298)
+    """
+    __slots__ = ('samples', 'srtt', 'rttvar', 'min_rtt')
+
+    def __init__(self):
+        self.samples = 0
+        self.srtt = None
+        self.rttvar = None
+        self.min_rtt = None
+
+    def update(self, rtt):
+        self.samples += 1
+        if self.srtt is None:
+            self.srtt, self.rttvar, self.min_rtt = rtt, rtt / 2.0, rtt
+            return
+        self.rttvar += (abs(self.srtt - rtt) - self.rttvar) / 4.0
+        self.srtt += (rtt - self.srtt) / 8.0
+        self.min_rtt = min(self.min_rtt, rtt)
+
+    def stats(self):
+        return {'samples': self.samples, 'srtt': self.srtt, 'rttvar': self.rttvar, 'min_rtt': self.min_rtt}
+
+
+class ClockEstimator(object):
+    """
+    Per endpoint latency and server clock offset from response timing.
+    Calling the estimator returns the estimated server time.
+    """
+
+    def __init__(self, window=64, max_age=3600.0, clock=time.time):
+        """
+        :param window: offset samples kept
+        :type window: int
+        :param max_age: seconds after which an offset sample is discarded, the clocks drift
+        :type max_age: float
+        """
+        self.window = window
+        self.max_age = max_age
+        self.clock = clock
+        self.latencies = collections.defaultdict(_Latency)  # endpoint -> _Latency, None for all endpoints
+        self._bounds = collections.deque(maxlen=window)  # (received, low, high) offset bounds
+        self._offset = (0.0, None)  # offset, uncertainty
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, sent, received, server_time=None, resolution=DATE_RESOLUTION):
+        """
+        Add the timing of one call
+
+        :param endpoint: endpoint path, ex: /public/getticker
+        :type endpoint: str
+        :param sent: local time the request was sent
+        :type sent: float
+        :param received: local time the response arrived
+        :type received: float
+        :param server_time: server time stamped on the response, truncated to resolution
+        :type server_time: float
+        """
+        rtt = max(0.0, received - sent)
+        with self._lock:
+            self.latencies[endpoint].update(rtt)
+            self.latencies[None].update(rtt)
+            if server_time is not None:
+                self._bounds.append((received, server_time - received, server_time + resolution - sent))
+                self._estimate()
+
+    def _estimate(self):
+        bounds = self._bounds
+        oldest = bounds[-1][0] - self.max_age
+        while bounds[0][0] < oldest:
+            bounds.popleft()
+        low = max(bound[1] for bound in bounds)
+        high = min(bound[2] for bound in bounds)
+        if low > high:
+            # the clocks moved, start over from the newest sample
+            last = bounds[-1]
+            bounds.clear()
+            bounds.append(last)
+            low, high = last[1], last[2]
+        self._offset = ((low + high) / 2.0, (high - low) / 2.0)
+
+    @property
+    def offset(self):
+        """
+        Estimated server time minus local time, in seconds
+        """
+        return self._offset[0]
+
+    @property
+    def uncertainty(self):
+        """
+        Half width of the interval the offset lies in, None before any sample with a server time
+        """
+        return self._offset[1]
+
+    def __call__(self):
+        return self.clock() + self._offset[0]
+
+    def rtt(self, endpoint=None):
+        """
+        Smoothed round trip time of endpoint, of all endpoints when None
+        """
+        with self._lock:
+            latency = self.latencies.get(endpoint)
+            return None if latency is None else latency.srtt
+
+    def jitter(self, endpoint=None):
+        """
+        Round trip time variation of endpoint, of all endpoints when None; 0 before any sample
+        """
+        with self._lock:
+            latency = self.latencies.get(endpoint)
+            return 0.0 if latency is None else latency.rttvar
+
+    def stats(self):
+        """
+        {endpoint: {samples, srtt, rttvar, min_rtt}}, None holding all endpoints
+        """
+        with self._lock:
+            return dict((endpoint, latency.stats()) for endpoint, latency in self.latencies.items())
+
+
+def using_clock(estimator, session=None):
+    """
+    Builds a dispatch on a requests.Session feeding estimator with the
+    timing and Date header of every response
+
+    :param estimator: estimator to feed
+    :type estimator: ClockEstimator
+    :param session: session to use, a new one when omitted
+    :type session: requests.Session
+    :return: dispatch function for Bittrex
+    """
+    if session is None:
+        import requests
+
+        session = requests.Session()
+
+    def dispatch(request_url, apisign):
+        sent = estimator.clock()
+        response = session.get(
+            request_url,
+            headers={"apisign": apisign}
+        )
+        received = estimator.clock()
+        estimator.record(request_endpoint(request_url)[1], sent, received,
+                         parse_http_date(response.headers.get('Date')))
+        return response.json()
+
+    return dispatch
@@ -0,0 +1,103 @@
+"""
+   Multiprocess market data collection.
+
+   A single process decoding hundreds of get_orderbook responses per second
+   is bound to one core.  Collector shards the markets over worker
+   processes.  Each worker runs its own Bittrex client on a pooled
+   requests.Session and handles the responses itself.  All workers draw
+   from one SharedTokenBucket, so their combined rate stays under the
+   exchange limit ::
+
+       def store(market, response):     # module level, runs in the workers
+           ...
+
+       collector = Collector(all_markets, store, calls_per_second=10, processes=4)
+       collector.start()
+       ...
+       collector.stop()
+"""
+
+import multiprocessing
+import time
+
+from bittrex.bittrex import Bittrex, API_V1_1, using_requests_session
+from bittrex.ratelimit import SharedTokenBucket
+
+
+def shard(markets, count):
+    """
+    Split markets into count interleaved shards
+    """
+    return [markets[i::count] for i in range(count) if markets[i::count]]
+
+
+def _collect(markets, handler, method, interval, limiter, stop, client_options, dispatch=None):
+    bittrex = Bittrex(dispatch=dispatch or using_requests_session(), rate_limiter=limiter, **client_options)
+    fetch = getattr(bittrex, method)
+    while not stop.is_set():
+        started = time.time()
+        for market in markets:
+            if stop.is_set():
+                return
+            handler(market, fetch(market))
+        delay = interval - (time.time() - started)
+        if delay > 0:
+            stop.wait(delay)
+
+
+class Collector(object):
+    """
+    Fetches method(market) for every market in a loop, sharded over worker
+    processes, and calls handler(market, response) in the worker that
+    fetched it.  handler has to be a module level function.
+    """
+
+    def __init__(self, markets, handler, method='get_orderbook', calls_per_second=1, processes=None,
+                 interval=0.0, api_key=None, api_secret=None, api_version=API_V1_1, dispatch=None):
+        """
+        :param markets: market names to collect
+        :type markets: list
+        :param handler: called as handler(market, response) in the worker processes
+        :type handler: callable
+        :param method: Bittrex method taking a market, ex: get_orderbook or get_market_history
+        :type method: str
+        :param calls_per_second: combined rate of all workers
+        :type calls_per_second: float
+        :param processes: number of worker processes, one per core when None
+        :type processes: int
+        :param interval: minimum seconds between two passes over a worker's markets
+        :type interval: float
+        :param dispatch: module level dispatch of the workers' clients, a pooled requests.Session when None
+        :type dispatch: callable
+        """
+        self.markets = list(markets)
+        self.handler = handler
+        self.method = method
+        self.interval = interval
+        self.processes = processes or multiprocessing.cpu_count()
+        self.limiter = SharedTokenBucket(calls_per_second)
+        self.client_options = {'api_key': api_key, 'api_secret': api_secret, 'api_version': api_version}
+        self.dispatch = dispatch
+        self.workers = []
+        self._stop = multiprocessing.Event()
+
+    def start(self):
+        self._stop.clear()
+        for markets in shard(self.markets, self.processes):
+            worker = multiprocessing.Process(
+                target=_collect, name='bittrex-collector',
+                args=(markets, self.handler, self.method, self.interval, self.limiter, self._stop,
+                      self.client_options, self.dispatch))
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self.join(timeout)
+
+    def join(self, timeout=None):
+        for worker in self.workers:
+            worker.join(timeout)
+        self.workers = [worker for worker in self.workers if worker.is_alive()]
@@ -0,0 +1,307 @@
+"""
+   Execution of large orders as a series of smaller limit orders.
+
+   A ParentOrder is sliced into child buy_limit / sell_limit orders, TWAP
+   (equal slices over time), VWAP (slices following a volume profile) or
+   ICEBERG (a small visible order replaced as soon as it fills).  Child
+   prices come from cached get_orderbook snapshots and fills are followed
+   with get_order ::
+
+       executor = Executor(my_bittrex, on_event=print)
+       executor.submit(ParentOrder('BTC-LTC', BUY, 500, style=TWAP, duration=3600, slices=12))
+       executor.run()
+"""
+
+import time
+
+from bittrex.orderbook import OrderBook
+from bittrex.ratelimit import TokenBucket
+
+BUY = 'BUY'
+SELL = 'SELL'
+
+TWAP = 'TWAP'
+VWAP = 'VWAP'
+ICEBERG = 'ICEBERG'
+
+EVENT_CHILD_PLACED = 'child_placed'
+EVENT_CHILD_CANCELLED = 'child_cancelled'
+EVENT_FILL = 'fill'
+EVENT_DONE = 'done'
+EVENT_ERROR = 'error'
+
+
+class ParentOrder(object):
+    """
+    A large order worked by the Executor
+    """
+
+    def __init__(self, market, side, quantity, style=TWAP, duration=600.0, slices=10, limit=None,
+                 max_slippage=0.002, display_quantity=None, volume_profile=None):
+        """
+        :param market: String literal for the market (ex: BTC-LTC)
+        :type market: str
+        :param side: BUY or SELL
+        :type side: str
+        :param quantity: total quantity to trade
+        :type quantity: float
+        :param style: TWAP, VWAP or ICEBERG
+        :type style: str
+        :param duration: seconds over which TWAP / VWAP slices are spread
+        :type duration: float
+        :param slices: number of TWAP / VWAP slices
+        :type slices: int
+        :param limit: worst acceptable rate for every child order
+        :type limit: float
+        :param max_slippage: children are priced at most this fraction away from the best rate
+        :type max_slippage: float
+        :param display_quantity: size of ICEBERG children
+        :type display_quantity: float
+        :param volume_profile: VWAP weight of every slice, ex: the volume of each hour of the previous day
+        :type volume_profile: list
+        """
+        self.market = market
+        self.side = side
+        self.quantity = quantity
+        self.style = style
+        self.duration = duration
+        self.slices = len(volume_profile) if volume_profile else slices
+        self.limit = limit
+        self.max_slippage = max_slippage
+        self.display_quantity = display_quantity or quantity / float(self.slices)
+        weights = volume_profile or [1.0] * self.slices
+        total = float(sum(weights))
+        self.schedule = []
+        cumulative = 0.0
+        for weight in weights:
+            cumulative += weight
+            self.schedule.append(quantity * cumulative / total)
+
+        self.filled = 0.0
+        self.cost = 0.0
+        self.started = None
+        self.finished = None
+        self.cancelled = False
+        self.child = None
+        self.child_quantity = 0.0
+        self.child_filled = 0.0
+        self.child_cost = 0.0
+        self.child_placed = None
+        self.next_poll = 0.0
+        self.children = []
+
+    @property
+    def remaining(self):
+        return self.quantity - self.filled
+
+    @property
+    def average_price(self):
+        return self.cost / self.filled if self.filled else None
+
+    @property
+    def done(self):
+        return self.finished is not None
+
+    def target(self, now):
+        """
+        Quantity that should be filled by now
+        """
+        if self.style == ICEBERG:
+            return self.quantity
+        elapsed = now - self.started
+        index = min(len(self.schedule) - 1, int(elapsed * len(self.schedule) / self.duration))
+        return self.schedule[index]
+
+    def slice_end(self, now):
+        """
+        When the current TWAP / VWAP slice ends, None for ICEBERG
+        """
+        if self.style == ICEBERG:
+            return None
+        length = self.duration / float(len(self.schedule))
+        return self.started + (int((now - self.started) / length) + 1) * length
+
+
+class Executor(object):
+    """
+    Works many ParentOrders concurrently through one Bittrex client.
+
+    Every call goes through the client, so its calls_per_second still
+    applies.  On top of that, placements, cancels and status polls all take
+    a token from a bucket of call_budget private calls per second, and
+    status polling is spread so that it fits in that budget whatever the
+    number of active parents.  Progress is reported through
+    on_event(event, parent, details).
+    """
+
+    def __init__(self, bittrex, on_event=None, call_budget=None, poll_interval=1.0, book_ttl=2.0,
+                 clock=time.time, sleep=time.sleep):
+        self.bittrex = bittrex
+        self.on_event = on_event
+        self.call_budget = call_budget or 1.0 / bittrex.call_rate
+        self.poll_interval = poll_interval
+        self.book_ttl = book_ttl
+        self.clock = clock
+        self.sleep = sleep
+        self.parents = []
+        self._books = {}
+        self._budget = TokenBucket(self.call_budget, clock=clock, sleep=sleep)
+
+    def submit(self, parent):
+        parent.started = self.clock()
+        self.parents.append(parent)
+        return parent
+
+    def cancel(self, parent):
+        """
+        Stop working parent.  It is done once its child is cancelled; a
+        failed cancel is retried by the next steps.
+        """
+        parent.cancelled = True
+        if parent.child is not None:
+            self._cancel_child(parent)
+        if parent.child is None:
+            self._finish(parent)
+
+    @property
+    def active(self):
+        return [parent for parent in self.parents if not parent.done]
+
+    def run(self):
+        """
+        Work every submitted parent order until they are all done
+        """
+        while self.active:
+            self.step()
+            next_poll = min(parent.next_poll for parent in self.active) if self.active else 0
+            delay = next_poll - self.clock()
+            if delay > 0:
+                self.sleep(min(delay, self.poll_interval))
+
+    def step(self):
+        """
+        Give every active parent order one chance to poll, cancel or place
+        """
+        active = self.active
+        # polling budget shared by every parent
+        interval = max(self.poll_interval, len(active) / float(self.call_budget))
+        for parent in active:
+            now = self.clock()
+            if parent.cancelled:
+                self.cancel(parent)
+                continue
+            if parent.child is not None:
+                if now < parent.next_poll:
+                    continue
+                parent.next_poll = now + interval
+                self._poll(parent)
+                if parent.child is not None:
+                    end = parent.slice_end(parent.child_placed)
+                    if end is not None and now >= end:
+                        self._cancel_child(parent)
+                    continue
+            if parent.remaining <= 1e-12:
+                self._finish(parent)
+                continue
+            quantity = min(parent.remaining, parent.target(now) - parent.filled)
+            if parent.style == ICEBERG:
+                quantity = min(quantity, parent.display_quantity)
+            if quantity > 1e-12:
+                self._place(parent, quantity)
+                parent.next_poll = now + interval
+            else:
+                parent.next_poll = parent.slice_end(now) or now + interval
+
+    def _event(self, event, parent, **details):
+        if self.on_event is not None:
+            self.on_event(event, parent, details)
+
+    def _book(self, market):
+        now = self.clock()
+        cached = self._books.get(market)
+        if cached is None or now - cached[0] > self.book_ttl:
+            response = self.bittrex.get_orderbook(market)
+            if not response['success']:
+                return cached[1] if cached else None
+            cached = (now, OrderBook(response['result'], market))
+            self._books[market] = cached
+        return cached[1]
+
+    def _price(self, parent, quantity):
+        book = self._book(parent.market)
+        if book is None:
+            return parent.limit
+        side = book.asks if parent.side == BUY else book.bids
+        if side.best is None:
+            return parent.limit
+        _, _, worst = side.fill(quantity)
+        if parent.side == BUY:
+            price = min(worst, side.best * (1 + parent.max_slippage))
+            return min(price, parent.limit) if parent.limit else price
+        price = max(worst, side.best * (1 - parent.max_slippage))
+        return max(price, parent.limit) if parent.limit else price
+
+    def _place(self, parent, quantity):
+        rate = self._price(parent, quantity)
+        if rate is None:
+            self._event(EVENT_ERROR, parent, message='NO_PRICE')
+            return
+        place = self.bittrex.buy_limit if parent.side == BUY else self.bittrex.sell_limit
+        self._budget.wait()
+        response = place(parent.market, quantity, rate)
+        if not response['success']:
+            self._event(EVENT_ERROR, parent, message=response['message'])
+            return
+        parent.child = response['result']['uuid']
+        parent.child_quantity = quantity
+        parent.child_filled = 0.0
+        parent.child_cost = 0.0
+        parent.child_placed = self.clock()
+        parent.children.append(parent.child)
+        self._event(EVENT_CHILD_PLACED, parent, uuid=parent.child, quantity=quantity, rate=rate)
+
+    def _poll(self, parent):
+        self._budget.wait()
+        response = self.bittrex.get_order(parent.child)
+        if not response['success']:
+            self._event(EVENT_ERROR, parent, message=response['message'])
+            return
+        self._update(parent, response['result'])
+
+    def _update(self, parent, order):
+        filled = order['Quantity'] - order['QuantityRemaining']
+        if filled > parent.child_filled:
+            quantity = filled - parent.child_filled
+            # Price is the cost of all the fills of the child so far
+            price = order['Price'] or 0.0
+            cost = price - parent.child_cost
+            parent.child_filled = filled
+            parent.child_cost = price
+            parent.filled += quantity
+            parent.cost += cost
+            self._event(EVENT_FILL, parent, uuid=parent.child, quantity=quantity, cost=cost)
+        if not order['IsOpen']:
+            parent.child = None
+
+    def _cancel_child(self, parent):
+        """
+        Cancel the live child of parent.  When the cancel fails the child is
+        kept, unless get_order reports it closed, so that no second child is
+        placed next to it.
+        """
+        uuid = parent.child
+        self._budget.wait()
+        response = self.bittrex.cancel(uuid)
+        if not response['success']:
+            self._event(EVENT_ERROR, parent, uuid=uuid, message=response['message'])
+        # pick up fills that happened before the cancel
+        self._poll(parent)
+        if response['success']:
+            parent.child = None
+        if parent.child is None:
+            self._event(EVENT_CHILD_CANCELLED, parent, uuid=uuid)
+
+    def _finish(self, parent):
+        if parent.finished is None:
+            parent.finished = self.clock()
+            self._event(EVENT_DONE, parent, filled=parent.filled, average_price=parent.average_price)
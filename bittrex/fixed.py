@@ -0,0 +1,202 @@
+"""
+   Fixed point prices and quantities.
+
+   In fixed point mode numeric fields are integers counting 1e-8 units
+   (satoshis for BTC).  They are parsed straight from the JSON text, so no
+   float rounding ever happens, and order parameters are formatted exactly
+   when requests are built ::
+
+       my_bittrex = FixedPointBittrex(key, secret)
+       book = OrderBook(my_bittrex.get_orderbook('BTC-LTC')['result'], fixed=True)
+       my_bittrex.buy_limit('BTC-LTC', to_fixed('1.5'), book.asks.best)   # quantity=1.5&rate=0.01234567
+
+   Only the fields in NUMERIC_FIELDS are converted; ids, timestamps and
+   other numbers keep their JSON type.
+"""
+
+import json
+from array import array
+
+from bittrex.bittrex import Bittrex, API_V1_1
+
+DECIMALS = 8
+SCALE = 10 ** DECIMALS
+
+try:
+    _INTEGERS = (int, long)
+except NameError:  # Python 3
+    _INTEGERS = (int,)
+
+# array typecode of 64 bit integers
+try:
+    array('q')
+    TYPECODE = 'q'
+except ValueError:  # Python 2 has no 'q', its 'l' is 64 bits on Linux and macOS
+    TYPECODE = 'l'
+
+NUMERIC_FIELDS = frozenset([
+    'Quantity', 'Rate', 'Price', 'Total', 'Limit', 'QuantityRemaining', 'CommissionPaid', 'Commission',
+    'PricePerUnit', 'Reserved', 'ReserveRemaining', 'CommissionReserved', 'CommissionReserveRemaining',
+    'ConditionTarget', 'Balance', 'Available', 'Pending', 'Amount', 'TxCost', 'Bid', 'Ask', 'Last',
+    'High', 'Low', 'Volume', 'BaseVolume', 'PrevDay', 'MinTradeSize', 'TxFee',
+    'O', 'H', 'L', 'C', 'V', 'BV',
+])
+
+
+class _Number(str):
+    """
+    Text of a JSON float, converted once its field is known
+    """
+    __slots__ = ()
+
+
+def to_fixed(value):
+    """
+    Exact conversion of a decimal string, or an int / float, to 1e-8 units.
+    Digits beyond the 8th decimal are rounded half away from zero.
+
+    Example ::
+        >>> to_fixed('0.00177639')
+        177639
+        >>> to_fixed('1e-08')
+        1
+
+    :rtype: int
+    """
+    if isinstance(value, _INTEGERS):
+        return value * SCALE
+    if isinstance(value, float):
+        value = repr(value)
+    text = value.strip().lower()
+    negative = text.startswith('-')
+    text = text.lstrip('+-')
+    exponent = 0
+    if 'e' in text:
+        text, power = text.split('e')
+        exponent = int(power)
+    whole, _, fraction = text.partition('.')
+    digits = int((whole + fraction) or '0')
+    shift = DECIMALS + exponent - len(fraction)
+    if shift >= 0:
+        fixed = digits * 10 ** shift
+    else:
+        fixed, remainder = divmod(digits, 10 ** -shift)
+        if 2 * remainder >= 10 ** -shift:
+            fixed += 1
+    return -fixed if negative else fixed
+
+
+def format_fixed(value):
+    """
+    Exact decimal text of a value in 1e-8 units, without trailing zeros
+
+    Example ::
+        >>> format_fixed(150000000)
+        '1.5'
+    """
+    sign = '-' if value < 0 else ''
+    whole, fraction = divmod(abs(value), SCALE)
+    fraction = '{:0{}d}'.format(fraction, DECIMALS).rstrip('0')
+    return '{}{}.{}'.format(sign, whole, fraction) if fraction else '{}{}'.format(sign, whole)
+
+
+def _object_hook(obj):
+    for key, value in obj.items():
+        if isinstance(value, _Number):
+            obj[key] = to_fixed(value) if key in NUMERIC_FIELDS else float(value)
+        elif key in NUMERIC_FIELDS and isinstance(value, _INTEGERS) and not isinstance(value, bool):
+            obj[key] = value * SCALE
+    return obj
+
+
+def loads(text):
+    """
+    Decode an API response with NUMERIC_FIELDS as 1e-8 unit integers
+    """
+    return json.loads(text, parse_float=_Number, object_hook=_object_hook)
+
+
+def fixed_result(obj):
+    """
+    Convert NUMERIC_FIELDS of an already decoded response to 1e-8 units, in
+    place.  Floats go through their shortest repr, so 0.1 becomes 10000000.
+    """
+    if isinstance(obj, list):
+        for item in obj:
+            fixed_result(item)
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            if key in NUMERIC_FIELDS and isinstance(value, _INTEGERS + (float,)) and not isinstance(value, bool):
+                obj[key] = to_fixed(value)
+            elif isinstance(value, (list, dict)):
+                fixed_result(value)
+    return obj
+
+
+def using_fixed_point(session=None):
+    """
+    Builds a dispatch decoding responses with loads on a requests.Session
+
+    :param session: session to use, a new one when omitted
+    :type session: requests.Session
+    :return: dispatch function for Bittrex
+    """
+    if session is None:
+        import requests
+
+        session = requests.Session()
+
+    def dispatch(request_url, apisign):
+        return loads(session.get(
+            request_url,
+            headers={"apisign": apisign}
+        ).text)
+
+    return dispatch
+
+
+def _text(value):
+    return None if value is None else format_fixed(value)
+
+
+class FixedPointBittrex(Bittrex):
+    """
+    Bittrex client taking and returning prices and quantities in 1e-8 units.
+    Responses are decoded by using_fixed_point unless another dispatch is
+    given, in which case its results are converted with fixed_result.
+    """
+
+    def __init__(self, api_key, api_secret, calls_per_second=1, dispatch=None, api_version=API_V1_1,
+                 rate_limiter=None, coalesce=False, clock=None):
+        if dispatch is None:
+            dispatch = using_fixed_point()
+        else:
+            dispatch = self._converting(dispatch)
+        super(FixedPointBittrex, self).__init__(api_key, api_secret, calls_per_second, dispatch, api_version,
+                                                rate_limiter, coalesce, clock)
+
+    @staticmethod
+    def _converting(dispatch):
+        def converting_dispatch(request_url, apisign):
+            return fixed_result(dispatch(request_url, apisign))
+
+        return converting_dispatch
+
+    def buy_limit(self, market, quantity, rate):
+        return Bittrex.buy_limit(self, market, _text(quantity), _text(rate))
+
+    def sell_limit(self, market, quantity, rate):
+        return Bittrex.sell_limit(self, market, _text(quantity), _text(rate))
+
+    def withdraw(self, currency, quantity, address):
+        return Bittrex.withdraw(self, currency, _text(quantity), address)
+
+    def trade_buy(self, market=None, order_type=None, quantity=None, rate=None, time_in_effect=None,
+                  condition_type=None, target=0):
+        return Bittrex.trade_buy(self, market, order_type, _text(quantity), _text(rate), time_in_effect,
+                                 condition_type, _text(target))
+
+    def trade_sell(self, market=None, order_type=None, quantity=None, rate=None, time_in_effect=None,
+                   condition_type=None, target=0):
+        return Bittrex.trade_sell(self, market, order_type, _text(quantity), _text(rate), time_in_effect,
+                                  condition_type, _text(target))
@@ -0,0 +1,139 @@
+"""
+   pandas DataFrames built directly from API results.
+
+   Going through DataFrame(list of dicts) makes pandas infer every column
+   type and leaves timestamps as strings.  The helpers here build each
+   column once with a fixed dtype and parse the ISO timestamps in one
+   vectorized numpy call.  Passing {market: result} instead of a result
+   concatenates many markets into one frame with a categorical Market
+   column, without building a frame per market first ::
+
+       frame = candles_frame(my_bittrex.get_candles('BTC-LTC', TICKINTERVAL_HOUR)['result'])
+       trades = market_history_frame(dict((market, my_bittrex.get_market_history(market)['result'])
+                                          for market in ('BTC-LTC', 'BTC-ETH')))
+
+   Requires pandas (pip install pandas).
+"""
+
+from bittrex.archive import MARKET_HISTORY, SUMMARIES
+from bittrex.history import ORDER_HISTORY
+
+CANDLES = 'candles'
+
+# column dtypes
+TIMESTAMP = 'datetime64[ms]'
+FLOAT = 'float64'
+INT = 'int64'
+BOOL = 'bool'
+CATEGORY = 'category'
+STRING = 'object'
+
+MARKET = 'Market'
+
+SCHEMAS = {
+    CANDLES: [('T', TIMESTAMP), ('O', FLOAT), ('H', FLOAT), ('L', FLOAT), ('C', FLOAT), ('V', FLOAT),
+              ('BV', FLOAT)],
+    MARKET_HISTORY: [('Id', INT), ('TimeStamp', TIMESTAMP), ('Quantity', FLOAT), ('Price', FLOAT),
+                     ('Total', FLOAT), ('FillType', CATEGORY), ('OrderType', CATEGORY)],
+    ORDER_HISTORY: [('OrderUuid', STRING), ('Exchange', CATEGORY), ('TimeStamp', TIMESTAMP),
+                    ('OrderType', CATEGORY), ('Limit', FLOAT), ('Quantity', FLOAT), ('QuantityRemaining', FLOAT),
+                    ('Commission', FLOAT), ('Price', FLOAT), ('PricePerUnit', FLOAT), ('IsConditional', BOOL),
+                    ('Condition', CATEGORY), ('ConditionTarget', FLOAT), ('ImmediateOrCancel', BOOL),
+                    ('Closed', TIMESTAMP)],
+    SUMMARIES: [('MarketName', CATEGORY), ('High', FLOAT), ('Low', FLOAT), ('Volume', FLOAT), ('Last', FLOAT),
+                ('BaseVolume', FLOAT), ('TimeStamp', TIMESTAMP), ('Bid', FLOAT), ('Ask', FLOAT),
+                ('OpenBuyOrders', INT), ('OpenSellOrders', INT), ('PrevDay', FLOAT), ('Created', TIMESTAMP)],
+}
+
+
+def _modules():
+    try:
+        import numpy
+        import pandas
+    except ImportError:
+        raise ImportError('"pandas" module has to be installed')
+    return numpy, pandas
+
+
+def _timestamp(value):
+    # numpy only parses naive timestamps
+    return value[:-1] if value and value[-1] == 'Z' else value
+
+
+def _column(numpy, pandas, values, dtype):
+    if dtype == FLOAT:
+        # None becomes NaN
+        return numpy.array(values, dtype=FLOAT)
+    if dtype == TIMESTAMP:
+        # None becomes NaT
+        return numpy.array([_timestamp(value) for value in values], dtype=TIMESTAMP)
+    if dtype == INT:
+        # pandas has no missing value for int64
+        return numpy.array(values, dtype=FLOAT if None in values else INT)
+    if dtype == BOOL:
+        return numpy.array([bool(value) for value in values], dtype=BOOL)
+    if dtype == CATEGORY:
+        codes, categories = pandas.factorize(numpy.array(values, dtype=STRING))
+        return pandas.Categorical.from_codes(codes, categories=categories)
+    return numpy.array(values, dtype=STRING)
+
+
+def to_frame(kind, results):
+    """
+    DataFrame of one endpoint result, or of the results of many markets
+
+    :param kind: CANDLES, MARKET_HISTORY, ORDER_HISTORY or SUMMARIES
+    :type kind: str
+    :param results: result list, or {market: result list} to concatenate with a Market column
+    :type results: list or dict
+    :rtype: pandas.DataFrame
+    """
+    numpy, pandas = _modules()
+    schema = SCHEMAS[kind]
+    if isinstance(results, dict):
+        markets = list(results)
+        lists = [results[market] or [] for market in markets]
+    else:
+        markets = None
+        lists = [results or []]
+    records = [record for result in lists for record in result]
+    if kind == SUMMARIES:
+        # v2.0 wraps every summary as {'Market': {...}, 'Summary': {...}}
+        records = [record.get('Summary', record) for record in records]
+
+    columns = {}
+    if markets is not None:
+        codes = numpy.repeat(numpy.arange(len(markets), dtype='int32'), [len(result) for result in lists])
+        columns[MARKET] = pandas.Categorical.from_codes(codes, categories=markets)
+    for field, dtype in schema:
+        columns[field] = _column(numpy, pandas, [record.get(field) for record in records], dtype)
+    order = ([MARKET] if markets is not None else []) + [field for field, _ in schema]
+    return pandas.DataFrame(columns, columns=order, copy=False)
+
+
+def candles_frame(results):
+    """
+    get_candles / get_latest_candle result(s) as a DataFrame
+    """
+    return to_frame(CANDLES, results)
+
+
+def market_history_frame(results):
+    """
+    get_market_history result(s) as a DataFrame
+    """
+    return to_frame(MARKET_HISTORY, results)
+
+
+def order_history_frame(results):
+    """
+    get_order_history result(s) as a DataFrame
+    """
+    return to_frame(ORDER_HISTORY, results)
+
+
+def summaries_frame(results):
+    """
+    get_market_summaries / get_marketsummary result(s) as a DataFrame, v1.1 or v2.0 layout
+    """
+    return to_frame(SUMMARIES, results)
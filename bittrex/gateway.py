@@ -0,0 +1,232 @@
+"""
+   Local caching gateway in front of Bittrex.
+
+   Many processes on one host can share one gateway instead of each calling
+   the API.  Clients keep building and signing their requests as usual and
+   only send them to the gateway instead of bittrex.com.  Public calls are
+   answered from a TTL cache, with concurrent misses for the same URL
+   sharing one upstream call through a coalescing Bittrex client.  Private calls are forwarded with the caller's
+   apisign and never cached.  All upstream calls go through one rate
+   limiter ::
+
+       python -m bittrex.gateway --port 8765 --calls-per-second 2
+
+       my_bittrex = Bittrex(key, secret, calls_per_second=1e9, dispatch=using_gateway('http://127.0.0.1:8765'))
+"""
+
+import argparse
+import json
+import threading
+import time
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+from bittrex.bittrex import Bittrex, PROTECTION_PUB, request_endpoint, request_priority, using_requests_session
+from bittrex.ratelimit import TokenBucket
+
+BITTREX_URL = 'https://bittrex.com'
+
+DEFAULT_TTL = 1.0
+EXPIRE_INTERVAL = 60.0  # seconds between two sweeps of the expired cache entries
+
+# seconds public responses are served from the cache, by endpoint
+TTLS = {
+    '/public/getmarkets': 300.0,
+    '/public/getcurrencies': 300.0,
+    '/public/getmarketsummaries': 5.0,
+    '/public/getmarketsummary': 5.0,
+    '/pub/Markets/GetMarkets': 300.0,
+    '/pub/Currencies/GetCurrencies': 300.0,
+    '/pub/Currencies/GetWalletHealth': 60.0,
+    '/pub/Markets/GetMarketSummaries': 5.0,
+    '/pub/Market/GetMarketSummary': 5.0,
+    '/pub/market/GetTicks': 30.0,
+}
+
+
+def using_gateway(url, session=None):
+    """
+    Builds a dispatch sending the requests of a Bittrex client to a gateway
+
+    :param url: gateway address, ex: http://127.0.0.1:8765
+    :type url: str
+    :param session: session to use, a new one when omitted
+    :type session: requests.Session
+    :return: dispatch function for Bittrex
+    """
+    url = url.rstrip('/')
+    dispatch = using_requests_session(session)
+
+    def gateway_dispatch(request_url, apisign):
+        return dispatch(url + request_url[len(BITTREX_URL):], apisign)
+
+    return gateway_dispatch
+
+
+class Gateway(object):
+    """
+    Caching, rate limited proxy of the Bittrex API.  Create it with the
+    upstream dispatch and limiter to use, then serve_forever() or start()
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765, upstream=None, rate_limiter=None, ttls=None,
+                 default_ttl=DEFAULT_TTL, expire_interval=EXPIRE_INTERVAL, clock=time.time):
+        """
+        :param upstream: dispatch making the real calls, a pooled requests session when omitted
+        :type upstream: callable
+        :param rate_limiter: limiter shared by all upstream calls, one call per second when omitted
+        :param ttls: {endpoint path: seconds} overriding TTLS
+        :type ttls: dict
+        :param expire_interval: seconds between two sweeps of the expired cache entries
+        :type expire_interval: float
+        """
+        self.upstream = upstream or using_requests_session()
+        self.rate_limiter = rate_limiter or TokenBucket(1)
+        self.ttls = dict(TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self.expire_interval = expire_interval
+        self.clock = clock
+        self.cache = {}
+        self._next_expire = clock() + expire_interval
+        self._counts = {'hits': 0, 'misses': 0, 'fetched': 0, 'forwarded': 0}
+        self._lock = threading.Lock()
+        # makes the public calls, identical concurrent misses share one call
+        self.client = Bittrex(None, None, dispatch=self._fetch, rate_limiter=self.rate_limiter, coalesce=True)
+        self._thread = None
+        self.server = _Server((host, port), _Handler)
+        self.server.gateway = self
+
+    @property
+    def url(self):
+        return 'http://{}:{}'.format(*self.server.server_address[:2])
+
+    @property
+    def stats(self):
+        """
+        {'hits', 'misses', 'coalesced': misses answered by another miss's call, 'forwarded': private calls}
+        """
+        with self._lock:
+            counts = dict(self._counts)
+        counts['coalesced'] = counts['misses'] - counts.pop('fetched')
+        return counts
+
+    def _fetch(self, request_url, apisign):
+        with self._lock:
+            self._counts['fetched'] += 1
+        return self.upstream(request_url, apisign)
+
+    def _call(self, protection, endpoint, path, apisign):
+        if not self.rate_limiter.wait(request_priority(protection, endpoint)):
+            return {'success': False, 'message': 'REQUEST_DROPPED', 'result': None}
+        try:
+            return self.upstream(BITTREX_URL + path, apisign)
+        except Exception:
+            return {'success': False, 'message': 'NO_API_RESPONSE', 'result': None}
+
+    def handle(self, path, apisign):
+        """
+        Response to a request for path, ex: /api/v1.1/public/getticker?market=BTC-LTC
+
+        :raises ValueError: when path is not an API request
+        :rtype: dict
+        """
+        # anything else would change the host the request and its apisign are sent to
+        if not path.startswith('/api/'):
+            raise ValueError('{} is not an API request'.format(path))
+        protection, endpoint = request_endpoint(path)
+        if protection != PROTECTION_PUB:
+            with self._lock:
+                self._counts['forwarded'] += 1
+            return self._call(protection, endpoint, path, apisign)
+
+        now = self.clock()
+        if now >= self._next_expire:
+            self.expire()
+        with self._lock:
+            cached = self.cache.get(path)
+            if cached is not None and cached[0] > now:
+                self._counts['hits'] += 1
+                return cached[1]
+            self._counts['misses'] += 1
+        response = self.client.public_query(BITTREX_URL + path)
+        if response.get('success'):
+            with self._lock:
+                self.cache[path] = (self.clock() + self.ttls.get(endpoint, self.default_ttl), response)
+        return response
+
+    def expire(self):
+        """
+        Drop expired cache entries, done by handle every expire_interval seconds
+        """
+        now = self.clock()
+        with self._lock:
+            self._next_expire = now + self.expire_interval
+            for path in [path for path, (expires, _) in self.cache.items() if expires <= now]:
+                del self.cache[path]
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def start(self):
+        """
+        Serve from a background daemon thread
+        """
+        self._thread = threading.Thread(target=self.serve_forever, name='bittrex-gateway')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        gateway = self.server.gateway
+        try:
+            response, status = gateway.handle(self.path, self.headers.get('apisign', '')), 200
+        except ValueError:
+            response, status = {'success': False, 'message': 'UNKNOWN_ENDPOINT', 'result': None}, 404
+        body = json.dumps(response).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bittrex.gateway', description='Local caching Bittrex gateway')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--calls-per-second', type=float, default=1.0)
+    parser.add_argument('--burst', type=int, default=1)
+    parser.add_argument('--ttl', type=float, default=DEFAULT_TTL, help='cache seconds of endpoints not in TTLS')
+    args = parser.parse_args(argv)
+
+    gateway = Gateway(args.host, args.port, rate_limiter=TokenBucket(args.calls_per_second, args.burst),
+                      default_ttl=args.ttl)
+    try:
+        gateway.serve_forever()
+    except KeyboardInterrupt:
+        gateway.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+   Hedged public requests.
+
+   HedgedDispatch wraps a dispatch.  When a public call has not answered
+   within a high percentile of the recent latencies of its endpoint, the
+   same request is sent a second time and whichever response arrives first
+   is returned.  Hedges take a token from the rate limiter without waiting
+   and are capped to a fraction of the calls, so they never push the client
+   over its budget.  Private calls are never repeated ::
+
+       limiter = TokenBucket(rate=2, burst=2)
+       my_bittrex = Bittrex(None, None, rate_limiter=limiter,
+                            dispatch=HedgedDispatch(using_requests_session(), limiter))
+
+   Requests cannot be aborted once sent; the losing call finishes in its
+   thread and its response is discarded.
+"""
+
+import collections
+import threading
+import time
+
+try:
+    from Queue import Queue, Empty
+except ImportError:
+    from queue import Queue, Empty
+
+from bittrex.bittrex import PROTECTION_PUB, request_endpoint
+
+
+class HedgedDispatch(object):
+    """
+    Dispatch sending a second copy of slow public requests
+    """
+
+    def __init__(self, dispatch, rate_limiter=None, percentile=95, max_ratio=0.05, initial_delay=1.0,
+                 min_delay=0.05, window=200, min_samples=20, clock=time.time):
+        """
+        :param dispatch: dispatch making the calls
+        :type dispatch: callable
+        :param rate_limiter: limiter hedges take a token from, hedges are not limited when None
+        :param percentile: latency percentile of an endpoint after which a hedge is sent
+        :type percentile: float
+        :param max_ratio: maximum hedges per public call
+        :type max_ratio: float
+        :param initial_delay: hedge delay of an endpoint with fewer than min_samples latencies
+        :type initial_delay: float
+        """
+        self.dispatch = dispatch
+        self.rate_limiter = rate_limiter
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.window = window
+        self.min_samples = min_samples
+        self.clock = clock
+        self.latencies = {}
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def delay(self, endpoint):
+        """
+        Seconds to wait for a response of endpoint before hedging
+        """
+        with self._lock:
+            latencies = self.latencies.get(endpoint)
+            if latencies is None or len(latencies) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100.0))
+        return max(self.min_delay, ordered[index])
+
+    def _record(self, endpoint, latency):
+        with self._lock:
+            latencies = self.latencies.get(endpoint)
+            if latencies is None:
+                latencies = self.latencies[endpoint] = collections.deque(maxlen=self.window)
+            latencies.append(latency)
+
+    def _may_hedge(self):
+        with self._lock:
+            if self.hedges + 1 > self.max_ratio * self.calls:
+                return False
+        if self.rate_limiter is not None and not self.rate_limiter.try_acquire():
+            return False
+        with self._lock:
+            self.hedges += 1
+        return True
+
+    def _send(self, endpoint, request_url, apisign, results, hedge):
+        started = self.clock()
+        try:
+            response = self.dispatch(request_url, apisign)
+        except Exception as e:
+            results.put((hedge, None, e))
+        else:
+            # losing calls are recorded too, they are the slow tail
+            self._record(endpoint, self.clock() - started)
+            results.put((hedge, response, None))
+
+    def _start(self, endpoint, request_url, apisign, results, hedge):
+        thread = threading.Thread(target=self._send, args=(endpoint, request_url, apisign, results, hedge))
+        thread.daemon = True
+        thread.start()
+
+    def __call__(self, request_url, apisign):
+        protection, endpoint = request_endpoint(request_url)
+        if protection != PROTECTION_PUB:
+            return self.dispatch(request_url, apisign)
+        with self._lock:
+            self.calls += 1
+
+        results = Queue()
+        self._start(endpoint, request_url, apisign, results, False)
+        pending = 1
+        try:
+            outcome = results.get(timeout=self.delay(endpoint))
+        except Empty:
+            if self._may_hedge():
+                self._start(endpoint, request_url, apisign, results, True)
+                pending += 1
+            outcome = results.get()
+
+        while True:
+            hedge, response, error = outcome
+            pending -= 1
+            if error is None:
+                if hedge:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return response
+            if not pending:
+                raise error
+            outcome = results.get()
@@ -0,0 +1,144 @@
+"""
+   Incremental sync of account history.
+
+   get_order_history, get_deposit_history and get_withdrawal_history always
+   return the complete history.  HistorySync remembers the newest record seen
+   per market or currency and only yields what came after it.
+"""
+
+import json
+import os
+
+ORDER_HISTORY = 'orders'
+DEPOSIT_HISTORY = 'deposits'
+WITHDRAWAL_HISTORY = 'withdrawals'
+
+# (id field, timestamp field) of each record type
+RECORD_KEYS = {
+    ORDER_HISTORY: ('OrderUuid', 'TimeStamp'),
+    DEPOSIT_HISTORY: ('Id', 'LastUpdated'),
+    WITHDRAWAL_HISTORY: ('PaymentUuid', 'Opened'),
+}
+
+ALL = '*'
+
+
+class HistorySync(object):
+    """
+    Yields account history records that are newer than the last checkpoint.
+
+    The checkpoint for each (history, market/currency) pair is the newest
+    timestamp seen and the ids of the records carrying that timestamp, so
+    records sharing a timestamp are neither lost nor repeated.  Checkpoints
+    are kept in a JSON file when checkpoint_fn is given.
+    """
+
+    def __init__(self, bittrex, checkpoint_fn=None):
+        self.bittrex = bittrex
+        self.checkpoint_fn = checkpoint_fn
+        self.checkpoints = {}
+        if checkpoint_fn and os.path.exists(checkpoint_fn):
+            with open(checkpoint_fn) as infile:
+                self.checkpoints = json.load(infile)
+
+    def save(self):
+        if not self.checkpoint_fn:
+            return
+        tmp_fn = self.checkpoint_fn + '.tmp'
+        with open(tmp_fn, 'w') as outfile:
+            json.dump(self.checkpoints, outfile)
+        try:
+            os.replace(tmp_fn, self.checkpoint_fn)
+        except AttributeError:  # python 2
+            os.rename(tmp_fn, self.checkpoint_fn)
+
+    def reset(self, history=None, name=None):
+        """
+        Forget checkpoints, all of them or those of one history / market
+
+        :param history: ORDER_HISTORY, DEPOSIT_HISTORY or WITHDRAWAL_HISTORY
+        :type history: str
+        :param name: market or currency
+        :type name: str
+        """
+        for key in list(self.checkpoints):
+            kind, _, key_name = key.partition(':')
+            if (history is None or kind == history) and (name is None or key_name == name):
+                del self.checkpoints[key]
+        self.save()
+
+    def new_orders(self, market=None):
+        """
+        Order history records newer than the last call, oldest first
+
+        :param market: optional a string literal for the market (ie. BTC-LTC)
+        :type market: str
+        """
+        return self._sync(ORDER_HISTORY, market, self.bittrex.get_order_history)
+
+    def new_deposits(self, currency=None):
+        """
+        Deposit history records newer than the last call, oldest first
+
+        :param currency: optional string literal for the currency (ie. BTC)
+        :type currency: str
+        """
+        return self._sync(DEPOSIT_HISTORY, currency, self.bittrex.get_deposit_history)
+
+    def new_withdrawals(self, currency=None):
+        """
+        Withdrawal history records newer than the last call, oldest first
+
+        :param currency: optional string literal for the currency (ie. BTC)
+        :type currency: str
+        """
+        return self._sync(WITHDRAWAL_HISTORY, currency, self.bittrex.get_withdrawal_history)
+
+    def _sync(self, history, name, method):
+        response = method(name) if name else method()
+        if not response['success']:
+            raise Exception('{} history sync failed: {}'.format(history, response['message']))
+
+        key = '{}:{}'.format(history, name or ALL)
+        records = newer_records(response['result'] or [], history, self.checkpoints.get(key))
+        try:
+            for record in records:
+                yield record
+                self._advance(key, history, record)
+        finally:
+            self.save()
+
+    def _advance(self, key, history, record):
+        id_field, ts_field = RECORD_KEYS[history]
+        timestamp = record[ts_field]
+        checkpoint = self.checkpoints.get(key)
+        if checkpoint is None or timestamp > checkpoint['timestamp']:
+            self.checkpoints[key] = {'timestamp': timestamp, 'ids': [record[id_field]]}
+        elif timestamp == checkpoint['timestamp']:
+            checkpoint['ids'].append(record[id_field])
+
+
+def newer_records(records, history, checkpoint):
+    """
+    Records after the checkpoint, sorted oldest first
+
+    :param records: result list returned by the history endpoint
+    :type records: list
+    :param history: ORDER_HISTORY, DEPOSIT_HISTORY or WITHDRAWAL_HISTORY
+    :type history: str
+    :param checkpoint: {'timestamp': str, 'ids': list} or None
+    :type checkpoint: dict
+    :rtype: list
+    """
+    id_field, ts_field = RECORD_KEYS[history]
+    if checkpoint is None:
+        fresh = list(records)
+    else:
+        last, seen = checkpoint['timestamp'], set(checkpoint['ids'])
+        fresh = []
+        for record in records:
+            timestamp = record[ts_field]
+            if timestamp > last or (timestamp == last and record[id_field] not in seen):
+                fresh.append(record)
+    fresh.sort(key=lambda record: record[ts_field])
+    return fresh
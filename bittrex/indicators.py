@@ -0,0 +1,262 @@
+"""
+   Streaming technical indicators.
+
+   Every indicator keeps O(1) rolling state and is updated with one candle
+   at a time, as returned by get_latest_candle ::
+
+       rsi = RSI(14).seed(my_bittrex.get_candles('BTC-LTC', TICKINTERVAL_ONEMIN)['result'])
+       rsi.update(my_bittrex.get_latest_candle('BTC-LTC', TICKINTERVAL_ONEMIN)['result'][0])
+
+   get_latest_candle keeps returning the still forming candle.  An update
+   with the same 'T' as the previous one replaces that candle instead of
+   adding a new one.
+"""
+
+import math
+from collections import deque
+
+from bittrex.candles import format_timestamp
+
+
+class RollingWindow(object):
+    """
+    Fixed size ring buffer keeping the running sum and sum of squares
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._evicted = None
+
+    def __len__(self):
+        return len(self.values)
+
+    @property
+    def full(self):
+        return len(self.values) == self.size
+
+    def push(self, value):
+        self._evicted = self.values.popleft() if len(self.values) == self.size else None
+        if self._evicted is not None:
+            self.total -= self._evicted
+            self.total_sq -= self._evicted * self._evicted
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+
+    def undo(self):
+        """
+        Revert the last push
+        """
+        value = self.values.pop()
+        self.total -= value
+        self.total_sq -= value * value
+        if self._evicted is not None:
+            self.values.appendleft(self._evicted)
+            self.total += self._evicted
+            self.total_sq += self._evicted * self._evicted
+            self._evicted = None
+
+    @property
+    def mean(self):
+        return self.total / len(self.values)
+
+    @property
+    def stdev(self):
+        mean = self.mean
+        return math.sqrt(max(0.0, self.total_sq / len(self.values) - mean * mean))
+
+
+class Indicator(object):
+    """
+    Base class: subclasses implement _push(close, high, low), returning the
+    new value, and _undo() reverting the last _push.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self.value = None
+        self.timestamp = None
+
+    @property
+    def ready(self):
+        return self.value is not None
+
+    def update(self, candle):
+        """
+        :param candle: candle dict with at least 'C' (and 'H', 'L' for ATR) and 'T'
+        :type candle: dict
+        :return: the indicator value, None until enough candles were seen
+        """
+        timestamp = candle.get('T')
+        if timestamp is not None and timestamp == self.timestamp:
+            self._undo()
+        self.timestamp = timestamp
+        self.value = self._push(candle['C'], candle.get('H'), candle.get('L'))
+        return self.value
+
+    def seed(self, candles):
+        """
+        Initialize from many candles at once
+
+        :param candles: a list of candle dicts (get_candles result) or a Candles object
+        :return: self
+        """
+        if hasattr(candles, 'C'):
+            push = self._push
+            for close, high, low in zip(candles.C, candles.H, candles.L):
+                self.value = push(close, high, low)
+            if len(candles):
+                self.timestamp = format_timestamp(candles.T[-1])
+        else:
+            for candle in candles:
+                self.update(candle)
+        return self
+
+
+class SMA(Indicator):
+    """
+    Simple moving average of the close
+    """
+
+    def __init__(self, period):
+        super(SMA, self).__init__(period)
+        self.window = RollingWindow(period)
+
+    def _push(self, close, high, low):
+        self.window.push(close)
+        return self.window.mean if self.window.full else None
+
+    def _undo(self):
+        self.window.undo()
+
+
+class BollingerBands(Indicator):
+    """
+    Bollinger bands of the close, value is (middle, upper, lower)
+    """
+
+    def __init__(self, period=20, width=2.0):
+        super(BollingerBands, self).__init__(period)
+        self.width = width
+        self.window = RollingWindow(period)
+
+    def _push(self, close, high, low):
+        self.window.push(close)
+        if not self.window.full:
+            return None
+        middle, offset = self.window.mean, self.width * self.window.stdev
+        return middle, middle + offset, middle - offset
+
+    def _undo(self):
+        self.window.undo()
+
+
+class _ScalarIndicator(Indicator):
+    """
+    Indicators whose whole state is a few scalars listed in _state_fields
+    """
+    _state_fields = ()
+
+    def __init__(self, period):
+        super(_ScalarIndicator, self).__init__(period)
+        self._saved = None
+
+    def _save(self):
+        self._saved = tuple(getattr(self, field) for field in self._state_fields)
+
+    def _undo(self):
+        for field, value in zip(self._state_fields, self._saved):
+            setattr(self, field, value)
+
+
+class EMA(_ScalarIndicator):
+    """
+    Exponential moving average of the close, seeded with the SMA of the
+    first period closes
+    """
+    _state_fields = ('ema', 'count', 'total')
+
+    def __init__(self, period):
+        super(EMA, self).__init__(period)
+        self.alpha = 2.0 / (period + 1)
+        self.ema = None
+        self.count = 0
+        self.total = 0.0
+
+    def _push(self, close, high, low):
+        self._save()
+        if self.ema is None:
+            self.count += 1
+            self.total += close
+            if self.count == self.period:
+                self.ema = self.total / self.period
+        else:
+            self.ema += self.alpha * (close - self.ema)
+        return self.ema
+
+
+class RSI(_ScalarIndicator):
+    """
+    Relative strength index of the close with Wilder smoothing
+    """
+    _state_fields = ('previous', 'gain', 'loss', 'count')
+
+    def __init__(self, period=14):
+        super(RSI, self).__init__(period)
+        self.previous = None
+        self.gain = 0.0
+        self.loss = 0.0
+        self.count = 0
+
+    def _push(self, close, high, low):
+        self._save()
+        previous, self.previous = self.previous, close
+        if previous is None:
+            return None
+        change = close - previous
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        if self.count < self.period:
+            self.count += 1
+            self.gain += gain / self.period
+            self.loss += loss / self.period
+            if self.count < self.period:
+                return None
+        else:
+            self.gain += (gain - self.gain) / self.period
+            self.loss += (loss - self.loss) / self.period
+        if self.loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self.gain / self.loss)
+
+
+class ATR(_ScalarIndicator):
+    """
+    Average true range with Wilder smoothing
+    """
+    _state_fields = ('previous', 'atr', 'count', 'total')
+
+    def __init__(self, period=14):
+        super(ATR, self).__init__(period)
+        self.previous = None
+        self.atr = None
+        self.count = 0
+        self.total = 0.0
+
+    def _push(self, close, high, low):
+        self._save()
+        if self.previous is None:
+            true_range = high - low
+        else:
+            true_range = max(high, self.previous) - min(low, self.previous)
+        self.previous = close
+        if self.atr is None:
+            self.count += 1
+            self.total += true_range
+            if self.count == self.period:
+                self.atr = self.total / self.period
+        else:
+            self.atr += (true_range - self.atr) / self.period
+        return self.atr
@@ -0,0 +1,138 @@
+"""
+   One result layout for both API versions.
+
+   NormalizingBittrex returns every supported endpoint in the v1.1 layout,
+   whatever api_version it runs under, so callers no longer branch on the
+   version ::
+
+       my_bittrex = NormalizingBittrex(None, None, api_version=API_V2_0)
+       my_bittrex.get_ticker('BTC-LTC')                    # synthesized from GetMarketSummary
+       my_bittrex.get_orderbook('BTC-LTC', BUY_ORDERBOOK)  # only the buy side, as under v1.1
+       my_bittrex.get_market_summaries()                   # flat summaries
+
+   The conversions are looked up once per endpoint and version in
+   NORMALIZERS; v1.1 results have no entry and are returned untouched.  v2.0
+   results are rearranged in one pass that reuses the decoded dicts rather
+   than copying them.  A result that does not have the expected shape is
+   replaced by an INVALID_RESPONSE error response.
+"""
+
+from operator import itemgetter
+
+from bittrex.bittrex import Bittrex, API_V1_1, API_V2_0, BOTH_ORDERBOOK
+
+TICKER_FIELDS = ('Bid', 'Ask', 'Last')
+
+_ticker_values = itemgetter(*TICKER_FIELDS)
+
+
+def _markets(result, *args):
+    return [market.get('Market', market) for market in result]
+
+
+def _summaries(result, *args):
+    return [summary['Summary'] for summary in result]
+
+
+def _summary(result, *args):
+    # v1.1 returns the summary of one market as a list of one
+    return [result]
+
+
+def _ticker(result, *args):
+    return dict(zip(TICKER_FIELDS, _ticker_values(result)))
+
+
+def _orderbook(result, market, depth_type=BOTH_ORDERBOOK):
+    # v2.0 ignores the depth type and always returns both sides
+    if depth_type == BOTH_ORDERBOOK:
+        return result
+    return result[depth_type]
+
+
+def flat_balance(balance):
+    """
+    The balance of a v2.0 {'Currency': {...}, 'Balance': {...}} entry
+    """
+    return balance['Balance'] if isinstance(balance.get('Balance'), dict) else balance
+
+
+def _balances(result, *args):
+    return [flat_balance(balance) for balance in result]
+
+
+# (method, api version) -> normalizer(result, *method arguments)
+NORMALIZERS = {
+    ('get_markets', API_V2_0): _markets,
+    ('get_market_summaries', API_V2_0): _summaries,
+    ('get_marketsummary', API_V2_0): _summary,
+    ('get_orderbook', API_V2_0): _orderbook,
+    ('get_balances', API_V2_0): _balances,
+}
+
+
+def normalize(method, api_version, response, *args):
+    """
+    Convert the response of a Bittrex method to the v1.1 layout, in place
+
+    :param method: name of the Bittrex method, ex: get_orderbook
+    :type method: str
+    :param args: arguments the method was called with
+    :return: response
+    :rtype: dict
+    """
+    normalizer = NORMALIZERS.get((method, api_version))
+    if normalizer is None or not response['success'] or response['result'] is None:
+        return response
+    try:
+        response['result'] = normalizer(response['result'], *args)
+    except (KeyError, TypeError, AttributeError, IndexError):
+        return {
+            'success': False,
+            'message': 'INVALID_RESPONSE',
+            'result': None
+        }
+    return response
+
+
+class NormalizingBittrex(Bittrex):
+    """
+    Bittrex client whose results have the v1.1 layout under both API versions
+    """
+
+    def _normalized(self, method, *args):
+        return normalize(method, self.api_version, getattr(Bittrex, method)(self, *args), *args)
+
+    def get_markets(self):
+        return self._normalized('get_markets')
+
+    def get_market_summaries(self):
+        return self._normalized('get_market_summaries')
+
+    def get_marketsummary(self, market):
+        return self._normalized('get_marketsummary', market)
+
+    def get_orderbook(self, market, depth_type=BOTH_ORDERBOOK):
+        return self._normalized('get_orderbook', market, depth_type)
+
+    def get_balances(self):
+        return self._normalized('get_balances')
+
+    def get_ticker(self, market):
+        """
+        Under v2.0, which has no ticker endpoint, the ticker is built from
+        the market summary
+        """
+        if self.api_version == API_V1_1:
+            return Bittrex.get_ticker(self, market)
+        response = self.get_marketsummary(market)
+        if response['success']:
+            try:
+                response['result'] = _ticker(response['result'][0])
+            except (KeyError, TypeError, IndexError):
+                return {
+                    'success': False,
+                    'message': 'INVALID_RESPONSE',
+                    'result': None
+                }
+        return response
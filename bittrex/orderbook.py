@@ -0,0 +1,236 @@
+"""
+   Order book analytics: fill price, slippage, impact and depth curves.
+
+   A get_orderbook result is converted once into price and cumulative
+   quantity / cost columns.  Every question after that (fill price for many
+   order sizes, depth within some percent of the best price) is a binary
+   search over those columns instead of a walk over the levels ::
+
+       book = OrderBook(my_bittrex.get_orderbook('BTC-LTC')['result'])
+       book.estimate_buy([1, 10, 100])
+       book.depth_within([0.5, 1, 2])
+
+   Books of a FixedPointBittrex are built with fixed=True: the columns are
+   then 64 bit integer arrays in 1e-8 units and costs, prices and depths are
+   integers in the same units, rounded down to whole units.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+from bittrex.bittrex import BUY_ORDERBOOK, SELL_ORDERBOOK
+from bittrex.fixed import SCALE, TYPECODE
+
+
+class BookSide(object):
+    """
+    One side of an order book, best level first.
+
+    rates, quantities, cum_quantity and cum_cost are parallel columns:
+    cum_quantity[i] / cum_cost[i] hold the quantity / base currency cost of
+    levels 0 to i.
+    """
+
+    def __init__(self, levels, side, fixed=False):
+        """
+        :param levels: [{'Quantity': float, 'Rate': float}, ...]
+        :type levels: list
+        :param side: BUY_ORDERBOOK (bids) or SELL_ORDERBOOK (asks)
+        :type side: str
+        :param fixed: levels are in 1e-8 units (see bittrex.fixed)
+        :type fixed: bool
+        """
+        self.side = side
+        self.fixed = fixed
+        self.zero = 0 if fixed else 0.0
+        typecode = TYPECODE if fixed else 'd'
+        self.sign = -1 if side == BUY_ORDERBOOK else 1
+        pairs = sorted(((level['Rate'], level['Quantity']) for level in levels or ()),
+                       key=lambda pair: self.sign * pair[0])
+        self.rates = array(typecode, [rate for rate, _ in pairs])
+        self.quantities = array(typecode, [quantity for _, quantity in pairs])
+        # signed rates are ascending on both sides, ready for bisect
+        self._keys = array(typecode, [self.sign * rate for rate in self.rates])
+        self.cum_quantity = array(typecode)
+        self.cum_cost = array(typecode)
+        total_quantity = total_cost = self.zero
+        for rate, quantity in pairs:
+            total_quantity += quantity
+            total_cost += self._cost(quantity, rate)
+            self.cum_quantity.append(total_quantity)
+            self.cum_cost.append(total_cost)
+
+    def _cost(self, quantity, rate):
+        return quantity * rate // SCALE if self.fixed else quantity * rate
+
+    def __len__(self):
+        return len(self.rates)
+
+    @property
+    def best(self):
+        return self.rates[0] if self.rates else None
+
+    @property
+    def total_quantity(self):
+        return self.cum_quantity[-1] if self.cum_quantity else self.zero
+
+    def fill(self, size):
+        """
+        Take size from this side of the book
+
+        :return: (filled quantity, base currency cost, worst rate reached)
+        :rtype: tuple
+        """
+        index = bisect_left(self.cum_quantity, size)
+        if index >= len(self.rates):
+            if not self.rates:
+                return self.zero, self.zero, None
+            return self.cum_quantity[-1], self.cum_cost[-1], self.rates[-1]
+        before_quantity = self.cum_quantity[index - 1] if index else self.zero
+        before_cost = self.cum_cost[index - 1] if index else self.zero
+        rate = self.rates[index]
+        return size, before_cost + self._cost(size - before_quantity, rate), rate
+
+    def estimate(self, sizes):
+        """
+        Fill estimates of market orders of the given sizes against this side
+
+        slippage is how much worse than the best rate the average fill price
+        is, impact how much worse the last rate reached is; both are fractions
+        of the best rate.
+
+        :param sizes: order quantities in the market currency
+        :type sizes: list
+        :return: one dict per size with filled, cost, price, slippage, impact
+        :rtype: list
+        """
+        best = self.best
+        estimates = []
+        for size in sizes:
+            filled, cost, worst = self.fill(size)
+            if not filled:
+                price = None
+            elif self.fixed:
+                price = cost * SCALE // filled
+            else:
+                price = cost / filled
+            estimates.append({
+                'size': size,
+                'filled': filled,
+                'cost': cost,
+                'price': price,
+                'slippage': self.sign * (price - best) / float(best) if filled else None,
+                'impact': self.sign * (worst - best) / float(best) if filled else None,
+            })
+        return estimates
+
+    def depth_within(self, percents):
+        """
+        Quantity and base currency value available within some percent of
+        the best rate
+
+        :param percents: ex: [0.5, 1, 2]
+        :type percents: list
+        :return: [(percent, quantity, base cost)]
+        :rtype: list
+        """
+        if not self.rates:
+            return [(percent, self.zero, self.zero) for percent in percents]
+        best_key = self._keys[0]
+        depth = []
+        for percent in percents:
+            index = bisect_right(self._keys, best_key + abs(best_key) * percent / 100.0)
+            depth.append((percent, self.cum_quantity[index - 1], self.cum_cost[index - 1]))
+        return depth
+
+
+class OrderBook(object):
+    """
+    Both sides of a get_orderbook(market, BOTH_ORDERBOOK) result
+    """
+
+    def __init__(self, orderbook, market=None, fixed=False):
+        self.market = market
+        self.fixed = fixed
+        self.bids = BookSide(orderbook.get(BUY_ORDERBOOK), BUY_ORDERBOOK, fixed)
+        self.asks = BookSide(orderbook.get(SELL_ORDERBOOK), SELL_ORDERBOOK, fixed)
+
+    @property
+    def mid(self):
+        if self.bids.best is None or self.asks.best is None:
+            return None
+        if self.fixed:
+            return (self.bids.best + self.asks.best) // 2
+        return (self.bids.best + self.asks.best) / 2.0
+
+    @property
+    def spread(self):
+        """
+        Spread as a fraction of the mid price
+        """
+        mid = self.mid
+        return (self.asks.best - self.bids.best) / float(mid) if mid else None
+
+    def estimate_buy(self, sizes):
+        """
+        Fill estimates of buy orders (taking the asks), see BookSide.estimate
+        """
+        return self.asks.estimate(sizes)
+
+    def estimate_sell(self, sizes):
+        """
+        Fill estimates of sell orders (taking the bids), see BookSide.estimate
+        """
+        return self.bids.estimate(sizes)
+
+    def depth_within(self, percents):
+        """
+        Base currency value within percent of the best price on both sides
+
+        :return: [(percent, bid value, ask value)]
+        :rtype: list
+        """
+        return [(percent, bid[2], ask[2])
+                for percent, bid, ask in zip(percents, self.bids.depth_within(percents),
+                                             self.asks.depth_within(percents))]
+
+
+def _as_orderbook(market, book):
+    return book if isinstance(book, OrderBook) else OrderBook(book, market)
+
+
+def estimate_markets(orderbooks, sizes, buy=True):
+    """
+    Fill estimates of the same order sizes in many markets
+
+    :param orderbooks: market name -> get_orderbook result or OrderBook
+    :type orderbooks: dict
+    :param sizes: order quantities in the market currency
+    :type sizes: list
+    :param buy: estimate buy orders, or sell orders when False
+    :type buy: bool
+    :return: market name -> estimates as returned by BookSide.estimate
+    :rtype: dict
+    """
+    estimates = {}
+    for market, book in orderbooks.items():
+        book = _as_orderbook(market, book)
+        estimates[market] = book.estimate_buy(sizes) if buy else book.estimate_sell(sizes)
+    return estimates
+
+
+def rank_by_depth(orderbooks, percent=1.0):
+    """
+    Rank markets by the base currency value within percent of both best
+    prices, most liquid first
+
+    :param orderbooks: market name -> get_orderbook result or OrderBook
+    :type orderbooks: dict
+    :rtype: list of (market, value)
+    """
+    ranking = []
+    for market, book in orderbooks.items():
+        _, bid_value, ask_value = _as_orderbook(market, book).depth_within([percent])[0]
+        ranking.append((market, bid_value + ask_value))
+    ranking.sort(key=lambda item: -item[1])
+    return ranking
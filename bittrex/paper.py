@@ -0,0 +1,531 @@
+"""
+   In-process paper trading exchange.
+
+   PaperExchange is a drop-in dispatch for Bittrex: orders placed through
+   buy_limit, sell_limit, trade_buy and trade_sell are matched in memory
+   against recorded get_orderbook / get_market_history data instead of being
+   sent to bittrex.com ::
+
+       exchange = PaperExchange(balances={'BTC': 1.0})
+       exchange.load_orderbook('BTC-LTC', my_bittrex.get_orderbook('BTC-LTC')['result'])
+       paper = Bittrex(None, None, calls_per_second=1e9, dispatch=exchange)
+       paper.buy_limit('BTC-LTC', 10, 0.0101)
+"""
+
+import collections
+import heapq
+import itertools
+import time
+import uuid as uuidlib
+
+try:
+    from urlparse import parse_qsl
+except ImportError:
+    from urllib.parse import parse_qsl
+
+from bittrex.bittrex import ORDERTYPE_LIMIT, ORDERTYPE_MARKET, TIMEINEFFECT_IMMEDIATE_OR_CANCEL, \
+    TIMEINEFFECT_FILL_OR_KILL, CONDITIONTYPE_NONE, CONDITIONTYPE_GREATER_THAN, CONDITIONTYPE_LESS_THAN, \
+    CONDITIONTYPE_STOP_LOSS_FIXED, CONDITIONTYPE_STOP_LOSS_PERCENTAGE, BUY_ORDERBOOK, SELL_ORDERBOOK
+
+BUY = 'BUY'
+SELL = 'SELL'
+
+DEFAULT_COMMISSION = 0.0025
+
+
+def _response(result=None, message=''):
+    return {'success': True, 'message': message, 'result': result}
+
+
+def _error(message):
+    return {'success': False, 'message': message, 'result': None}
+
+
+def _timestamp(epoch):
+    if epoch is None:
+        return None
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(epoch)) + '.{:03d}'.format(int(epoch * 1000) % 1000)
+
+
+def _text(params, *names):
+    # urlencode turns unset options into the string 'None'
+    for name in names:
+        value = params.get(name)
+        if value not in (None, 'None', ''):
+            return value
+    return None
+
+
+def _number(params, name, default=None):
+    value = _text(params, name)
+    return default if value is None else float(value)
+
+
+def _in_order(heap):
+    """
+    Entries of a heap smallest first, without sorting or modifying it
+    """
+    pending = [(heap[0], 0)] if heap else []
+    while pending:
+        entry, index = heapq.heappop(pending)
+        yield entry
+        for child in (2 * index + 1, 2 * index + 2):
+            if child < len(heap):
+                heapq.heappush(pending, (heap[child], child))
+
+
+class Order(object):
+    """
+    A simulated order; rendered in the v1.1 get_order layout by as_dict()
+    """
+    __slots__ = ('uuid', 'market', 'side', 'order_type', 'quantity', 'remaining', 'limit', 'price', 'commission',
+                 'reserved', 'opened', 'closed', 'cancelled', 'immediate_or_cancel', 'fill_or_kill', 'condition',
+                 'target', 'extreme', 'seq')
+
+    def __init__(self, uuid, market, side, quantity, limit, opened, seq):
+        self.uuid = uuid
+        self.market = market
+        self.side = side
+        self.order_type = ORDERTYPE_LIMIT
+        self.quantity = quantity
+        self.remaining = quantity
+        self.limit = limit
+        self.price = 0.0
+        self.commission = 0.0
+        self.reserved = 0.0
+        self.opened = opened
+        self.closed = None
+        self.cancelled = False
+        self.immediate_or_cancel = False
+        self.fill_or_kill = False
+        self.condition = CONDITIONTYPE_NONE
+        self.target = 0.0
+        self.extreme = None
+        self.seq = seq
+
+    @property
+    def is_open(self):
+        return self.closed is None
+
+    def as_dict(self):
+        filled = self.quantity - self.remaining
+        order_type = self.order_type + '_' + self.side
+        return {
+            'OrderUuid': self.uuid,
+            'Exchange': self.market,
+            'Type': order_type,
+            'OrderType': order_type,
+            'Quantity': self.quantity,
+            'QuantityRemaining': self.remaining,
+            'Limit': self.limit,
+            'CommissionPaid': self.commission,
+            'Price': self.price,
+            'PricePerUnit': self.price / filled if filled else None,
+            'Opened': _timestamp(self.opened),
+            'Closed': _timestamp(self.closed),
+            'IsOpen': self.is_open,
+            'CancelInitiated': self.cancelled,
+            'ImmediateOrCancel': self.immediate_or_cancel,
+            'IsConditional': self.condition != CONDITIONTYPE_NONE,
+            'Condition': self.condition,
+            'ConditionTarget': self.target,
+        }
+
+
+class PaperExchange(object):
+    """
+    In-memory matching engine usable as the dispatch of a Bittrex client.
+
+    Incoming orders take liquidity from the recorded order book and from
+    resting simulated orders, best price first and oldest first within a
+    price (recorded levels are considered older than simulated orders).
+    Resting simulated orders are filled by recorded trades fed through
+    load_market_history: a BUY trade fills resting asks, a SELL trade
+    resting bids.  Commission is charged on the traded base amount.
+    """
+
+    def __init__(self, balances=None, commission=DEFAULT_COMMISSION, fallback=None, clock=time.time):
+        """
+        :param balances: initial balances, ex: {'BTC': 1.0}
+        :type balances: dict
+        :param commission: commission rate charged on every fill
+        :type commission: float
+        :param fallback: dispatch used for endpoints the simulator does not handle
+        :type fallback: callable
+        :param clock: returns the current epoch, override to replay recorded time
+        :type clock: callable
+        """
+        self.commission = commission
+        self.fallback = fallback
+        self.clock = clock
+        self.balances = {}
+        self.available = {}
+        self.orders = {}
+        self.open = {}  # uuid -> order, of the orders not closed yet
+        self.books = {}
+        self.bids = {}
+        self.asks = {}
+        self.conditional = {}
+        self.last_price = {}
+        self._seq = itertools.count()
+        for currency, amount in (balances or {}).items():
+            self.deposit(currency, amount)
+
+        self._routes = {
+            '/market/buylimit': self._route_buy_limit,
+            '/market/selllimit': self._route_sell_limit,
+            '/key/market/tradebuy': self._route_trade_buy,
+            '/key/market/tradesell': self._route_trade_sell,
+            '/market/cancel': self._route_cancel,
+            '/key/market/tradecancel': self._route_cancel,
+            '/account/getorder': self._route_get_order,
+            '/key/orders/getorder': self._route_get_order,
+            '/market/getopenorders': self._route_get_open_orders,
+            '/key/market/getopenorders': self._route_get_open_orders,
+            '/account/getbalances': self._route_get_balances,
+            '/key/balance/getbalances': self._route_get_balances,
+            '/account/getbalance': self._route_get_balance,
+            '/key/balance/getbalance': self._route_get_balance,
+            '/public/getorderbook': self._route_get_orderbook,
+            '/pub/Market/GetMarketOrderBook': self._route_get_orderbook,
+        }
+
+    # -- market data ---------------------------------------------------------
+
+    def deposit(self, currency, amount):
+        self.balances[currency] = self.balances.get(currency, 0.0) + amount
+        self.available[currency] = self.available.get(currency, 0.0) + amount
+
+    def load_orderbook(self, market, orderbook):
+        """
+        Replace the recorded liquidity of a market
+
+        :param market: String literal for the market (ex: BTC-LTC)
+        :type market: str
+        :param orderbook: the result of get_orderbook(market, BOTH_ORDERBOOK)
+        :type orderbook: dict
+        """
+        self.books[market] = (
+            collections.deque(sorted(([level['Rate'], level['Quantity']]
+                                      for level in orderbook.get(BUY_ORDERBOOK) or []), key=lambda level: -level[0])),
+            collections.deque(sorted(([level['Rate'], level['Quantity']]
+                                      for level in orderbook.get(SELL_ORDERBOOK) or []), key=lambda level: level[0])),
+        )
+
+    def load_market_history(self, market, trades):
+        """
+        Replay recorded trades: triggers conditional orders and fills
+        resting orders the trades went through
+
+        :param market: String literal for the market (ex: BTC-LTC)
+        :type market: str
+        :param trades: the result of get_market_history(market)
+        :type trades: list
+        """
+        for trade in sorted(trades, key=lambda t: (t['TimeStamp'], t.get('Id'))):
+            self.trade(market, trade['Price'], trade['Quantity'], trade.get('OrderType'))
+
+    def trade(self, market, price, quantity, order_type=None):
+        """
+        Apply a single market trade at price for quantity
+
+        :param order_type: side of the taker, BUY fills resting asks and SELL resting bids; both sides when None
+        :type order_type: str
+        """
+        self.last_price[market] = price
+        self._check_conditions(market, price)
+        if order_type != BUY:
+            remaining = quantity
+            bids = self.bids.get(market)
+            while remaining > 0 and bids:
+                order = self._best(bids)
+                if order is None or order.limit < price:
+                    break
+                remaining -= self._fill(order, min(remaining, order.remaining), order.limit)
+        if order_type != SELL:
+            remaining = quantity
+            asks = self.asks.get(market)
+            while remaining > 0 and asks:
+                order = self._best(asks)
+                if order is None or order.limit > price:
+                    break
+                remaining -= self._fill(order, min(remaining, order.remaining), order.limit)
+
+    # -- trading ---------------------------------------------------------------
+
+    def place(self, market, side, quantity, rate=None, order_type=None, time_in_effect=None,
+              condition_type=None, target=0.0):
+        """
+        Place an order
+
+        :return: (order, None) or (None, error message)
+        :rtype: tuple
+        """
+        if not quantity or quantity <= 0:
+            return None, 'INVALID_QUANTITY'
+        market_order = order_type == ORDERTYPE_MARKET or rate is None
+        if market_order:
+            rate = self._sweep_rate(market, side, quantity)
+            if rate is None:
+                return None, 'INSUFFICIENT_LIQUIDITY'
+            time_in_effect = TIMEINEFFECT_IMMEDIATE_OR_CANCEL
+        elif rate <= 0:
+            return None, 'INVALID_RATE'
+
+        base, currency = market.split('-', 1)
+        if side == BUY:
+            funding, reserve = base, quantity * rate * (1 + self.commission)
+        else:
+            funding, reserve = currency, quantity
+        if self.available.get(funding, 0.0) < reserve:
+            return None, 'INSUFFICIENT_FUNDS'
+
+        order = Order(str(uuidlib.uuid4()), market, side, quantity, rate, self.clock(), next(self._seq))
+        if market_order:
+            order.order_type = ORDERTYPE_MARKET
+        order.reserved = reserve
+        order.immediate_or_cancel = time_in_effect in (TIMEINEFFECT_IMMEDIATE_OR_CANCEL, TIMEINEFFECT_FILL_OR_KILL)
+        order.fill_or_kill = time_in_effect == TIMEINEFFECT_FILL_OR_KILL
+        self.available[funding] -= reserve
+        self.orders[order.uuid] = order
+        self.open[order.uuid] = order
+
+        if condition_type and condition_type != CONDITIONTYPE_NONE:
+            order.condition = condition_type
+            order.target = target or 0.0
+            order.extreme = self.last_price.get(market)
+            self.conditional.setdefault(market, []).append(order)
+            if order.extreme is not None:
+                self._check_conditions(market, order.extreme)
+            return order, None
+
+        self._activate(order)
+        return order, None
+
+    def cancel(self, uuid):
+        order = self.orders.get(uuid)
+        if order is None:
+            return 'INVALID_ORDER'
+        if not order.is_open:
+            return 'ORDER_NOT_OPEN'
+        order.cancelled = True
+        if order.condition != CONDITIONTYPE_NONE and order in self.conditional.get(order.market, ()):
+            self.conditional[order.market].remove(order)
+        self._close(order)
+        return None
+
+    def open_orders(self, market=None):
+        return [order for order in self.open.values() if market is None or order.market == market]
+
+    # -- matching ------------------------------------------------------------
+
+    def _activate(self, order):
+        if order.fill_or_kill and self._liquidity(order.market, order.side, order.limit) < order.remaining:
+            order.cancelled = True
+            self._close(order)
+            return
+        self._match(order)
+        if not order.is_open:
+            return
+        if order.immediate_or_cancel:
+            self._close(order)
+        elif order.side == BUY:
+            heapq.heappush(self.bids.setdefault(order.market, []), (-order.limit, order.seq, order))
+        else:
+            heapq.heappush(self.asks.setdefault(order.market, []), (order.limit, order.seq, order))
+
+    def _match(self, order):
+        levels = self.books.get(order.market, ((), ()))[1 if order.side == BUY else 0]
+        resting = (self.asks if order.side == BUY else self.bids).get(order.market)
+        sign = 1 if order.side == BUY else -1
+        limit = sign * order.limit
+        while order.remaining > 0:
+            level = levels[0] if levels else None
+            maker = self._best(resting) if resting else None
+            # recorded liquidity wins ties: it was in the book first
+            if level is not None and (maker is None or sign * level[0] <= sign * maker.limit):
+                if sign * level[0] > limit:
+                    break
+                quantity = min(order.remaining, level[1])
+                self._fill(order, quantity, level[0])
+                level[1] -= quantity
+                if level[1] <= 0:
+                    levels.popleft()
+            elif maker is not None:
+                if sign * maker.limit > limit:
+                    break
+                quantity = min(order.remaining, maker.remaining)
+                self._fill(maker, quantity, maker.limit)
+                self._fill(order, quantity, maker.limit)
+            else:
+                break
+
+    def _best(self, heap):
+        while heap:
+            order = heap[0][2]
+            if order.is_open and order.remaining > 0:
+                return order
+            heapq.heappop(heap)
+        return None
+
+    def _fill(self, order, quantity, price):
+        base, currency = order.market.split('-', 1)
+        value = quantity * price
+        commission = value * self.commission
+        if order.side == BUY:
+            cost = value + commission
+            self.balances[base] -= cost
+            reserve = quantity * order.limit * (1 + self.commission)
+            self.available[base] += reserve - cost
+            order.reserved -= reserve
+            self.deposit(currency, quantity)
+        else:
+            self.balances[currency] -= quantity
+            order.reserved -= quantity
+            self.deposit(base, value - commission)
+        order.remaining -= quantity
+        order.price += value
+        order.commission += commission
+        if order.remaining <= 1e-12:
+            order.remaining = 0.0
+            self._close(order)
+        return quantity
+
+    def _close(self, order):
+        order.closed = self.clock()
+        self.open.pop(order.uuid, None)
+        if order.reserved > 0:
+            base, currency = order.market.split('-', 1)
+            self.available[base if order.side == BUY else currency] += order.reserved
+            order.reserved = 0.0
+
+    def _sweep_rate(self, market, side, quantity):
+        """
+        Worst price needed to fill quantity from the available liquidity
+        """
+        # recorded levels are sorted and resting heaps keyed by sign * limit, best first
+        sign = 1 if side == BUY else -1
+        levels = ((sign * level[0], level[1]) for level in self.books.get(market, ((), ()))[1 if side == BUY else 0])
+        resting = ((key, order.remaining) for key, _, order in
+                   _in_order((self.asks if side == BUY else self.bids).get(market) or ()) if order.is_open)
+        for key, available in heapq.merge(levels, resting):
+            quantity -= available
+            if quantity <= 0:
+                return sign * key
+        return None
+
+    def _liquidity(self, market, side, rate):
+        levels = self.books.get(market, ((), ()))[1 if side == BUY else 0]
+        resting = (self.asks if side == BUY else self.bids).get(market) or ()
+        sign = 1 if side == BUY else -1
+        return sum(level[1] for level in levels if sign * level[0] <= sign * rate) + \
+            sum(order.remaining for _, _, order in resting if order.is_open and sign * order.limit <= sign * rate)
+
+    def _check_conditions(self, market, price):
+        pending = self.conditional.get(market)
+        if not pending:
+            return
+        triggered = []
+        for order in pending:
+            if order.condition == CONDITIONTYPE_STOP_LOSS_PERCENTAGE:
+                if order.extreme is None:
+                    order.extreme = price
+                elif order.side == SELL:
+                    order.extreme = max(order.extreme, price)
+                else:
+                    order.extreme = min(order.extreme, price)
+            if self._triggered(order, price):
+                triggered.append(order)
+        for order in triggered:
+            pending.remove(order)
+            self._activate(order)
+
+    @staticmethod
+    def _triggered(order, price):
+        condition, target = order.condition, order.target
+        if condition == CONDITIONTYPE_GREATER_THAN:
+            return price >= target
+        if condition == CONDITIONTYPE_LESS_THAN:
+            return price <= target
+        if condition == CONDITIONTYPE_STOP_LOSS_FIXED:
+            return price <= target if order.side == SELL else price >= target
+        if condition == CONDITIONTYPE_STOP_LOSS_PERCENTAGE:
+            if order.side == SELL:
+                return price <= order.extreme * (1 - target / 100.0)
+            return price >= order.extreme * (1 + target / 100.0)
+        return True
+
+    # -- dispatch --------------------------------------------------------------
+
+    def __call__(self, request_url, apisign):
+        url, _, query = request_url.partition('?')
+        path = '/' + url.split('/api/', 1)[-1].split('/', 1)[-1]
+        route = self._routes.get(path)
+        if route is None:
+            if self.fallback is not None:
+                return self.fallback(request_url, apisign)
+            return _error('NOT_SIMULATED')
+        return route(dict(parse_qsl(query)))
+
+    def _place_response(self, params, side, key, **kwargs):
+        order, message = self.place(_text(params, 'market', 'marketname'), side,
+                                    _number(params, 'quantity'), **kwargs)
+        if order is None:
+            return _error(message)
+        return _response({key: order.uuid})
+
+    def _route_buy_limit(self, params):
+        return self._place_response(params, BUY, 'uuid', rate=_number(params, 'rate'))
+
+    def _route_sell_limit(self, params):
+        return self._place_response(params, SELL, 'uuid', rate=_number(params, 'rate'))
+
+    def _route_trade(self, params, side):
+        return self._place_response(params, side, 'OrderId',
+                                    rate=_number(params, 'rate'),
+                                    order_type=_text(params, 'ordertype'),
+                                    time_in_effect=_text(params, 'timeInEffect'),
+                                    condition_type=_text(params, 'conditiontype'),
+                                    target=_number(params, 'target', 0.0))
+
+    def _route_trade_buy(self, params):
+        return self._route_trade(params, BUY)
+
+    def _route_trade_sell(self, params):
+        return self._route_trade(params, SELL)
+
+    def _route_cancel(self, params):
+        message = self.cancel(_text(params, 'uuid', 'orderid'))
+        return _error(message) if message else _response()
+
+    def _route_get_order(self, params):
+        order = self.orders.get(_text(params, 'uuid', 'orderid'))
+        return _response(order.as_dict()) if order else _error('INVALID_ORDER')
+
+    def _route_get_open_orders(self, params):
+        market = _text(params, 'market', 'marketname')
+        return _response([order.as_dict() for order in self.open_orders(market)])
+
+    def _balance(self, currency):
+        balance = self.balances.get(currency, 0.0)
+        available = self.available.get(currency, 0.0)
+        return {'Currency': currency, 'Balance': balance, 'Available': available,
+                'Pending': 0.0, 'CryptoAddress': None}
+
+    def _route_get_balances(self, params):
+        return _response([self._balance(currency) for currency in sorted(self.balances)])
+
+    def _route_get_balance(self, params):
+        return _response(self._balance(_text(params, 'currency', 'currencyname')))
+
+    def _route_get_orderbook(self, params):
+        market = _text(params, 'market', 'marketname')
+        if market not in self.books:
+            return _error('INVALID_MARKET')
+        bids, asks = self.books[market]
+        orderbook = {
+            BUY_ORDERBOOK: [{'Quantity': quantity, 'Rate': rate} for rate, quantity in bids],
+            SELL_ORDERBOOK: [{'Quantity': quantity, 'Rate': rate} for rate, quantity in asks],
+        }
+        depth_type = _text(params, 'type')
+        return _response(orderbook[depth_type] if depth_type in orderbook else orderbook)
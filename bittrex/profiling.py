@@ -0,0 +1,299 @@
+"""
+   Memory and allocation profiling of long running clients.
+
+   ProfilingDispatch is a dispatch that fetches the raw response body,
+   decodes it itself and records per endpoint the bytes decoded, the
+   objects each response creates and how many of those objects are still
+   alive.  Results, and each row of list results, are tracked through weak
+   references, so a collector that keeps old results or rows around shows
+   up as retained objects of the endpoint returning them.  Snapshots are
+   taken every interval seconds from a background thread; with trace=True
+   they also hold the allocation sites that grew most since the previous
+   snapshot, from tracemalloc ::
+
+       profiler = ProfilingDispatch(interval=300, trace=True, on_snapshot=log_snapshot).start()
+       my_bittrex = Bittrex(key, secret, dispatch=profiler)
+
+   Profiling walks every decoded response and copies its result once, it
+   is meant for soak tests and for diagnosing a leak, not for production.
+   See bittrex/test/soak.py.
+"""
+
+import collections
+import json
+import sys
+import threading
+import time
+import weakref
+
+from bittrex.bittrex import request_endpoint
+
+TOP_ALLOCATIONS = 10
+
+
+class _List(list):
+    __slots__ = ('__weakref__',)
+
+
+class _Dict(dict):
+    __slots__ = ('__weakref__',)
+
+
+def using_raw_session(session=None):
+    """
+    Builds a fetch returning the response body of a request on a requests.Session
+
+    :param session: session to use, a new one when omitted
+    :type session: requests.Session
+    :return: fetch(request_url, apisign) -> bytes
+    """
+    if session is None:
+        import requests
+
+        session = requests.Session()
+
+    def fetch(request_url, apisign):
+        return session.get(
+            request_url,
+            headers={"apisign": apisign}
+        ).content
+
+    return fetch
+
+
+def footprint(obj):
+    """
+    (objects, bytes) of a decoded JSON value, containers included
+
+    :rtype: tuple
+    """
+    objects, size = 0, 0
+    pending = [obj]
+    while pending:
+        obj = pending.pop()
+        objects += 1
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            pending.extend(obj.values())
+            pending.extend(obj)
+        elif isinstance(obj, list):
+            pending.extend(obj)
+    return objects, size
+
+
+def _rss():
+    """
+    Peak resident set size in bytes, None where resource is unavailable
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class _Endpoint(object):
+    __slots__ = ('calls', 'errors', 'seconds', 'bytes', 'objects', 'decoded_bytes', 'retained', 'retained_bytes')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.objects = 0
+        self.decoded_bytes = 0
+        self.retained = 0
+        self.retained_bytes = 0
+
+    def stats(self):
+        calls = self.calls or 1
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'seconds': self.seconds,
+            'bytes': self.bytes,
+            'objects': self.objects,
+            'objects_per_response': self.objects / float(calls),
+            'decoded_bytes': self.decoded_bytes,
+            'retained': self.retained,
+            'retained_bytes': self.retained_bytes,
+        }
+
+
+class ProfilingDispatch(object):
+    """
+    Dispatch recording per endpoint allocation statistics
+    """
+
+    def __init__(self, fetch=None, decode=json.loads, interval=60.0, on_snapshot=None, trace=False, frames=1,
+                 history=100, clock=time.time):
+        """
+        :param fetch: fetch(request_url, apisign) returning the response body, using_raw_session() when None
+        :type fetch: callable
+        :param decode: body to response dict
+        :type decode: callable
+        :param interval: seconds between snapshots taken by the background thread
+        :type interval: float
+        :param on_snapshot: called with every periodic snapshot
+        :type on_snapshot: callable
+        :param trace: compare tracemalloc snapshots to find the allocation sites that grow
+        :type trace: bool
+        :param frames: traceback depth stored by tracemalloc
+        :type frames: int
+        :param history: number of snapshots kept in snapshots
+        :type history: int
+        """
+        self.fetch = fetch or using_raw_session()
+        self.decode = decode
+        self.interval = interval
+        self.on_snapshot = on_snapshot
+        self.trace = trace
+        self.frames = frames
+        self.clock = clock
+        self.endpoints = collections.defaultdict(_Endpoint)
+        self.snapshots = collections.deque(maxlen=history)
+        self._alive = {}
+        # results may be collected, and released, while the lock is held
+        self._lock = threading.RLock()
+        self._traced = None
+        self._tracing = False  # whether this profiler started tracemalloc
+        self._started = clock()
+        self._stop = threading.Event()
+        self._worker = None
+        if trace:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+                self._tracing = True
+            self._traced = tracemalloc.take_snapshot()
+
+    def _watch(self, endpoint, obj, objects, size):
+        """
+        Count objects and size as retained by endpoint until obj is collected
+        """
+        stats = self.endpoints[endpoint]
+        stats.retained += objects
+        stats.retained_bytes += size
+
+        def released(ref):
+            with self._lock:
+                stats.retained -= objects
+                stats.retained_bytes -= size
+                self._alive.pop(id(ref), None)
+
+        ref = weakref.ref(obj, released)
+        self._alive[id(ref)] = ref
+        return obj
+
+    def _track(self, endpoint, result):
+        """
+        Copy of result whose collection is counted back, or result itself when it cannot be tracked.
+        The rows of a list are tracked on their own, a row kept after its list is released stays retained.
+        """
+        if isinstance(result, dict):
+            result = _Dict(result)
+            return self._watch(endpoint, result, *footprint(result))
+        if not isinstance(result, list):
+            return result
+        result = _List(_Dict(row) if isinstance(row, dict) else row for row in result)
+        objects, size = 1, sys.getsizeof(result)
+        for row in result:
+            if isinstance(row, _Dict):
+                self._watch(endpoint, row, *footprint(row))
+            else:
+                row_objects, row_size = footprint(row)
+                objects += row_objects
+                size += row_size
+        return self._watch(endpoint, result, objects, size)
+
+    def __call__(self, request_url, apisign):
+        endpoint = request_endpoint(request_url)[1]
+        started = self.clock()
+        try:
+            body = self.fetch(request_url, apisign)
+            response = self.decode(body)
+        except Exception:
+            with self._lock:
+                stats = self.endpoints[endpoint]
+                stats.calls += 1
+                stats.errors += 1
+                stats.seconds += self.clock() - started
+            raise
+        objects, size = footprint(response)
+        with self._lock:
+            stats = self.endpoints[endpoint]
+            stats.calls += 1
+            stats.seconds += self.clock() - started
+            stats.bytes += len(body)
+            stats.objects += objects
+            stats.decoded_bytes += size
+            if isinstance(response, dict) and 'result' in response:
+                response['result'] = self._track(endpoint, response['result'])
+        return response
+
+    @property
+    def stats(self):
+        """
+        {endpoint: {calls, errors, seconds, bytes, objects, objects_per_response, decoded_bytes,
+        retained, retained_bytes}}
+        """
+        with self._lock:
+            return dict((endpoint, stats.stats()) for endpoint, stats in self.endpoints.items())
+
+    def snapshot(self):
+        """
+        Current statistics; with trace, also the allocation sites that grew
+        most since the previous snapshot as [(site, size diff, count diff)]
+
+        :rtype: dict
+        """
+        snapshot = {
+            'time': self.clock(),
+            'uptime': self.clock() - self._started,
+            'endpoints': self.stats,
+            'rss': _rss(),
+        }
+        if self.trace:
+            import tracemalloc
+
+            current = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+            ))
+            snapshot['traced'], snapshot['traced_peak'] = tracemalloc.get_traced_memory()
+            snapshot['top'] = [(str(stat.traceback), stat.size_diff, stat.count_diff)
+                               for stat in current.compare_to(self._traced, 'traceback')[:TOP_ALLOCATIONS]]
+            self._traced = current
+        self.snapshots.append(snapshot)
+        return snapshot
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            snapshot = self.snapshot()
+            if self.on_snapshot is not None:
+                self.on_snapshot(snapshot)
+
+    def start(self):
+        """
+        Take a snapshot every interval seconds in a background thread
+        """
+        self._stop.clear()
+        self._worker = threading.Thread(target=self.run, name='bittrex-profiling')
+        self._worker.daemon = True
+        self._worker.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the background thread, and tracemalloc when this profiler started it
+        """
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
+        if self._tracing:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._tracing = False
+            self.trace = False
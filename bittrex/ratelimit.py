@@ -0,0 +1,199 @@
+"""
+   Rate limiters that can be shared by several Bittrex clients.
+
+   Pass one as rate_limiter to Bittrex to replace its per-client
+   calls_per_second spacing ::
+
+       limiter = TokenBucket(rate=5)
+       clients = [Bittrex(key, secret, rate_limiter=limiter) for key, secret in accounts]
+
+   PriorityLimiter additionally serves order placement and cancellation
+   before order status, account and market data calls, and drops calls
+   that waited longer than the deadline of their class ::
+
+       limiter = PriorityLimiter(rate=1, deadlines={PRIORITY_MARKET_DATA: 2.0})
+       my_bittrex = Bittrex(key, secret, rate_limiter=limiter, coalesce=True)
+
+   PacedLimiter stretches the spacing of calls by the latency variation
+   measured by a bittrex.clock.ClockEstimator.
+"""
+
+import heapq
+import itertools
+import multiprocessing
+import threading
+import time
+
+from bittrex.bittrex import PRIORITY_ORDER, PRIORITY_ORDER_STATUS, PRIORITY_ACCOUNT, PRIORITY_MARKET_DATA
+
+# seconds a call may wait before it is dropped, None waits forever
+DEADLINES = {
+    PRIORITY_ORDER: None,
+    PRIORITY_ORDER_STATUS: 10.0,
+    PRIORITY_ACCOUNT: 30.0,
+    PRIORITY_MARKET_DATA: 5.0,
+}
+
+
+class TokenBucket(object):
+    """
+    Thread safe token bucket: rate calls per second on average, bursts of
+    up to burst calls.  Callers reserve their slot under the lock and sleep
+    outside of it, so waiting callers are served in arrival order.
+    """
+
+    def __init__(self, rate, burst=1, clock=time.time, sleep=time.sleep):
+        self.rate = float(rate)
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._state = [float(burst), clock()]  # tokens, last refill
+
+    def _current_rate(self):
+        """
+        Rate of the next reservation, called under the lock
+        """
+        return self.rate
+
+    def _reserve(self, block=True):
+        """
+        Take a token, possibly going into debt when block is True
+
+        :return: seconds to wait before the call, None when block is False
+            and no token is available
+        """
+        with self._lock:
+            rate = self._current_rate()
+            state = self._state
+            now = self.clock()
+            tokens = min(self.burst, state[0] + (now - state[1]) * rate)
+            state[1] = now
+            if tokens < 1 and not block:
+                state[0] = tokens
+                return None
+            state[0] = tokens - 1
+            return 0.0 if tokens >= 1 else (1 - tokens) / rate
+
+    def try_acquire(self):
+        """
+        Take a token if one is available right now
+
+        :rtype: bool
+        """
+        return self._reserve(block=False) is not None
+
+    def wait(self, *args, **kwargs):
+        """
+        Block until a call is allowed
+        """
+        delay = self._reserve()
+        if delay > 0:
+            self.sleep(delay)
+        return True
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    TokenBucket whose state lives in shared memory, so that clients in
+    several processes stay under one combined rate.  Create it in the parent
+    and hand it to the worker processes when starting them.
+    """
+
+    def __init__(self, rate, burst=1, clock=time.time, sleep=time.sleep):
+        super(SharedTokenBucket, self).__init__(rate, burst, clock, sleep)
+        self._lock = multiprocessing.Lock()
+        self._state = multiprocessing.RawArray('d', [float(burst), clock()])
+
+
+class PriorityLimiter(TokenBucket):
+    """
+    Thread safe token bucket handing out tokens by priority class, lowest
+    first, and in arrival order within a class.  wait returns False for a
+    call that could not get a token within the deadline of its class;
+    Bittrex then answers it with a REQUEST_DROPPED error without calling
+    the API.  Waiting uses real time.
+    """
+
+    def __init__(self, rate, burst=1, deadlines=None, clock=time.time):
+        super(PriorityLimiter, self).__init__(rate, burst, clock)
+        self.deadlines = dict(DEADLINES)
+        self.deadlines.update(deadlines or {})
+        self.dropped = dict((priority, 0) for priority in self.deadlines)
+        self._condition = threading.Condition(self._lock)
+        self._waiting = []  # heap of [priority, arrival]
+        self._arrivals = itertools.count()
+
+    def _refill(self):
+        state = self._state
+        now = self.clock()
+        state[0] = min(self.burst, state[0] + (now - state[1]) * self.rate)
+        state[1] = now
+        return now
+
+    def try_acquire(self):
+        """
+        Take a token if one is available right now and no call is waiting
+        """
+        with self._condition:
+            self._refill()
+            if self._waiting or self._state[0] < 1:
+                return False
+            self._state[0] -= 1
+            return True
+
+    def wait(self, priority=PRIORITY_MARKET_DATA, *args, **kwargs):
+        """
+        Block until the call gets a token or its deadline passes
+
+        :return: False when the call is dropped
+        :rtype: bool
+        """
+        deadline = self.deadlines.get(priority)
+        with self._condition:
+            waiting = self._waiting
+            entry = [priority, next(self._arrivals)]
+            expires = None if deadline is None else self.clock() + deadline
+            heapq.heappush(waiting, entry)
+            # a more urgent call may have to take over the head of the queue
+            self._condition.notify_all()
+            while True:
+                now = self._refill()
+                first = waiting[0] is entry
+                if first and self._state[0] >= 1:
+                    self._state[0] -= 1
+                    heapq.heappop(waiting)
+                    self._condition.notify_all()
+                    return True
+                if expires is not None and now >= expires:
+                    waiting.remove(entry)
+                    heapq.heapify(waiting)
+                    self.dropped[priority] = self.dropped.get(priority, 0) + 1
+                    self._condition.notify_all()
+                    return False
+                timeout = (1 - self._state[0]) / self.rate if first else None
+                if expires is not None:
+                    timeout = expires - now if timeout is None else min(timeout, expires - now)
+                self._condition.wait(timeout)
+
+
+class PacedLimiter(TokenBucket):
+    """
+    TokenBucket spacing calls so that they arrive at the server no faster
+    than rate, given the latency variation measured by estimator (see
+    bittrex.clock.ClockEstimator).  Two calls sent 1 / rate apart reach
+    the server closer together when the first one is delayed, so each
+    interval is stretched by jitter_factor times the round trip time
+    variation: calls are packed tightly on a steady network and spread out
+    when it becomes erratic.
+    """
+
+    def __init__(self, rate, estimator, burst=1, jitter_factor=1.0, clock=time.time, sleep=time.sleep):
+        super(PacedLimiter, self).__init__(rate, burst, clock, sleep)
+        self.server_rate = float(rate)
+        self.estimator = estimator
+        self.jitter_factor = jitter_factor
+
+    def _current_rate(self):
+        self.rate = 1.0 / (1.0 / self.server_rate + self.jitter_factor * self.estimator.jitter())
+        return self.rate
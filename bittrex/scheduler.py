@@ -0,0 +1,170 @@
+"""
+   Adaptive market data polling.
+
+   Instead of every caller looping around get_ticker / get_marketsummary at
+   a fixed interval, callers register interest in markets with a
+   PollScheduler.  The scheduler splits one request budget between the
+   markets according to their recent activity (24h range and volume from
+   get_market_summaries) and drives the fetches from a priority queue ::
+
+       scheduler = PollScheduler(my_bittrex, budget=0.8)
+       scheduler.register('BTC-LTC', on_summary)
+       scheduler.register('BTC-ETH', on_summary)
+       scheduler.run()
+"""
+
+import heapq
+import itertools
+import time
+
+
+def activity(summary):
+    """
+    Activity score of a market summary: relative 24h range weighted by the
+    base currency volume
+    """
+    last = summary.get('Last') or 0.0
+    high, low = summary.get('High') or last, summary.get('Low') or last
+    volatility = (high - low) / last if last else 0.0
+    return (volatility + 0.001) * (summary.get('BaseVolume') or 0.0)
+
+
+def _flatten(summary):
+    # v2.0 wraps every summary as {'Market': {...}, 'Summary': {...}}
+    return summary['Summary'] if 'Summary' in summary else summary
+
+
+class PollScheduler(object):
+    """
+    Polls registered markets at intervals derived from their activity.
+
+    The intervals are chosen so that all polls together, plus the periodic
+    get_market_summaries call used to re-rank markets, stay within budget
+    requests per second.  Each market is polled at most every min_interval
+    and, unless the budget is too small, at least every max_interval
+    seconds.  Callbacks are called as callback(market, result) with the
+    result of the poll method, get_marketsummary by default.
+    """
+
+    def __init__(self, bittrex, budget=None, method='get_marketsummary', min_interval=1.0, max_interval=300.0,
+                 rerank_interval=300.0, clock=time.time, sleep=time.sleep):
+        self.bittrex = bittrex
+        self.budget = budget or 1.0 / bittrex.call_rate
+        self.method = method
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.rerank_interval = rerank_interval
+        self.clock = clock
+        self.sleep = sleep
+        self.callbacks = {}
+        self.intervals = {}
+        self.scores = {}
+        self.next_rerank = 0.0
+        self._queue = []
+        self._seq = itertools.count()
+        self._due = {}
+
+    def register(self, market, callback):
+        if market not in self.callbacks:
+            self.callbacks[market] = []
+            self.intervals[market] = self.max_interval
+            self._schedule(market, self.clock())
+        self.callbacks[market].append(callback)
+
+    def unregister(self, market, callback):
+        callbacks = self.callbacks.get(market)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+            if not callbacks:
+                del self.callbacks[market]
+                del self.intervals[market]
+                self._due.pop(market, None)
+
+    def _schedule(self, market, due):
+        self._due[market] = due
+        heapq.heappush(self._queue, (due, next(self._seq), market))
+
+    def _deliver(self, market, result):
+        for callback in list(self.callbacks.get(market, ())):
+            callback(market, result)
+
+    def rerank(self):
+        """
+        Fetch get_market_summaries, hand every registered market its fresh
+        summary and recompute the poll intervals
+        """
+        self.next_rerank = self.clock() + self.rerank_interval
+        response = self.bittrex.get_market_summaries()
+        if not response['success']:
+            return
+        summaries = {}
+        for summary in response['result'] or ():
+            summary = _flatten(summary)
+            summaries[summary['MarketName']] = summary
+        fresh = set()
+        for market in list(self.callbacks):
+            if market in summaries:
+                self.scores[market] = activity(summaries[market])
+                self._deliver(market, summaries[market])
+                fresh.add(market)
+        self.allocate(fresh)
+
+    def allocate(self, fresh=()):
+        """
+        Split the budget between markets proportionally to their score
+
+        :param fresh: markets that just received data and can wait a full interval
+        :type fresh: set
+        """
+        markets = list(self.callbacks)
+        if not markets:
+            return
+        budget = max(self.budget - 1.0 / self.rerank_interval, self.budget / 2.0)
+        scores = [max(self.scores.get(market, 0.0), 1e-9) for market in markets]
+        total = sum(scores)
+        # every market gets the max_interval floor, the rest goes by score
+        floor = min(1.0 / self.max_interval, budget / len(markets))
+        spare = budget - floor * len(markets)
+        rates = [min(floor + spare * score / total, 1.0 / self.min_interval) for score in scores]
+        now = self.clock()
+        for market, rate in zip(markets, rates):
+            interval = 1.0 / rate
+            self.intervals[market] = interval
+            # pull in markets whose new interval is shorter than their wait
+            if market in fresh or self._due.get(market, now) > now + interval:
+                self._schedule(market, now + interval)
+
+    def step(self):
+        """
+        Run every poll that is due
+
+        :return: seconds until the next poll is due
+        :rtype: float
+        """
+        now = self.clock()
+        if now >= self.next_rerank:
+            self.rerank()
+        while self._queue and self._queue[0][0] <= now:
+            due, _, market = heapq.heappop(self._queue)
+            if self._due.get(market) != due:
+                continue  # unregistered or rescheduled
+            response = getattr(self.bittrex, self.method)(market)
+            if response['success']:
+                result = response['result']
+                if isinstance(result, list) and len(result) == 1:
+                    result = result[0]
+                self._deliver(market, result)
+            if market in self.callbacks:
+                self._schedule(market, self.clock() + self.intervals[market])
+            now = self.clock()
+        next_due = min(self._queue[0][0] if self._queue else self.next_rerank, self.next_rerank)
+        return max(0.0, next_due - self.clock())
+
+    def run(self, until=None):
+        """
+        Poll until no market is registered or until the given epoch
+        """
+        while self.callbacks and (until is None or self.clock() < until):
+            delay = self.step()
+            if delay:
+                self.sleep(delay if until is None else min(delay, max(0.0, until - self.clock())))
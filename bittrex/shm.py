@@ -0,0 +1,223 @@
+"""
+   Shared memory publication of tickers and order book tops.
+
+   One feeder process polls Bittrex and writes the latest ticker and top
+   levels of every market into a memory-mapped table.  Any number of local
+   processes read it without locks or API calls.  Every market slot is
+   versioned seqlock style: the writer makes the sequence number odd while
+   it updates the slot and even again when done, and readers retry when the
+   number was odd or changed during their read.  A slot left odd by a writer
+   that died mid-write makes readers raise after a timeout ::
+
+       # feeder process
+       Feeder(my_bittrex, '/dev/shm/bittrex', ['BTC-LTC', 'BTC-ETH'], depth=10).run()
+
+       # strategy processes
+       table = ShmTable.open('/dev/shm/bittrex')
+       table.read('BTC-LTC')
+"""
+
+import mmap
+import multiprocessing
+import os
+import struct
+import time
+
+from bittrex.bittrex import API_V1_1, BUY_ORDERBOOK, SELL_ORDERBOOK
+
+MAGIC = b'BTXSHM01'
+
+_HEADER = struct.Struct('<8sIII')  # magic, slots, depth, slot size
+_NAME = struct.Struct('<24s')
+_SEQ = struct.Struct('<Q')
+_TOP = struct.Struct('<ddddII')  # timestamp, bid, ask, last, bid levels, ask levels
+_MIN_BACKOFF = 0.00001
+_MAX_BACKOFF = 0.001
+
+
+class ShmTable(object):
+    """
+    Fixed layout table of market slots in a memory-mapped file
+    """
+
+    def __init__(self, mm, markets, depth):
+        self.mm = mm
+        self.depth = depth
+        self._levels = struct.Struct('<' + 'd' * (4 * depth))
+        self.slot_size = _SEQ.size + _TOP.size + self._levels.size
+        base = _HEADER.size + _NAME.size * len(markets)
+        self.offsets = dict((market, base + i * self.slot_size) for i, market in enumerate(markets))
+
+    @classmethod
+    def create(cls, path, markets, depth=10):
+        """
+        Create (or reset) the table file for the given markets
+        """
+        markets = list(markets)
+        size = struct.calcsize('<' + 'd' * (4 * depth)) + _SEQ.size + _TOP.size
+        total = _HEADER.size + _NAME.size * len(markets) + size * len(markets)
+        with open(path, 'wb') as outfile:
+            outfile.write(b'\0' * total)
+        fd = os.open(path, os.O_RDWR)
+        try:
+            mm = mmap.mmap(fd, total)
+        finally:
+            os.close(fd)
+        _HEADER.pack_into(mm, 0, MAGIC, len(markets), depth, size)
+        for i, market in enumerate(markets):
+            _NAME.pack_into(mm, _HEADER.size + i * _NAME.size, market.encode('ascii'))
+        return cls(mm, markets, depth)
+
+    @classmethod
+    def open(cls, path):
+        """
+        Map an existing table read-only
+        """
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        magic, slots, depth, _ = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise Exception('{} is not a bittrex shared memory table'.format(path))
+        markets = [_NAME.unpack_from(mm, _HEADER.size + i * _NAME.size)[0].rstrip(b'\0').decode('ascii')
+                   for i in range(slots)]
+        return cls(mm, markets, depth)
+
+    @property
+    def markets(self):
+        return sorted(self.offsets, key=self.offsets.get)
+
+    def publish(self, market, bid, ask, last, bids=(), asks=(), timestamp=None):
+        """
+        Write a market slot; only one process may write to a table
+
+        :param bids: [(rate, quantity)] best first, at most depth levels are kept
+        :param asks: [(rate, quantity)] best first, at most depth levels are kept
+        """
+        offset = self.offsets[market]
+        depth = self.depth
+        bids, asks = list(bids)[:depth], list(asks)[:depth]
+        levels = []
+        for side in (bids, asks):
+            for rate, quantity in side:
+                levels.extend((rate, quantity))
+            levels.extend((0.0, 0.0) * (depth - len(side)))
+
+        seq = _SEQ.unpack_from(self.mm, offset)[0]
+        _SEQ.pack_into(self.mm, offset, seq + 1)
+        _TOP.pack_into(self.mm, offset + _SEQ.size, timestamp or time.time(), bid or 0.0, ask or 0.0, last or 0.0,
+                       len(bids), len(asks))
+        self._levels.pack_into(self.mm, offset + _SEQ.size + _TOP.size, *levels)
+        _SEQ.pack_into(self.mm, offset, seq + 2)
+
+    def read(self, market, timeout=1.0):
+        """
+        Consistent copy of a market slot, None if it was never published
+
+        :param timeout: seconds to retry a slot that stays mid-write, the writer died, before raising
+        :type timeout: float
+        :return: {'TimeStamp', 'Bid', 'Ask', 'Last', 'buy': [(rate, quantity)], 'sell': [(rate, quantity)]}
+        :rtype: dict
+        """
+        offset = self.offsets[market]
+        mm = self.mm
+        deadline = None
+        backoff = 0.0
+        while True:
+            before = _SEQ.unpack_from(mm, offset)[0]
+            if not before & 1:
+                timestamp, bid, ask, last, bid_count, ask_count = _TOP.unpack_from(mm, offset + _SEQ.size)
+                levels = self._levels.unpack_from(mm, offset + _SEQ.size + _TOP.size)
+                if _SEQ.unpack_from(mm, offset)[0] == before:
+                    break
+            # the clock is only read once a retry is needed
+            if deadline is None:
+                deadline = time.time() + timeout
+            elif time.time() > deadline:
+                raise Exception('{} slot is still being written after {} seconds'.format(market, timeout))
+            # yield to the writer first, then back off up to a millisecond
+            time.sleep(backoff)
+            backoff = min(_MAX_BACKOFF, backoff * 2 or _MIN_BACKOFF)
+        if before == 0:
+            return None
+        half = 2 * self.depth
+        return {
+            'TimeStamp': timestamp,
+            'Bid': bid,
+            'Ask': ask,
+            'Last': last,
+            BUY_ORDERBOOK: list(zip(levels[0:2 * bid_count:2], levels[1:2 * bid_count:2])),
+            SELL_ORDERBOOK: list(zip(levels[half:half + 2 * ask_count:2], levels[half + 1:half + 2 * ask_count:2])),
+        }
+
+    def version(self, market):
+        """
+        Sequence number of a slot, lets readers skip markets that did not change
+        """
+        return _SEQ.unpack_from(self.mm, self.offsets[market])[0]
+
+    def close(self):
+        self.mm.close()
+
+
+class Feeder(object):
+    """
+    Polls ticker and order book of every market and publishes them to a
+    ShmTable.  The ticker comes from get_ticker under v1.1 and from
+    get_marketsummary under v2.0, which has no ticker endpoint.
+    """
+
+    def __init__(self, bittrex, path, markets, depth=10, interval=1.0):
+        self.bittrex = bittrex
+        self.markets = list(markets)
+        self.interval = interval
+        self.table = ShmTable.create(path, self.markets, depth)
+        self._stop = multiprocessing.Event()
+        self._worker = None
+
+    def _ticker(self, market):
+        if self.bittrex.api_version == API_V1_1:
+            response = self.bittrex.get_ticker(market)
+        else:
+            response = self.bittrex.get_marketsummary(market)
+        if not response['success']:
+            return None
+        result = response['result']
+        return result[0] if isinstance(result, list) else result
+
+    def publish_once(self):
+        for market in self.markets:
+            ticker = self._ticker(market)
+            response = self.bittrex.get_orderbook(market)
+            if ticker is None or not response['success']:
+                continue
+            orderbook = response['result']
+            self.table.publish(
+                market, ticker.get('Bid'), ticker.get('Ask'), ticker.get('Last'),
+                sorted(((level['Rate'], level['Quantity']) for level in orderbook.get(BUY_ORDERBOOK) or ()),
+                       reverse=True),
+                sorted((level['Rate'], level['Quantity']) for level in orderbook.get(SELL_ORDERBOOK) or ()))
+
+    def run(self):
+        while not self._stop.is_set():
+            started = time.time()
+            self.publish_once()
+            delay = self.interval - (time.time() - started)
+            if delay > 0:
+                self._stop.wait(delay)
+
+    def start(self):
+        """
+        Publish from a background daemon process
+        """
+        self._worker = multiprocessing.Process(target=self.run, name='bittrex-shm-feeder')
+        self._worker.daemon = True
+        self._worker.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
@@ -0,0 +1,100 @@
+import unittest
+from bittrex.bittrex import Bittrex, API_V2_0, ORDERTYPE_LIMIT, ORDERTYPE_MARKET, TIMEINEFFECT_GOOD_TIL_CANCELLED
+from bittrex.paper import PaperExchange
+from bittrex.account import AccountCache
+
+ORDERBOOK = {
+    'buy': [{'Quantity': 10.0, 'Rate': 0.0099}],
+    'sell': [{'Quantity': 5.0, 'Rate': 0.0101}],
+}
+
+
+class CountingExchange(PaperExchange):
+
+    def __init__(self, *args, **kwargs):
+        super(CountingExchange, self).__init__(*args, **kwargs)
+        self.calls = []
+        self.hooks = {}  # endpoint -> called before the endpoint is answered
+
+    def __call__(self, request_url, apisign):
+        endpoint = request_url.split('?')[0].rsplit('/', 1)[1]
+        self.calls.append(endpoint)
+        hook = self.hooks.pop(endpoint, None)
+        if hook is not None:
+            hook()
+        return super(CountingExchange, self).__call__(request_url, apisign)
+
+
+class TestAccountCache(unittest.TestCase):
+
+    def setUp(self):
+        self.exchange = CountingExchange(balances={'BTC': 1.0, 'LTC': 20.0}, commission=0.0025)
+        self.exchange.load_orderbook('BTC-LTC', ORDERBOOK)
+        self.bittrex = Bittrex(None, None, calls_per_second=1e9, dispatch=self.exchange)
+        self.account = AccountCache(self.bittrex)
+
+    def assertMatchesExchange(self, *currencies):
+        for currency in currencies:
+            self.assertAlmostEqual(self.bittrex.get_balance(currency)['result']['Available'],
+                                   self.account.available(currency))
+
+    def test_seeded_once(self):
+        self.assertAlmostEqual(1.0, self.account.available('BTC'))
+        self.assertAlmostEqual(20.0, self.account.available('LTC'))
+        self.assertEqual([], self.account.get_open_orders()['result'])
+        self.assertEqual(['getbalances', 'getopenorders'], self.exchange.calls)
+
+    def test_orders_update_the_cache(self):
+        self.account.refresh()
+        buy = self.account.buy_limit('BTC-LTC', 10, 0.01)['result']['uuid']
+        sell = self.account.sell_limit('BTC-LTC', 4, 0.011)['result']['uuid']
+        self.assertMatchesExchange('BTC', 'LTC')
+        self.assertEqual({buy, sell}, set(o['OrderUuid'] for o in self.account.get_open_orders('BTC-LTC')['result']))
+
+        self.account.cancel(buy)
+        self.assertMatchesExchange('BTC', 'LTC')
+        self.assertEqual([sell], [o['OrderUuid'] for o in self.account.get_open_orders()['result']])
+        self.assertEqual(['getbalances', 'getopenorders', 'buylimit', 'selllimit', 'cancel'],
+                         [call for call in self.exchange.calls if call != 'getbalance'])
+        self.assertEqual(3, self.account.staleness()['updates'])
+
+    def test_market_orders_mark_currencies_stale(self):
+        bittrex = Bittrex(None, None, calls_per_second=1e9, dispatch=self.exchange, api_version=API_V2_0)
+        account = AccountCache(bittrex)
+        account.refresh()
+        account.trade_buy('BTC-LTC', ORDERTYPE_LIMIT, 10, 0.009, TIMEINEFFECT_GOOD_TIL_CANCELLED)
+        self.assertEqual([], account.staleness()['stale'])
+        account.trade_buy('BTC-LTC', ORDERTYPE_MARKET, 2, None, TIMEINEFFECT_GOOD_TIL_CANCELLED)
+        self.assertEqual(['BTC', 'LTC'], account.staleness()['stale'])
+        self.assertAlmostEqual(bittrex.get_balance('LTC')['result']['Available'], account.available('LTC'))
+        self.assertEqual(['BTC'], account.staleness()['stale'])
+
+    def test_refresh_clears_optimistic_state(self):
+        self.account.refresh()
+        self.account.buy_limit('BTC-LTC', 10, 0.01)
+        self.exchange.deposit('BTC', 1.0)
+        self.assertTrue(self.account.refresh())
+        status = self.account.staleness()
+        self.assertEqual((0, [], 0.0), (status['updates'], status['stale'], round(status['age'])))
+        self.assertMatchesExchange('BTC')
+
+    def test_failed_seed_is_reported(self):
+        failure = {'success': False, 'message': 'APIKEY_INVALID', 'result': None}
+        account = AccountCache(Bittrex(None, None, calls_per_second=1e9, dispatch=lambda url, apisign: failure))
+        self.assertEqual(failure, account.get_balance('BTC'))
+        self.assertEqual(failure, account.get_balances())
+        self.assertEqual(failure, account.get_open_orders())
+        self.assertEqual(0.0, account.available('BTC'))
+        self.assertIsNone(account.staleness()['refreshed'])
+
+    def test_update_during_refresh_is_kept(self):
+        self.account.refresh()
+        # placed after the balances were fetched, before the open orders are
+        self.exchange.hooks['getopenorders'] = lambda: self.account.buy_limit('BTC-LTC', 10, 0.009)
+        self.assertTrue(self.account.refresh())
+        self.assertMatchesExchange('BTC', 'LTC')
+        self.assertEqual(1, len(self.account.get_open_orders()['result']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+from bittrex.alerts import AlertEngine, Rule, _Group, ABOVE, BELOW, ALL_MARKETS, SPREAD, CHANGE
+
+
+def summary(market, last, bid=None, ask=None, volume=100.0, previous=None):
+    return {'MarketName': market, 'Last': last, 'Bid': bid if bid is not None else last,
+            'Ask': ask if ask is not None else last, 'BaseVolume': volume,
+            'PrevDay': previous if previous is not None else last}
+
+
+class TestAlertEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = AlertEngine()
+
+    def fired(self, summaries):
+        return sorted((rule.id, market) for rule, market, _ in self.engine.evaluate(summaries))
+
+    def test_single_market_thresholds(self):
+        self.engine.add(Rule('above', 'BTC-LTC', 'Last', ABOVE, 0.02))
+        self.engine.add(Rule('higher', 'BTC-LTC', 'Last', ABOVE, 0.03))
+        self.engine.add(Rule('below', 'BTC-LTC', 'Last', BELOW, 0.01))
+        self.assertEqual([], self.fired([summary('BTC-LTC', 0.015)]))
+        self.assertEqual([('above', 'BTC-LTC')], self.fired([summary('BTC-LTC', 0.025), summary('BTC-XRP', 1.0)]))
+        self.assertEqual([('higher', 'BTC-LTC')], self.fired([summary('BTC-LTC', 0.035)]))
+        self.assertEqual([('below', 'BTC-LTC')], self.fired([summary('BTC-LTC', 0.005)]))
+
+    def test_threshold_is_strict(self):
+        self.engine.add(Rule('above', 'BTC-LTC', 'Last', ABOVE, 0.02))
+        self.engine.add(Rule('below', 'BTC-LTC', 'Last', BELOW, 0.02))
+        self.assertEqual([], self.fired([summary('BTC-LTC', 0.02)]))
+
+    def test_all_markets(self):
+        self.engine.add(Rule('volume', ALL_MARKETS, 'BaseVolume', ABOVE, 500))
+        fired = self.fired([summary('BTC-LTC', 1.0, volume=1000), summary('BTC-XRP', 1.0, volume=10),
+                            summary('BTC-ETH', 1.0, volume=600)])
+        self.assertEqual([('volume', 'BTC-ETH'), ('volume', 'BTC-LTC')], fired)
+
+    def test_derived_fields(self):
+        self.engine.add(Rule('spread', ALL_MARKETS, SPREAD, ABOVE, 2.0))
+        self.engine.add(Rule('change', ALL_MARKETS, CHANGE, BELOW, -10.0))
+        fired = self.engine.evaluate([summary('BTC-LTC', 1.0, bid=0.97, ask=1.03),
+                                      summary('BTC-XRP', 0.8, previous=1.0)])
+        self.assertEqual(['change', 'spread'], sorted(rule.id for rule, _, _ in fired))
+        self.assertAlmostEqual(6.0, [value for rule, _, value in fired if rule.id == 'spread'][0])
+
+    def test_missing_values_are_skipped(self):
+        self.engine.add(Rule('spread', ALL_MARKETS, SPREAD, ABOVE, 2.0))
+        self.engine.add(Rule('last', ALL_MARKETS, 'Last', BELOW, 1.0))
+        self.assertEqual([], self.fired([{'MarketName': 'BTC-NEW', 'Last': None, 'Bid': None, 'Ask': 1.0}]))
+
+    def test_v2_summaries(self):
+        self.engine.add(Rule('above', 'BTC-LTC', 'Last', ABOVE, 0.02))
+        self.assertEqual([('above', 'BTC-LTC')],
+                         self.fired([{'Market': {'MarketName': 'BTC-LTC'}, 'Summary': summary('BTC-LTC', 0.03)}]))
+
+    def test_triggers_once_until_rearmed(self):
+        self.engine.add(Rule('above', 'BTC-LTC', 'Last', ABOVE, 100.0, hysteresis=5.0))
+        self.assertEqual(1, len(self.fired([summary('BTC-LTC', 101.0)])))
+        self.assertEqual(0, len(self.fired([summary('BTC-LTC', 102.0)])))
+        # back under the threshold but within the hysteresis
+        self.assertEqual(0, len(self.fired([summary('BTC-LTC', 97.0)])))
+        self.assertEqual(0, len(self.fired([summary('BTC-LTC', 101.0)])))
+        # re-armed
+        self.assertEqual(0, len(self.fired([summary('BTC-LTC', 94.0)])))
+        self.assertEqual(1, len(self.fired([summary('BTC-LTC', 101.0)])))
+
+    def test_below_hysteresis(self):
+        self.engine.add(Rule('below', ALL_MARKETS, 'Last', BELOW, 10.0, hysteresis=1.0))
+        self.assertEqual(1, len(self.fired([summary('BTC-LTC', 9.0)])))
+        self.assertEqual(0, len(self.fired([summary('BTC-LTC', 10.5)])))
+        self.assertEqual(0, len(self.fired([summary('BTC-LTC', 9.0)])))
+        self.assertEqual(0, len(self.fired([summary('BTC-LTC', 11.5)])))
+        self.assertEqual(1, len(self.fired([summary('BTC-LTC', 9.0)])))
+
+    def test_state_survives_unrelated_rule_changes(self):
+        self.engine.add(Rule('above', 'BTC-LTC', 'Last', ABOVE, 1.0))
+        self.assertEqual(1, len(self.fired([summary('BTC-LTC', 2.0)])))
+        self.engine.add(Rule('volume', ALL_MARKETS, 'BaseVolume', ABOVE, 1e6))
+        self.assertEqual(0, len(self.fired([summary('BTC-LTC', 2.0)])))
+        self.engine.remove('above')
+        self.engine.add(Rule('above', 'BTC-LTC', 'Last', ABOVE, 1.5))
+        self.assertEqual([('above', 'BTC-LTC')], self.fired([summary('BTC-LTC', 2.0)]))
+
+    def test_adding_a_rule_keeps_the_group_state(self):
+        self.engine.add(Rule('above', 'BTC-LTC', 'Last', ABOVE, 0.02))
+        self.assertEqual([('above', 'BTC-LTC')], self.fired([summary('BTC-LTC', 0.025)]))
+        self.engine.add(Rule('higher', 'BTC-LTC', 'Last', ABOVE, 0.01))
+        self.assertEqual([('higher', 'BTC-LTC')], self.fired([summary('BTC-LTC', 0.025)]))
+        self.engine.remove('higher')
+        self.assertEqual([], self.fired([summary('BTC-LTC', 0.025)]))
+        self.assertEqual([], self.fired([summary('BTC-LTC', 0.015)]))
+        self.assertEqual([('above', 'BTC-LTC')], self.fired([summary('BTC-LTC', 0.025)]))
+
+    def test_invalid_op(self):
+        self.assertRaises(ValueError, Rule, 'x', 'BTC-LTC', 'Last', '>=', 1.0)
+
+    def test_one_bisect_per_group_and_market(self):
+        summaries = [summary('BTC-C{}'.format(i), 1.0 + i / 100.0, volume=i) for i in range(300)]
+        rules = [Rule(i, ALL_MARKETS if i % 10 == 0 else 'BTC-C{}'.format(i % 300),
+                      ('Last', 'BaseVolume', SPREAD)[i % 3], (ABOVE, BELOW)[i % 2], i / 100.0) for i in range(1000)]
+        for rule in rules:
+            self.engine.add(rule)
+        holding = _Group.holding
+        calls = []
+
+        def counted(group, value):
+            calls.append(group)
+            return holding(group, value)
+
+        _Group.holding = counted
+        try:
+            fired = self.fired(summaries)
+        finally:
+            _Group.holding = holding
+        columns = self.engine.table(summaries)[1]
+        expected = sorted((rule.id, 'BTC-C{}'.format(i)) for rule in rules for i in range(300)
+                          if rule.market in (ALL_MARKETS, 'BTC-C{}'.format(i))
+                          and (columns[rule.field][i] > rule.threshold if rule.op == ABOVE
+                               else columns[rule.field][i] < rule.threshold))
+        self.assertEqual(expected, fired)
+        # 3 all market groups on 300 markets, 270 single market groups, instead of 30900 rule checks
+        self.assertEqual(3 * 300 + 270, len(calls))
+
+
+if __name__ == '__main__':
+    unittest.main()
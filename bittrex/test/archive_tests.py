@@ -0,0 +1,96 @@
+import unittest
+import multiprocessing
+import os
+import tempfile
+import time
+from bittrex.archive import ColumnWriter, Snapshotter, scan, read_blocks, summary_rows, SUMMARIES, ORDERBOOKS, \
+    MARKET_HISTORY
+
+
+def summary(market, timestamp, last):
+    return {'MarketName': market, 'High': last, 'Low': last, 'Volume': 1.0, 'Last': last, 'BaseVolume': last,
+            'TimeStamp': timestamp, 'Bid': None, 'Ask': last, 'OpenBuyOrders': 3, 'OpenSellOrders': 4}
+
+
+class FakeBittrex(object):
+    def get_market_summaries(self):
+        return {'success': True, 'message': '', 'result': [summary('BTC-LTC', '2017-08-31T01:29:50.427', 0.01)]}
+
+    def get_orderbook(self, market):
+        return {'success': True, 'message': '', 'result': {'buy': [{'Quantity': 1.0, 'Rate': 0.009}],
+                                                           'sell': [{'Quantity': 2.0, 'Rate': 0.011}]}}
+
+    def get_market_history(self, market):
+        return {'success': True, 'message': '', 'result': [
+            {'Id': 2, 'TimeStamp': '2017-08-31T01:29:51', 'Quantity': 1.0, 'Price': 0.01, 'Total': 0.01,
+             'FillType': 'FILL', 'OrderType': 'BUY'},
+            {'Id': 1, 'TimeStamp': '2017-08-31T01:29:50', 'Quantity': 1.0, 'Price': 0.01, 'Total': 0.01,
+             'FillType': 'PARTIAL_FILL', 'OrderType': 'SELL'}]}
+
+
+class TestArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_round_trip_and_time_range(self):
+        writer = ColumnWriter(self.directory, SUMMARIES, block_rows=2)
+        for i in range(5):
+            writer.append(next(summary_rows([summary('BTC-LTC' if i % 2 else 'BTC-ETH',
+                                                     '2017-08-31T01:29:5{}'.format(i), 0.01 * i)])))
+        writer.close()
+
+        rows = list(scan(self.directory, SUMMARIES))
+        self.assertEqual(5, len(rows))
+        self.assertEqual('BTC-LTC', rows[1]['MarketName'])
+        self.assertEqual(3, rows[1]['OpenBuyOrders'])
+        self.assertAlmostEqual(0.02, rows[2]['Last'])
+        self.assertNotEqual(rows[0]['Bid'], rows[0]['Bid'])  # None is stored as NaN
+
+        start = rows[2]['TimeStamp']
+        self.assertEqual([2, 3], [int(round(r['Last'] * 100))
+                                  for r in scan(self.directory, SUMMARIES, start, start + 1)])
+        self.assertEqual(2, len(list(scan(self.directory, SUMMARIES, markets=['BTC-LTC']))))
+
+    def test_blocks_outside_range_are_skipped(self):
+        writer = ColumnWriter(self.directory, SUMMARIES, block_rows=1)
+        writer.extend(summary_rows([summary('BTC-LTC', '2017-08-31T01:29:50', 0.01)]))
+        writer.extend(summary_rows([summary('BTC-LTC', '2017-09-30T01:29:50', 0.01)]))
+        writer.close()
+        blocks = list(read_blocks(writer.path, start=1506000000, columns=['Last']))
+        self.assertEqual([['Last']], [list(block) for block in blocks])
+
+    def test_rotation_by_size(self):
+        writer = ColumnWriter(self.directory, SUMMARIES, block_rows=1, rotate_bytes=1)
+        clock = [1000.0]
+        writer.clock = lambda: clock[0]
+        for i in range(2):
+            writer.extend(summary_rows([summary('BTC-LTC', '2017-08-31T01:29:50', 0.01)]))
+            clock[0] += 1
+        writer.close()
+        self.assertEqual(2, len(os.listdir(self.directory)))
+
+    def test_snapshotter_skips_seen_trades(self):
+        snapshotter = Snapshotter(FakeBittrex(), self.directory, markets=['BTC-LTC'])
+        snapshotter.collect_once()
+        snapshotter.collect_once()
+        snapshotter.close()
+        self.assertEqual(2, len(list(scan(self.directory, SUMMARIES))))
+        self.assertEqual(['buy', 'sell'] * 2, [r['Side'] for r in scan(self.directory, ORDERBOOKS)])
+        self.assertEqual([2, 1], [r['Id'] for r in scan(self.directory, MARKET_HISTORY)])
+
+    @unittest.skipIf(not hasattr(multiprocessing, 'get_context'), 'no spawn context')
+    def test_snapshotter_process_under_spawn(self):
+        snapshotter = Snapshotter(FakeBittrex(), self.directory, markets=['BTC-LTC'], interval=0.05, block_rows=1,
+                                  context=multiprocessing.get_context('spawn'))
+        snapshotter.start()
+        deadline = time.time() + 30
+        while not os.listdir(self.directory) and time.time() < deadline:
+            time.sleep(0.05)
+        snapshotter.stop()
+        self.assertEqual(0, snapshotter._worker.exitcode)
+        self.assertGreaterEqual(len(list(scan(self.directory, SUMMARIES))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
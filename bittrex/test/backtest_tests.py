@@ -0,0 +1,43 @@
+import unittest
+from bittrex.candles import Candles
+from bittrex.backtest import sma, simulate, run_backtests
+
+
+def make_candles(closes, market='BTC-LTC'):
+    return Candles.from_result([{'O': c, 'H': c, 'L': c, 'C': c, 'V': 1.0, 'BV': c,
+                                 'T': '2017-11-03T{:02d}:00:00'.format(i)} for i, c in enumerate(closes)], market)
+
+
+def threshold(candles, level=0.0):
+    return [1.0 if close > level else 0.0 for close in candles.C]
+
+
+class TestBacktest(unittest.TestCase):
+
+    def test_sma(self):
+        self.assertEqual([None, None, 2.0, 3.0], sma([1.0, 2.0, 3.0, 4.0], 3))
+
+    def test_simulate_buy_and_hold(self):
+        report = simulate(make_candles([1.0, 2.0, 1.0, 3.0]), [1.0] * 4, commission=0.0)
+        self.assertAlmostEqual(2.0, report['pnl'])
+        self.assertAlmostEqual(0.5, report['max_drawdown'])
+        self.assertEqual(1, report['trades'])
+        self.assertEqual(1.0, report['turnover'])
+
+    def test_simulate_charges_commission(self):
+        report = simulate(make_candles([1.0, 1.0, 1.0]), [1.0, 0.0, 0.0], commission=0.01)
+        self.assertAlmostEqual(1.0 - 0.99 * 0.99, -report['pnl'])
+        self.assertAlmostEqual(2.0, report['turnover'])
+
+    def test_run_backtests_over_markets_and_params(self):
+        candles = {'BTC-LTC': make_candles([1.0, 2.0, 4.0]), 'BTC-ETH': make_candles([4.0, 2.0, 1.0])}
+        reports = run_backtests(candles, threshold, {'level': [0.0, 10.0]}, commission=0.0, processes=2)
+        self.assertEqual(4, len(reports))
+        by_key = dict(((r['market'], r['params']['level']), r) for r in reports)
+        self.assertAlmostEqual(3.0, by_key[('BTC-LTC', 0.0)]['pnl'])
+        self.assertAlmostEqual(-0.75, by_key[('BTC-ETH', 0.0)]['pnl'])
+        self.assertEqual(0.0, by_key[('BTC-LTC', 10.0)]['pnl'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,11 @@
 import unittest
+import hashlib
+import hmac
 import json
 import os
-from bittrex.bittrex import Bittrex, API_V2_0, API_V1_1, BUY_ORDERBOOK, TICKINTERVAL_ONEMIN
+import subprocess
+import sys
+from bittrex.bittrex import Bittrex, API_V2_0, API_V1_1, BUY_ORDERBOOK, TICKINTERVAL_ONEMIN, using_httpx
 
 IS_CI_ENV = True if 'IN_CI' in os.environ else False
 
@@ -394,5 +398,53 @@ class TestBittrexV20AccountAPI(unittest.TestCase):
         self.assertIsInstance(actual['result'], list, "result is not a list")
 
 
+class FakeHttpxResponse(object):
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class FakeHttpxClient(object):
+    """
+    Stands in for httpx.Client, recording every get
+    """
+
+    def __init__(self, body):
+        self.body = body
+        self.requests = []
+
+    def get(self, url, headers=None):
+        self.requests.append((url, headers))
+        return FakeHttpxResponse(self.body)
+
+
+class TestUsingHttpx(unittest.TestCase):
+
+    def test_signed_request_and_json_response(self):
+        client = FakeHttpxClient('{"success": true, "message": "", "result": [{"Currency": "BTC", "Balance": 1.5}]}')
+        bittrex = Bittrex('key', 'secret', calls_per_second=1e9, dispatch=using_httpx(client))
+        actual = bittrex.get_balances()
+        self.assertEqual({'success': True, 'message': '', 'result': [{'Currency': 'BTC', 'Balance': 1.5}]}, actual)
+        self.assertEqual(1, len(client.requests))
+        url, headers = client.requests[0]
+        self.assertTrue(url.startswith('https://bittrex.com/api/v1.1/account/getbalances?apikey=key&nonce='))
+        self.assertEqual({'apisign': hmac.new(b'secret', url.encode(), hashlib.sha512).hexdigest()}, headers)
+
+
+class TestLazyImports(unittest.TestCase):
+    """
+    Importing the module must not load the transport, crypto or signing modules
+    """
+
+    def test_import_is_lazy(self):
+        loaded = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys, bittrex.bittrex; '
+            'print(" ".join(m for m in ("requests", "Crypto", "hmac", "hashlib") if m in sys.modules))'])
+        self.assertEqual(b'', loaded.strip())
+
+
 if __name__ == '__main__':
     unittest.main()
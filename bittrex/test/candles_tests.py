@@ -0,0 +1,59 @@
+import unittest
+from bittrex.candles import Candles, Resampler, resample, format_timestamp, parse_timestamp, MINUTE, HOUR, WEEK
+
+
+def minute(i, close, volume=1.0, start='2017-11-06T00:00:00'):
+    return {'O': close, 'H': close + 1, 'L': close - 1, 'C': close, 'V': volume, 'BV': volume * close,
+            'T': format_timestamp(parse_timestamp(start) + i * MINUTE)}
+
+
+MINUTES = [minute(i, 10.0 + i) for i in range(10)]
+
+
+class TestCandles(unittest.TestCase):
+
+    def test_parse_timestamp(self):
+        self.assertEqual(1504142990.0, parse_timestamp('2017-08-31T01:29:50'))
+        self.assertAlmostEqual(1504142990.427, parse_timestamp('2017-08-31T01:29:50.427'))
+
+    def test_from_result_and_append(self):
+        candles = Candles.from_result(MINUTES[:2], 'BTC-LTC')
+        candles.append(MINUTES[1])
+        self.assertEqual(2, len(candles))
+        candles.append(MINUTES[2])
+        self.assertEqual(MINUTES[2], candles[2])
+
+    def test_resample(self):
+        bars = resample(Candles.from_result(MINUTES), 3 * MINUTE)
+        self.assertEqual(4, len(bars))
+        self.assertEqual({'O': 10.0, 'H': 13.0, 'L': 9.0, 'C': 12.0, 'V': 3.0, 'BV': 33.0,
+                          'T': '2017-11-06T00:00:00'}, bars[0])
+        self.assertEqual('2017-11-06T00:09:00', bars[3]['T'])
+
+    def test_weekly_bars_start_on_monday(self):
+        sunday = minute(0, 1.0, start='2017-11-05T23:59:00')
+        bars = resample(Candles.from_result([sunday] + MINUTES), WEEK)
+        self.assertEqual(['2017-10-30T00:00:00', '2017-11-06T00:00:00'], [bars[0]['T'], bars[1]['T']])
+
+    def test_resampler_matches_resample(self):
+        resampler = Resampler([3 * MINUTE, HOUR])
+        completed = []
+        for candle in MINUTES:
+            completed.extend(resampler.update(candle))
+        self.assertEqual([3 * MINUTE] * 3, [seconds for seconds, bar in completed])
+        expected = resample(Candles.from_result(MINUTES), 3 * MINUTE)
+        self.assertEqual([expected[i] for i in range(3)], [resampler.bars[3 * MINUTE][i] for i in range(3)])
+        self.assertEqual(expected[3]['C'], resampler.current(3 * MINUTE)['C'])
+        self.assertEqual(10.0, resampler.current(HOUR)['V'])
+
+    def test_resampler_replaces_forming_candle(self):
+        resampler = Resampler([3 * MINUTE])
+        resampler.update(minute(1, 10.0))
+        resampler.update(minute(2, 10.0, volume=1.0))
+        resampler.update(minute(2, 12.0, volume=5.0))
+        bar = resampler.current(3 * MINUTE)
+        self.assertEqual((6.0, 12.0, '2017-11-06T00:00:00'), (bar['V'], bar['C'], format_timestamp(bar['T'])))
+
+
+if __name__ == '__main__':
+    unittest.main()
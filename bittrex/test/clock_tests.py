@@ -0,0 +1,159 @@
+import unittest
+from bittrex.bittrex import Bittrex, PRIORITY_ACCOUNT
+from bittrex.clock import ClockEstimator, using_clock, parse_http_date
+from bittrex.ratelimit import PacedLimiter
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeResponse(object):
+
+    def __init__(self, date):
+        self.headers = {'Date': date}
+
+    def json(self):
+        return {'success': True, 'message': '', 'result': None}
+
+
+class FakeSession(object):
+    """
+    Server clock 2.3 s ahead, 100 ms round trips
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.urls = []
+
+    def get(self, request_url, headers=None):
+        self.urls.append(request_url)
+        self.clock.now += 0.05
+        date = 'Thu, 01 Jan 1970 00:{:02d}:{:02d} GMT'.format(*divmod(int(self.clock.now + 2.3), 60))
+        self.clock.now += 0.05
+        return FakeResponse(date)
+
+
+class TestClockEstimator(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.estimator = ClockEstimator(clock=self.clock)
+
+    def test_offset_narrows(self):
+        session = FakeSession(self.clock)
+        dispatch = using_clock(self.estimator, session)
+        dispatch('https://bittrex.com/api/v1.1/public/getticker?market=BTC-LTC', '')
+        self.assertLessEqual(self.estimator.uncertainty, 0.55)
+        for _ in range(40):
+            self.clock.now += 0.137
+            dispatch('https://bittrex.com/api/v1.1/public/getticker?market=BTC-LTC', '')
+        self.assertAlmostEqual(2.3, self.estimator.offset, delta=self.estimator.uncertainty)
+        self.assertLess(self.estimator.uncertainty, 0.1)
+        self.assertAlmostEqual(self.clock.now + self.estimator.offset, self.estimator())
+
+    def test_rtt_per_endpoint(self):
+        self.estimator.record('/public/getticker', 0.0, 0.1)
+        self.estimator.record('/public/getticker', 1.0, 1.1)
+        self.estimator.record('/account/getbalances', 2.0, 2.5)
+        self.assertAlmostEqual(0.1, self.estimator.rtt('/public/getticker'))
+        self.assertGreater(self.estimator.rtt(), 0.1)
+        self.assertEqual(3, self.estimator.stats()[None]['samples'])
+        self.assertEqual(0.0, ClockEstimator().jitter())
+
+    def test_clock_step_restarts_estimate(self):
+        self.estimator.record('/public/getticker', 0.0, 0.1, server_time=10.0)
+        self.estimator.record('/public/getticker', 1.0, 1.1, server_time=31.0)
+        self.assertAlmostEqual(30.0, self.estimator.offset, delta=0.55)
+
+    def test_old_samples_expire(self):
+        estimator = ClockEstimator(max_age=10.0)
+        estimator.record('/public/getticker', 0.0, 0.1, server_time=10.0)
+        estimator.record('/public/getticker', 20.0, 20.1, server_time=30.5)
+        self.assertAlmostEqual(10.95, estimator.offset)
+
+    def test_parse_http_date(self):
+        self.assertEqual(784111777, parse_http_date('Sun, 06 Nov 1994 08:49:37 GMT'))
+        self.assertEqual(None, parse_http_date('yesterday'))
+        self.assertEqual(None, parse_http_date(None))
+
+
+class TestNonces(unittest.TestCase):
+
+    def test_nonces_from_clock_increase(self):
+        clock = Clock()
+        urls = []
+        bittrex = Bittrex('key', 'secret', calls_per_second=1e9, clock=clock,
+                          dispatch=lambda url, apisign: urls.append(url) or {'success': True})
+        bittrex.get_balances()
+        clock.now -= 5  # estimate moved back
+        bittrex.get_balances()
+        bittrex.get_balances()
+        nonces = [int(url.split('nonce=')[1].split('&')[0]) for url in urls]
+        self.assertEqual([1000000, 1000001, 1000002], nonces)
+
+    def test_nonce_is_taken_after_the_token(self):
+        urls = []
+
+        class Reordering(object):
+            # an order call overtakes the account call queued before it
+            def wait(self, priority):
+                if priority == PRIORITY_ACCOUNT:
+                    bittrex.cancel('uuid')
+                return True
+
+        bittrex = Bittrex('key', 'secret', rate_limiter=Reordering(), clock=Clock(),
+                          dispatch=lambda url, apisign: urls.append(url) or {'success': True})
+        bittrex.get_balances()
+        self.assertEqual(['cancel', 'getbalances'], [url.split('?')[0].rsplit('/', 1)[1] for url in urls])
+        nonces = [int(url.split('nonce=')[1].split('&')[0]) for url in urls]
+        self.assertEqual([1000000, 1000001], nonces)
+
+
+class TestPacedLimiter(unittest.TestCase):
+
+    def test_spacing_follows_jitter(self):
+        clock = Clock()
+        estimator = ClockEstimator(clock=clock)
+        limiter = PacedLimiter(2, estimator, clock=clock, sleep=clock.sleep)
+        limiter.wait()
+        limiter.wait()
+        self.assertAlmostEqual(1000.5, clock.now)
+
+        estimator.record('/public/getticker', 0.0, 0.2)
+        estimator.record('/public/getticker', 1.0, 1.4)
+        jitter = estimator.jitter()
+        self.assertGreater(jitter, 0)
+        limiter = PacedLimiter(2, estimator, clock=clock, sleep=clock.sleep)
+        limiter.wait()
+        started = clock.now
+        limiter.wait()
+        limiter.wait()
+        self.assertAlmostEqual(2 * (0.5 + jitter), clock.now - started)
+
+    def test_rate_is_computed_under_the_lock(self):
+        held = []
+
+        class Estimator(object):
+            def jitter(self):
+                held.append(limiter._lock.locked())
+                return 0.5
+
+        clock = Clock()
+        limiter = PacedLimiter(2, Estimator(), clock=clock, sleep=clock.sleep)
+        limiter.wait()
+        limiter.wait()
+        self.assertEqual([True, True], held)
+        self.assertAlmostEqual(1.0, limiter.rate)
+
+
+if __name__ == '__main__':
+    unittest.main()
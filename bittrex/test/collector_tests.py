@@ -0,0 +1,56 @@
+import unittest
+import functools
+import json
+import os
+import tempfile
+import time
+from bittrex.collector import Collector, shard
+
+MARKETS = ['BTC-LTC', 'BTC-ETH', 'BTC-XRP']
+
+
+def fake_dispatch(request_url, apisign):
+    market = request_url.split('market=')[1].split('&')[0]
+    result = {'buy': [{'Quantity': 1.0, 'Rate': 0.01}], 'sell': [], 'market': market}
+    return {'success': True, 'message': '', 'result': result}
+
+
+def record(directory, market, response):
+    # one file per market and worker process
+    with open(os.path.join(directory, '{}.{}'.format(market, os.getpid())), 'a') as outfile:
+        outfile.write(json.dumps(response) + '\n')
+
+
+class TestCollector(unittest.TestCase):
+
+    def test_shard(self):
+        self.assertEqual([['A', 'C', 'E'], ['B', 'D']], shard(['A', 'B', 'C', 'D', 'E'], 2))
+        self.assertEqual([['A']], shard(['A'], 4))
+
+    def test_workers_fetch_and_handle_their_shards(self):
+        directory = tempfile.mkdtemp()
+        collector = Collector(MARKETS, functools.partial(record, directory), calls_per_second=1000, processes=2,
+                              interval=0.01, dispatch=fake_dispatch).start()
+        deadline = time.time() + 30
+        while len(os.listdir(directory)) < len(MARKETS) and time.time() < deadline:
+            time.sleep(0.05)
+        collector.stop(timeout=10)
+        self.assertEqual([], collector.workers)
+
+        files = sorted(os.listdir(directory))
+        self.assertEqual(sorted(MARKETS), [name.split('.')[0] for name in files])
+        workers = dict((name.split('.')[0], name.split('.')[1]) for name in files)
+        self.assertEqual(workers['BTC-LTC'], workers['BTC-XRP'])
+        self.assertNotEqual(workers['BTC-LTC'], workers['BTC-ETH'])
+        for name in files:
+            with open(os.path.join(directory, name)) as infile:
+                responses = [json.loads(line) for line in infile]
+            self.assertTrue(responses)
+            for response in responses:
+                self.assertTrue(response['success'])
+                self.assertEqual(name.split('.')[0], response['result']['market'])
+                self.assertEqual([{'Quantity': 1.0, 'Rate': 0.01}], response['result']['buy'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+import unittest
+from bittrex.bittrex import Bittrex
+from bittrex.paper import PaperExchange
+from bittrex.execution import Executor, ParentOrder, BUY, SELL, TWAP, VWAP, ICEBERG, EVENT_DONE, EVENT_FILL, \
+    EVENT_CHILD_CANCELLED, EVENT_ERROR
+
+ORDERBOOK = {
+    'buy': [{'Quantity': 100.0, 'Rate': 0.99}],
+    'sell': [{'Quantity': 100.0, 'Rate': 1.00}, {'Quantity': 100.0, 'Rate': 1.10}],
+}
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class RecordingExchange(PaperExchange):
+    """
+    Records the time of private calls and fails the first failing_cancels cancels
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(RecordingExchange, self).__init__(*args, **kwargs)
+        self.private_calls = []
+        self.failing_cancels = 0
+
+    def __call__(self, request_url, apisign):
+        if '/public/' not in request_url:
+            self.private_calls.append(self.clock())
+        if '/market/cancel' in request_url and self.failing_cancels:
+            self.failing_cancels -= 1
+            return {'success': False, 'message': 'APIKEY_INVALID', 'result': None}
+        return super(RecordingExchange, self).__call__(request_url, apisign)
+
+
+class TestExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.exchange = RecordingExchange(balances={'BTC': 1000.0, 'LTC': 1000.0}, commission=0.0, clock=self.clock)
+        self.exchange.load_orderbook('BTC-LTC', ORDERBOOK)
+        self.bittrex = Bittrex(None, None, calls_per_second=1e9, dispatch=self.exchange)
+        self.events = []
+        self.executor = Executor(self.bittrex, on_event=lambda *event: self.events.append(event),
+                                 clock=self.clock, sleep=self.clock.sleep)
+
+    def advance(self, seconds=1.0):
+        self.clock.now += seconds
+        self.executor.step()
+
+    def test_twap_slices_over_time(self):
+        parent = self.executor.submit(ParentOrder('BTC-LTC', BUY, 40, style=TWAP, duration=40, slices=4))
+        self.executor.step()
+        self.advance()
+        self.assertAlmostEqual(10.0, parent.filled)
+        self.advance()
+        self.assertEqual(1, len(parent.children))
+        self.executor.run()
+        self.assertAlmostEqual(40.0, parent.filled)
+        self.assertAlmostEqual(1.0, parent.average_price)
+        self.assertEqual(4, len(parent.children))
+        self.assertGreaterEqual(self.clock.now, 1030.0)
+        self.assertEqual(EVENT_DONE, self.events[-1][0])
+
+    def test_vwap_follows_volume_profile(self):
+        parent = self.executor.submit(ParentOrder('BTC-LTC', BUY, 40, style=VWAP, duration=40,
+                                                  volume_profile=[3, 1]))
+        self.executor.step()
+        self.advance()
+        self.assertAlmostEqual(30.0, parent.filled)
+
+    def test_child_price_is_capped_by_slippage(self):
+        parent = self.executor.submit(ParentOrder('BTC-LTC', BUY, 150, style=ICEBERG, display_quantity=150,
+                                                  max_slippage=0.05))
+        self.executor.step()
+        self.advance()
+        # only the 1.00 level is within 5%, the rest rests in the book
+        self.assertAlmostEqual(100.0, parent.filled)
+        self.assertIsNotNone(parent.child)
+
+    def test_unfilled_child_is_cancelled_at_slice_end(self):
+        parent = self.executor.submit(ParentOrder('BTC-LTC', SELL, 20, style=TWAP, duration=20, slices=2,
+                                                  limit=1.05))
+        self.executor.step()
+        self.advance(10)
+        self.assertEqual(0.0, parent.filled)
+        self.assertIn(EVENT_CHILD_CANCELLED, [event[0] for event in self.events])
+
+        self.executor.step()
+        self.assertEqual(20.0, self.exchange.open_orders('BTC-LTC')[0].quantity)
+        self.exchange.trade('BTC-LTC', 1.05, 100)
+        self.advance()
+        self.assertAlmostEqual(20.0, parent.filled)
+        self.assertAlmostEqual(21.0, parent.cost)
+        self.assertEqual([EVENT_FILL, EVENT_DONE], [event[0] for event in self.events[-2:]])
+
+    def test_iceberg_and_cancel(self):
+        parent = self.executor.submit(ParentOrder('BTC-LTC', BUY, 50, style=ICEBERG, display_quantity=10))
+        self.executor.step()
+        self.advance()
+        self.assertAlmostEqual(10.0, parent.filled)
+        self.assertEqual(2, len(parent.children))
+        self.executor.cancel(parent)
+        self.assertAlmostEqual(20.0, parent.filled)
+        self.assertTrue(parent.done)
+        self.assertEqual([], self.executor.active)
+
+    def test_polling_is_spread_over_the_call_budget(self):
+        executor = Executor(self.bittrex, call_budget=2, clock=self.clock, sleep=self.clock.sleep)
+        parents = [executor.submit(ParentOrder('BTC-LTC', BUY, 1, style=ICEBERG, limit=0.5)) for _ in range(10)]
+        started = self.clock.now
+        executor.step()
+        self.assertEqual(10, len(self.exchange.private_calls))
+        self.assertTrue(all(parent.next_poll >= started + 5.0 for parent in parents))
+        for _ in range(20):
+            self.clock.now += 1.0
+            executor.step()
+        calls = self.exchange.private_calls
+        self.assertGreater(len(calls), 20)
+        # placements and polls together stay within 2 calls per second
+        self.assertTrue(all(b - a >= 0.5 - 1e-9 for a, b in zip(calls, calls[1:])))
+
+    def test_child_filled_over_several_polls(self):
+        parent = self.executor.submit(ParentOrder('BTC-LTC', BUY, 20, style=ICEBERG, display_quantity=20,
+                                                  max_slippage=0.05, limit=1.0))
+        self.exchange.load_orderbook('BTC-LTC', {'buy': [], 'sell': [{'Quantity': 5.0, 'Rate': 0.8},
+                                                                     {'Quantity': 100.0, 'Rate': 0.9}]})
+        self.executor.step()
+        self.advance()
+        self.assertAlmostEqual(5.0, parent.filled)
+        self.exchange.trade('BTC-LTC', 0.84, 15)
+        self.advance()
+        self.assertAlmostEqual(20.0, parent.filled)
+        # 5 taken at 0.80, the rest rests at 0.84 (5% slippage)
+        self.assertAlmostEqual(5 * 0.8 + 15 * 0.84, parent.cost)
+        self.assertAlmostEqual(self.bittrex.get_order(parent.children[0])['result']['Price'], parent.cost)
+
+    def test_failed_cancel_keeps_the_child(self):
+        parent = self.executor.submit(ParentOrder('BTC-LTC', SELL, 20, style=TWAP, duration=20, slices=2,
+                                                  limit=1.05))
+        self.executor.step()
+        self.exchange.failing_cancels = 2
+        self.advance(10)
+        self.assertIsNotNone(parent.child)
+        self.assertIn(EVENT_ERROR, [event[0] for event in self.events])
+        self.advance()
+        self.assertEqual(1, len(self.exchange.open_orders('BTC-LTC')))
+        self.assertEqual(1, len(parent.children))
+
+        self.advance()
+        self.assertIn(EVENT_CHILD_CANCELLED, [event[0] for event in self.events])
+        self.executor.step()
+        self.assertEqual(2, len(parent.children))
+        self.assertEqual(1, len(self.exchange.open_orders('BTC-LTC')))
+
+    def test_failed_parent_cancel_is_retried(self):
+        parent = self.executor.submit(ParentOrder('BTC-LTC', SELL, 20, style=ICEBERG, limit=1.05))
+        self.executor.step()
+        self.exchange.failing_cancels = 1
+        self.executor.cancel(parent)
+        self.assertFalse(parent.done)
+        self.advance()
+        self.assertTrue(parent.done)
+        self.assertEqual([], self.exchange.open_orders('BTC-LTC'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from bittrex.bittrex import API_V2_0
+from bittrex.fixed import to_fixed, format_fixed, loads, fixed_result, FixedPointBittrex, SCALE, TYPECODE
+from bittrex.orderbook import OrderBook
+from bittrex.paper import PaperExchange
+
+
+class TestFixedPoint(unittest.TestCase):
+
+    def test_to_fixed(self):
+        self.assertEqual(177639, to_fixed('0.00177639'))
+        self.assertEqual(1, to_fixed('1e-08'))
+        self.assertEqual(-150000000, to_fixed('-1.5'))
+        self.assertEqual(2, to_fixed('0.000000015'))
+        self.assertEqual(12300000000, to_fixed('1.23E2'))
+        self.assertEqual(10000000, to_fixed(0.1))
+        self.assertEqual(5 * SCALE, to_fixed(5))
+
+    def test_format_fixed(self):
+        self.assertEqual('1.5', format_fixed(150000000))
+        self.assertEqual('0.00000001', format_fixed(1))
+        self.assertEqual('-0.1', format_fixed(-10000000))
+        self.assertEqual('7', format_fixed(7 * SCALE))
+        for text in ('0.00177639', '123.45678901', '0.3'):
+            self.assertEqual(text, format_fixed(to_fixed(text)))
+
+    def test_loads_only_converts_numeric_fields(self):
+        actual = loads('{"success": true, "result": [{"Id": 5625015, "Quantity": 7.31008193, "Price": 1e-08, '
+                       '"Total": 2, "TimeStamp": "2017-08-31T01:29:50.427", "Other": 0.5}]}')
+        self.assertEqual({'Id': 5625015, 'Quantity': 731008193, 'Price': 1, 'Total': 2 * SCALE,
+                          'TimeStamp': '2017-08-31T01:29:50.427', 'Other': 0.5}, actual['result'][0])
+        self.assertIs(True, actual['success'])
+
+    def test_fixed_result(self):
+        self.assertEqual({'result': {'buy': [{'Rate': 30000000, 'Quantity': 10 * SCALE}]}},
+                         fixed_result({'result': {'buy': [{'Rate': 0.3, 'Quantity': 10}]}}))
+
+    def test_orders_are_formatted_exactly(self):
+        urls = []
+        exchange = PaperExchange(balances={'BTC': 1.0})
+
+        def dispatch(request_url, apisign):
+            urls.append(request_url)
+            return exchange(request_url, apisign)
+
+        bittrex = FixedPointBittrex(None, None, dispatch=dispatch, calls_per_second=1e9)
+        uuid = bittrex.buy_limit('BTC-LTC', to_fixed('0.3'), to_fixed('0.00000007'))['result']['uuid']
+        self.assertIn('quantity=0.3&rate=0.00000007', urls[-1])
+        order = bittrex.get_order(uuid)['result']
+        self.assertEqual((30000000, 7), (order['Quantity'], order['Limit']))
+
+    def test_positional_arguments_match_bittrex(self):
+        dispatch = PaperExchange(balances={'BTC': 1.0})
+        bittrex = FixedPointBittrex(None, None, 1e9, dispatch, API_V2_0)
+        self.assertEqual((1e-9, API_V2_0), (bittrex.call_rate, bittrex.api_version))
+        self.assertEqual(100000000, bittrex.get_balance('BTC')['result']['Balance'])
+
+    def test_integer_book(self):
+        book = OrderBook(loads('{"buy": [{"Quantity": 1.0, "Rate": 0.1}], '
+                               '"sell": [{"Quantity": 0.1, "Rate": 0.3}, {"Quantity": 0.2, "Rate": 0.30000001}]}'),
+                         fixed=True)
+        self.assertEqual(TYPECODE, book.asks.cum_cost.typecode)
+        self.assertEqual(20000000, book.mid)
+        estimate = book.estimate_buy([to_fixed('0.3')])[0]
+        # 0.1 * 0.3 + 0.2 * 0.30000001, rounded down to whole units
+        self.assertEqual(to_fixed('0.090000002'), estimate['cost'])
+        self.assertEqual(30000000, estimate['price'])
+        self.assertEqual((1.0, to_fixed('0.3'), to_fixed('0.090000002')), book.asks.depth_within([1.0])[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
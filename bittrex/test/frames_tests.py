@@ -0,0 +1,71 @@
+import unittest
+try:
+    import pandas
+except ImportError:
+    pandas = None
+from bittrex.frames import candles_frame, market_history_frame, order_history_frame, summaries_frame, MARKET
+
+CANDLES = [
+    {'T': '2018-01-01T00:00:00', 'O': 1.0, 'H': 2.0, 'L': 0.5, 'C': 1.5, 'V': 10.0, 'BV': 15.0},
+    {'T': '2018-01-01T01:00:00', 'O': 1.5, 'H': 1.5, 'L': 1.0, 'C': 1.0, 'V': 5, 'BV': 6.0},
+]
+
+TRADES = [
+    {'Id': 2, 'TimeStamp': '2018-01-01T00:00:01.27', 'Quantity': 1.0, 'Price': 0.01, 'Total': 0.01,
+     'FillType': 'FILL', 'OrderType': 'BUY'},
+    {'Id': 1, 'TimeStamp': '2018-01-01T00:00:00', 'Quantity': 2.0, 'Price': 0.01, 'Total': 0.02,
+     'FillType': 'PARTIAL_FILL', 'OrderType': 'SELL'},
+]
+
+
+@unittest.skipIf(pandas is None, 'pandas is not installed')
+class TestFrames(unittest.TestCase):
+
+    def test_candles(self):
+        frame = candles_frame(CANDLES)
+        self.assertEqual(['T', 'O', 'H', 'L', 'C', 'V', 'BV'], list(frame.columns))
+        self.assertEqual('float64', str(frame['V'].dtype))
+        self.assertTrue(str(frame['T'].dtype).startswith('datetime64'))
+        self.assertEqual(pandas.Timestamp('2018-01-01T01:00:00'), frame['T'][1])
+
+    def test_market_history(self):
+        frame = market_history_frame(TRADES)
+        self.assertEqual('int64', str(frame['Id'].dtype))
+        self.assertEqual('category', str(frame['OrderType'].dtype))
+        self.assertEqual(pandas.Timestamp('2018-01-01T00:00:01.270'), frame['TimeStamp'][0])
+
+    def test_many_markets(self):
+        frame = market_history_frame({'BTC-LTC': TRADES, 'BTC-ETH': TRADES[:1], 'BTC-XRP': None})
+        self.assertEqual(MARKET, frame.columns[0])
+        self.assertEqual('category', str(frame[MARKET].dtype))
+        self.assertEqual(['BTC-LTC', 'BTC-ETH', 'BTC-XRP'], list(frame[MARKET].cat.categories))
+        self.assertEqual(['BTC-LTC', 'BTC-LTC', 'BTC-ETH'], list(frame[MARKET]))
+        self.assertEqual([2, 1, 2], list(frame['Id']))
+
+    def test_missing_values(self):
+        frame = order_history_frame([
+            {'OrderUuid': 'a', 'Exchange': 'BTC-LTC', 'TimeStamp': '2018-01-01T00:00:00Z', 'OrderType': 'LIMIT_BUY',
+             'Limit': 0.01, 'Quantity': 1.0, 'QuantityRemaining': 0.0, 'Commission': 0.0, 'Price': 0.01,
+             'PricePerUnit': None, 'IsConditional': False, 'Condition': None, 'ConditionTarget': None,
+             'ImmediateOrCancel': False, 'Closed': None},
+        ])
+        self.assertTrue(pandas.isna(frame['PricePerUnit'][0]))
+        self.assertTrue(pandas.isna(frame['Closed'][0]))
+        self.assertEqual(pandas.Timestamp('2018-01-01'), frame['TimeStamp'][0])
+        self.assertEqual('bool', str(frame['IsConditional'].dtype))
+
+    def test_v2_summaries(self):
+        summary = {'MarketName': 'BTC-LTC', 'High': 0.02, 'Low': 0.01, 'Volume': 10.0, 'Last': 0.015,
+                   'BaseVolume': 0.15, 'TimeStamp': '2018-01-01T00:00:00.5', 'Bid': 0.014, 'Ask': 0.016,
+                   'OpenBuyOrders': 3, 'OpenSellOrders': 4, 'PrevDay': 0.012, 'Created': '2014-02-13T00:00:00'}
+        frame = summaries_frame([{'Market': {}, 'Summary': summary}])
+        self.assertEqual(['BTC-LTC'], list(frame['MarketName']))
+        self.assertEqual('int64', str(frame['OpenBuyOrders'].dtype))
+
+    def test_empty(self):
+        self.assertEqual(0, len(candles_frame([])))
+        self.assertEqual(0, len(candles_frame({'BTC-LTC': []})))
+
+
+if __name__ == '__main__':
+    unittest.main()
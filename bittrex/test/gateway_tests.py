@@ -0,0 +1,120 @@
+import unittest
+import json
+import threading
+import time
+try:
+    from urllib2 import urlopen, Request, HTTPError
+except ImportError:
+    from urllib.request import urlopen, Request
+    from urllib.error import HTTPError
+from bittrex.bittrex import Bittrex
+from bittrex.gateway import Gateway, using_gateway
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse(object):
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class UrllibSession(object):
+    """
+    Stands in for requests.Session
+    """
+
+    def get(self, url, headers):
+        return FakeResponse(urlopen(Request(url, headers=headers)).read().decode('utf-8'))
+
+
+class NoLimit(object):
+    def wait(self, *args):
+        return True
+
+
+class TestGateway(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+        self.clock = FakeClock()
+        self.gateway = Gateway(port=0, upstream=self.upstream, rate_limiter=NoLimit(), clock=self.clock).start()
+        self.bittrex = Bittrex('key', 'secret', calls_per_second=1e9,
+                               dispatch=using_gateway(self.gateway.url, UrllibSession()))
+
+    def tearDown(self):
+        self.gateway.shutdown()
+
+    def upstream(self, request_url, apisign):
+        self.calls.append((request_url, apisign))
+        self.release.wait()
+        return {'success': True, 'message': '', 'result': len(self.calls)}
+
+    def test_public_calls_are_cached(self):
+        self.assertEqual(1, self.bittrex.get_ticker('BTC-LTC')['result'])
+        self.assertEqual(1, self.bittrex.get_ticker('BTC-LTC')['result'])
+        self.assertEqual(2, self.bittrex.get_ticker('BTC-ETH')['result'])
+        self.clock.now += 1.5
+        self.assertEqual(3, self.bittrex.get_ticker('BTC-LTC')['result'])
+        self.assertEqual('https://bittrex.com/api/v1.1/public/getticker?market=BTC-LTC', self.calls[0][0])
+        self.assertEqual(1, self.gateway.stats['hits'])
+
+    def test_private_calls_are_forwarded_with_signature(self):
+        self.bittrex.get_balances()
+        self.bittrex.get_balances()
+        self.assertEqual(2, len(self.calls))
+        url, apisign = self.calls[0]
+        self.assertTrue(url.startswith('https://bittrex.com/api/v1.1/account/getbalances?apikey=key&nonce='))
+        self.assertEqual(128, len(apisign))
+
+    def test_concurrent_misses_share_one_call(self):
+        self.release.clear()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.bittrex.get_markets()['result']))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([1] * 4, results)
+        self.assertEqual(1, len(self.calls))
+        self.assertEqual(3, self.gateway.stats['coalesced'])
+
+    def test_unknown_path_is_not_found(self):
+        with self.assertRaises(HTTPError) as raised:
+            urlopen(self.gateway.url + '/favicon.ico')
+        self.assertEqual(404, raised.exception.code)
+        self.assertEqual({'success': False, 'message': 'UNKNOWN_ENDPOINT', 'result': None},
+                         json.loads(raised.exception.read().decode('utf-8')))
+        self.assertEqual([], self.calls)
+
+    def test_paths_outside_the_api_are_refused(self):
+        for path in ('@evil.example/api/v1.1/account/getbalances', '.evil.example/api/v1.1/public/getmarkets'):
+            self.assertRaises(ValueError, self.gateway.handle, path, 'apisign')
+        self.assertEqual([], self.calls)
+
+    def test_expired_entries_are_swept_on_a_timer(self):
+        self.bittrex.get_ticker('BTC-LTC')
+        self.bittrex.get_ticker('BTC-ETH')
+        self.clock.now += 2
+        self.bittrex.get_ticker('BTC-LTC')
+        self.assertEqual(2, len(self.gateway.cache))
+        self.clock.now += self.gateway.expire_interval
+        self.bittrex.get_markets()
+        self.assertEqual(['/api/v1.1/public/getmarkets?'], list(self.gateway.cache))
+
+
+if __name__ == '__main__':
+    unittest.main()
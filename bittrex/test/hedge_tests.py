@@ -0,0 +1,68 @@
+import unittest
+import threading
+import time
+from bittrex.bittrex import Bittrex
+from bittrex.hedge import HedgedDispatch
+from bittrex.ratelimit import TokenBucket
+
+
+class SlowFirstDispatch(object):
+    """
+    Answers after delays[i] seconds for the i-th call
+    """
+
+    def __init__(self, delays):
+        self.delays = list(delays)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, request_url, apisign):
+        with self._lock:
+            index = len(self.calls)
+            self.calls.append(request_url)
+        time.sleep(self.delays[index] if index < len(self.delays) else 0.0)
+        return {'success': True, 'message': '', 'result': index}
+
+
+class TestHedgedDispatch(unittest.TestCase):
+
+    def client(self, dispatch, **options):
+        self.hedged = HedgedDispatch(dispatch, **options)
+        return Bittrex(None, None, calls_per_second=1e9, dispatch=self.hedged)
+
+    def test_slow_call_is_hedged(self):
+        bittrex = self.client(SlowFirstDispatch([0.5]), initial_delay=0.02, max_ratio=1.0)
+        started = time.time()
+        self.assertEqual(1, bittrex.get_ticker('BTC-LTC')['result'])
+        self.assertLess(time.time() - started, 0.4)
+        self.assertEqual((1, 1), (self.hedged.hedges, self.hedged.hedge_wins))
+
+    def test_private_calls_are_not_hedged(self):
+        dispatch = SlowFirstDispatch([0.1])
+        bittrex = self.client(dispatch, initial_delay=0.01, max_ratio=1.0)
+        self.assertEqual(0, bittrex.get_balances()['result'])
+        self.assertEqual((1, 0), (len(dispatch.calls), self.hedged.hedges))
+
+    def test_hedges_are_capped(self):
+        bittrex = self.client(SlowFirstDispatch([0.05] * 20), initial_delay=0.01, max_ratio=0.25)
+        for _ in range(8):
+            bittrex.get_ticker('BTC-LTC')
+        self.assertEqual(2, self.hedged.hedges)
+
+    def test_hedges_need_a_token(self):
+        limiter = TokenBucket(0.001)
+        self.assertTrue(limiter.try_acquire())
+        bittrex = self.client(SlowFirstDispatch([0.05]), rate_limiter=limiter, initial_delay=0.01, max_ratio=1.0)
+        self.assertEqual(0, bittrex.get_ticker('BTC-LTC')['result'])
+        self.assertEqual(0, self.hedged.hedges)
+
+    def test_delay_follows_percentile(self):
+        hedged = HedgedDispatch(None, percentile=90, min_samples=10)
+        for latency in range(1, 11):
+            hedged._record('/public/getticker', latency / 10.0)
+        self.assertAlmostEqual(1.0, hedged.delay('/public/getticker'))
+        self.assertEqual(hedged.initial_delay, hedged.delay('/public/getorderbook'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import os
+import tempfile
+from bittrex.bittrex import Bittrex
+from bittrex.history import HistorySync
+
+
+def order(uuid, timestamp):
+    return {'OrderUuid': uuid, 'TimeStamp': timestamp, 'Exchange': 'BTC-LTC'}
+
+
+class FakeDispatch(object):
+    def __init__(self):
+        self.result = []
+
+    def __call__(self, request_url, apisign):
+        return {'success': True, 'message': '', 'result': list(self.result)}
+
+
+class TestHistorySync(unittest.TestCase):
+
+    def setUp(self):
+        self.dispatch = FakeDispatch()
+        self.bittrex = Bittrex('key', 'secret', calls_per_second=1000, dispatch=self.dispatch)
+        self.checkpoint_fn = os.path.join(tempfile.mkdtemp(), 'checkpoint.json')
+
+    def test_yields_only_new_orders(self):
+        sync = HistorySync(self.bittrex, self.checkpoint_fn)
+        self.dispatch.result = [order('b', '2017-08-31T01:29:51'), order('a', '2017-08-31T01:29:50')]
+        self.assertEqual(['a', 'b'], [o['OrderUuid'] for o in sync.new_orders()])
+
+        self.dispatch.result.insert(0, order('c', '2017-08-31T01:29:51'))
+        self.assertEqual(['c'], [o['OrderUuid'] for o in sync.new_orders()])
+        self.assertEqual([], list(sync.new_orders()))
+
+    def test_checkpoint_is_persisted(self):
+        self.dispatch.result = [order('a', '2017-08-31T01:29:50')]
+        list(HistorySync(self.bittrex, self.checkpoint_fn).new_orders())
+
+        self.dispatch.result.insert(0, order('b', '2017-08-31T01:30:00'))
+        sync = HistorySync(self.bittrex, self.checkpoint_fn)
+        self.assertEqual(['b'], [o['OrderUuid'] for o in sync.new_orders()])
+
+    def test_checkpoint_only_covers_processed_records(self):
+        sync = HistorySync(self.bittrex, self.checkpoint_fn)
+        self.dispatch.result = [order('c', '2017-08-31T01:31:00'), order('b', '2017-08-31T01:30:00'),
+                                order('a', '2017-08-31T01:29:50')]
+        records = sync.new_orders()
+        next(records)
+        next(records)
+        records.close()
+        # 'b' was handed out but the caller stopped before asking for more
+        self.assertEqual(['b', 'c'], [o['OrderUuid'] for o in sync.new_orders()])
+
+    def test_checkpoints_are_per_market(self):
+        sync = HistorySync(self.bittrex, self.checkpoint_fn)
+        self.dispatch.result = [order('a', '2017-08-31T01:29:50')]
+        self.assertEqual(1, len(list(sync.new_orders('BTC-LTC'))))
+        self.assertEqual(1, len(list(sync.new_orders('BTC-ETH'))))
+        self.assertEqual(0, len(list(sync.new_orders('BTC-LTC'))))
+
+
+if __name__ == '__main__':
+    unittest.main()
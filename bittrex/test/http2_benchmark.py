@@ -0,0 +1,137 @@
+"""
+   Compares the pooled HTTP/1.1 requests transport with the HTTP/2 httpx
+   transport on a local server.
+
+   Both transports run the same number of concurrent get_ticker calls from
+   a thread pool.  HTTP/1.1 is served by a threaded http.server started by
+   the benchmark.  The benchmark does not start an HTTP/2 server: the
+   HTTP/2 numbers need an external cleartext HTTP/2 server answering any
+   path with a ticker, ex: hypercorn with an ASGI app, passed as --h2-url.
+   Without it only HTTP/1.1 is measured.  The client connects with prior
+   knowledge ::
+
+       python -m bittrex.test.http2_benchmark --calls 2000 --threads 64 --h2-url http://127.0.0.1:8000
+"""
+
+import argparse
+import json
+import threading
+import time
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+try:
+    from Queue import Queue, Empty
+except ImportError:
+    from queue import Queue, Empty
+
+from bittrex.bittrex import Bittrex, using_requests_session, using_httpx
+
+TICKER = json.dumps({'success': True, 'message': '', 'result': {'Bid': 1.0, 'Ask': 1.1, 'Last': 1.05}}).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(TICKER)))
+        self.end_headers()
+        self.wfile.write(TICKER)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def serve_http1():
+    server = _Server(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, 'http://127.0.0.1:{}'.format(server.server_address[1])
+
+
+def redirect(dispatch, base_url):
+    def redirected(request_url, apisign):
+        return dispatch(request_url.replace('https://bittrex.com', base_url), apisign)
+
+    return redirected
+
+
+def run(dispatch, calls, threads):
+    """
+    :return: (seconds, latencies) of calls get_ticker calls made from threads threads
+    """
+    bittrex = Bittrex(None, None, calls_per_second=1e9, dispatch=dispatch)
+    pending = Queue()
+    for _ in range(calls):
+        pending.put(True)
+    latencies = []
+
+    def worker():
+        while True:
+            try:
+                pending.get_nowait()
+            except Empty:
+                return
+            started = time.time()
+            bittrex.get_ticker('BTC-LTC')
+            latencies.append(time.time() - started)
+
+    started = time.time()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.time() - started, sorted(latencies)
+
+
+def report(name, elapsed, latencies):
+    count = len(latencies)
+    print('{:<24} {:>8.0f} calls/s  p50 {:6.2f} ms  p99 {:6.2f} ms'.format(
+        name, count / elapsed, 1000 * latencies[count // 2], 1000 * latencies[min(count - 1, int(count * 0.99))]))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='HTTP/1.1 vs HTTP/2 dispatch benchmark. HTTP/1.1 runs against a server started by the '
+                    'benchmark; HTTP/2 is only measured against an external server given as --h2-url.')
+    parser.add_argument('--calls', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--h2-url', help='external cleartext HTTP/2 server, ex: hypercorn, answering any path '
+                                         'with a ticker; HTTP/2 is skipped when omitted')
+    args = parser.parse_args()
+
+    server, url = serve_http1()
+    try:
+        import requests
+
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=args.threads)
+        session.mount('http://', adapter)
+        report('requests HTTP/1.1 pool', *run(redirect(using_requests_session(session), url), args.calls, args.threads))
+    finally:
+        server.shutdown()
+
+    if not args.h2_url:
+        print('httpx HTTP/2 skipped, needs an external HTTP/2 server passed as --h2-url')
+        return
+    import httpx
+
+    client = httpx.Client(http1=False, http2=True)
+    report('httpx HTTP/2', *run(redirect(using_httpx(client), args.h2_url), args.calls, args.threads))
+
+
+if __name__ == '__main__':
+    main()
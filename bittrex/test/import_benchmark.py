@@ -0,0 +1,58 @@
+"""
+   Measures the time it takes a fresh interpreter to import bittrex.
+
+   Every sample runs in its own process so nothing is cached in
+   sys.modules; the interpreter start up time is measured separately and
+   subtracted.  A warm up run writes the bytecode caches first, so
+   compilation is not counted ::
+
+       python -m bittrex.test.import_benchmark --runs 20
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+
+def _timed(statement, env):
+    started = time.time()
+    subprocess.check_call([sys.executable, '-c', statement], env=env)
+    return time.time() - started
+
+
+def measure(statement, runs):
+    """
+    Median wall clock seconds of running statement in a fresh interpreter,
+    None when the statement fails
+    """
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    try:
+        _timed(statement, env)
+    except subprocess.CalledProcessError:
+        return None
+    samples = sorted(_timed(statement, env) for _ in range(runs))
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='bittrex import time benchmark')
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = measure('pass', args.runs)
+    print('interpreter start up: {:.1f} ms'.format(baseline * 1000))
+    for statement in ('from bittrex.bittrex import API_V1_1',
+                      'from bittrex import Bittrex',
+                      'import requests'):
+        elapsed = measure(statement, args.runs)
+        if elapsed is None:
+            print('{:<40} failed'.format(statement))
+        else:
+            print('{:<40} {:+.1f} ms'.format(statement, (elapsed - baseline) * 1000))
+
+
+if __name__ == '__main__':
+    main()
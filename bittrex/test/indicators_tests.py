@@ -0,0 +1,63 @@
+import unittest
+from bittrex.candles import Candles
+from bittrex.indicators import SMA, EMA, RSI, BollingerBands, ATR
+
+
+def candle(i, close, high=None, low=None):
+    return {'O': close, 'H': high or close, 'L': low or close, 'C': close, 'V': 1.0, 'BV': close,
+            'T': '2017-11-03T03:{:02d}:00'.format(i)}
+
+
+CLOSES = [44.34, 44.09, 44.15, 43.61, 44.33, 44.83, 45.10, 45.42, 45.84, 46.08, 45.89, 46.03, 45.61, 46.28,
+          46.28, 46.00, 46.03, 46.41, 46.22, 45.64]
+CANDLES = [candle(i, close) for i, close in enumerate(CLOSES)]
+
+
+class TestIndicators(unittest.TestCase):
+
+    def assertValueEqual(self, expected, actual, msg=None):
+        if isinstance(expected, tuple):
+            for e, a in zip(expected, actual):
+                self.assertAlmostEqual(e, a, msg=msg)
+        else:
+            self.assertAlmostEqual(expected, actual, msg=msg)
+
+    def test_sma(self):
+        sma = SMA(3)
+        self.assertEqual([None, None, 2.0, 3.0], [sma.update(candle(i, c)) for i, c in enumerate([1, 2, 3, 4])])
+
+    def test_bollinger(self):
+        middle, upper, lower = BollingerBands(4, 2.0).seed([candle(i, c) for i, c in enumerate([1, 3, 1, 3])]).value
+        self.assertAlmostEqual(2.0, middle)
+        self.assertAlmostEqual(4.0, upper)
+        self.assertAlmostEqual(0.0, lower)
+
+    def test_ema(self):
+        ema = EMA(3).seed([candle(i, c) for i, c in enumerate([1, 2, 3])])
+        self.assertAlmostEqual(2.0, ema.value)
+        self.assertAlmostEqual(3.0, ema.update(candle(3, 4)))
+
+    def test_rsi(self):
+        rsi = RSI(14).seed(CANDLES[:15])
+        self.assertAlmostEqual(70.46, rsi.value, places=1)
+
+    def test_atr(self):
+        atr = ATR(2).seed([candle(0, 10, 11, 9), candle(1, 10, 12, 10)])
+        self.assertAlmostEqual(2.0, atr.value)
+        self.assertAlmostEqual(2.5, atr.update(candle(2, 13, 13, 12)))
+
+    def test_same_timestamp_replaces_candle(self):
+        for indicator in (SMA(5), EMA(5), RSI(5), BollingerBands(5), ATR(5)):
+            expected = type(indicator)(5).seed(CANDLES).value
+            indicator.seed(CANDLES[:-1])
+            indicator.update(candle(len(CANDLES) - 1, 50.0))
+            self.assertValueEqual(expected, indicator.update(CANDLES[-1]), type(indicator).__name__)
+
+    def test_seed_from_columns(self):
+        columns = Candles.from_result(CANDLES)
+        for indicator in (SMA(5), EMA(5), RSI(5), BollingerBands(5), ATR(5)):
+            self.assertValueEqual(type(indicator)(5).seed(CANDLES).value, indicator.seed(columns).value)
+
+
+if __name__ == '__main__':
+    unittest.main()
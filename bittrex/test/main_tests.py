@@ -0,0 +1,103 @@
+import unittest
+import csv
+import json
+import os
+import tempfile
+from bittrex.__main__ import dump, load_progress, fetch_markets, main, JsonLinesOutput, CsvOutput, \
+    ColumnarOutput, SCHEMAS, HISTORY, Stats
+from bittrex.archive import scan
+from bittrex.bittrex import API_V1_1
+
+
+def history_dispatch(request_url, apisign):
+    if 'getmarkets' in request_url:
+        return {'success': True, 'message': '', 'result': [
+            {'MarketName': 'BTC-LTC', 'BaseCurrency': 'BTC', 'IsActive': True},
+            {'MarketName': 'ETH-LTC', 'BaseCurrency': 'ETH', 'IsActive': True},
+            {'MarketName': 'BTC-ETH', 'BaseCurrency': 'BTC', 'IsActive': True},
+            {'MarketName': 'BTC-DEAD', 'BaseCurrency': 'BTC', 'IsActive': False}]}
+    if 'BTC-BAD' in request_url:
+        return {'success': False, 'message': 'INVALID_MARKET', 'result': None}
+    return {'success': True, 'message': '', 'result': [
+        {'Id': 2, 'TimeStamp': '2017-11-03T03:18:01', 'Quantity': 1.0, 'Price': 0.5, 'Total': 0.5,
+         'FillType': 'FILL', 'OrderType': 'BUY'},
+        {'Id': 1, 'TimeStamp': '2017-11-03T03:18:00', 'Quantity': 2.0, 'Price': 0.4, 'Total': 0.8,
+         'FillType': 'FILL', 'OrderType': 'SELL'}]}
+
+
+def fetch_history(bittrex, market):
+    return bittrex.get_market_history(market)
+
+
+class TestDump(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.client_options = {'api_key': None, 'api_secret': None, 'api_version': API_V1_1,
+                               'dispatch': history_dispatch, 'calls_per_second': 1e6}
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_fetch_markets(self):
+        from bittrex.bittrex import Bittrex
+        bittrex = Bittrex(**self.client_options)
+        self.assertEqual(['BTC-ETH', 'BTC-LTC'], fetch_markets(bittrex, 'btc'))
+        self.assertEqual(['BTC-ETH', 'BTC-LTC', 'ETH-LTC'], fetch_markets(bittrex))
+
+    def test_ndjson_with_progress(self):
+        output = JsonLinesOutput(self.path('out.ndjson'), HISTORY, SCHEMAS[HISTORY], False)
+        stats = Stats()
+        failed = dump(['BTC-LTC', 'BTC-BAD', 'BTC-ETH'], fetch_history, output, self.client_options, workers=2,
+                      progress=self.path('progress'), stats=stats)
+        output.close()
+        self.assertEqual(['BTC-BAD'], failed)
+        self.assertEqual({'BTC-LTC', 'BTC-ETH'}, load_progress(self.path('progress')))
+        self.assertEqual((4, 3, 1), (stats.rows, len(stats.latencies), stats.errors))
+        with open(self.path('out.ndjson')) as infile:
+            rows = [json.loads(line) for line in infile]
+        self.assertEqual(4, len(rows))
+        self.assertEqual({'BTC-LTC', 'BTC-ETH'}, set(row['MarketName'] for row in rows))
+
+    def test_csv(self):
+        output = CsvOutput(self.path('out.csv'), HISTORY, SCHEMAS[HISTORY], False)
+        dump(['BTC-LTC'], fetch_history, output, self.client_options)
+        output.close()
+        with open(self.path('out.csv')) as infile:
+            rows = list(csv.DictReader(infile))
+        self.assertEqual(['2', '1'], [row['Id'] for row in rows])
+        self.assertEqual('BTC-LTC', rows[0]['MarketName'])
+
+    def test_columnar(self):
+        output = ColumnarOutput(self.path('archive'), HISTORY, SCHEMAS[HISTORY], False)
+        dump(['BTC-LTC'], fetch_history, output, self.client_options)
+        output.close()
+        rows = list(scan(self.path('archive'), HISTORY))
+        self.assertEqual([2, 1], [row['Id'] for row in rows])
+        self.assertEqual(1509679081.0, rows[0]['TimeStamp'])
+
+    def test_columnar_resume_after_crash(self):
+        output = ColumnarOutput(self.path('archive'), HISTORY, SCHEMAS[HISTORY], False)
+        dump(['BTC-LTC'], fetch_history, output, self.client_options, progress=self.path('progress'))
+        # no close: the process died after BTC-LTC was recorded as done
+        self.assertEqual({'BTC-LTC'}, load_progress(self.path('progress')))
+        self.assertEqual([2, 1], [row['Id'] for row in scan(self.path('archive'), HISTORY)])
+
+        resumed = ColumnarOutput(self.path('archive'), HISTORY, SCHEMAS[HISTORY], True)
+        markets = [market for market in ['BTC-LTC', 'BTC-ETH'] if market not in load_progress(self.path('progress'))]
+        dump(markets, fetch_history, resumed, self.client_options, progress=self.path('progress'))
+        resumed.close()
+        rows = list(scan(self.path('archive'), HISTORY))
+        self.assertEqual(['BTC-ETH', 'BTC-ETH', 'BTC-LTC', 'BTC-LTC'], sorted(row['MarketName'] for row in rows))
+
+    def test_main_skips_finished_markets(self):
+        with open(self.path('progress'), 'w') as outfile:
+            outfile.write('BTC-LTC\n')
+        status = main(['history', '--markets', 'BTC-LTC', '--progress', self.path('progress'),
+                       '-o', self.path('out.ndjson')])
+        self.assertEqual(0, status)
+        self.assertEqual(0, os.path.getsize(self.path('out.ndjson')))
+
+
+if __name__ == '__main__':
+    unittest.main()
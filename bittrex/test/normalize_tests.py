@@ -0,0 +1,69 @@
+import unittest
+from bittrex.bittrex import API_V1_1, API_V2_0, BUY_ORDERBOOK, SELL_ORDERBOOK
+from bittrex.normalize import NormalizingBittrex, normalize
+
+SUMMARY = {'MarketName': 'BTC-LTC', 'High': 0.02, 'Low': 0.01, 'Volume': 100.0, 'Last': 0.015,
+           'BaseVolume': 1.5, 'TimeStamp': '2017-11-03T03:18:00', 'Bid': 0.0149, 'Ask': 0.0151}
+ORDERBOOK = {'buy': [{'Quantity': 1.0, 'Rate': 0.0149}], 'sell': [{'Quantity': 2.0, 'Rate': 0.0151}]}
+BALANCE = {'Currency': 'BTC', 'Balance': 1.0, 'Available': 1.0, 'Pending': 0.0, 'CryptoAddress': None}
+
+V2_RESULTS = {
+    '/pub/Markets/GetMarketSummaries': [{'Market': {'MarketName': 'BTC-LTC'}, 'Summary': SUMMARY}],
+    '/pub/Market/GetMarketSummary': SUMMARY,
+    '/pub/Market/GetMarketOrderBook': ORDERBOOK,
+    '/key/balance/getbalances': [{'Currency': {'Currency': 'BTC'}, 'Balance': BALANCE}],
+}
+
+V1_RESULTS = {
+    '/public/getmarketsummaries': [SUMMARY],
+    '/public/getmarketsummary': [SUMMARY],
+    '/public/getticker': {'Bid': 0.0149, 'Ask': 0.0151, 'Last': 0.015},
+    '/account/getbalances': [BALANCE],
+}
+
+
+def fake_dispatch(results):
+    def dispatch(request_url, apisign):
+        path = request_url.split('?')[0].split('/api/')[1][4:]
+        return {'success': True, 'message': '', 'result': results[path]}
+
+    return dispatch
+
+
+class TestNormalize(unittest.TestCase):
+
+    def client(self, api_version):
+        results = V2_RESULTS if api_version == API_V2_0 else V1_RESULTS
+        return NormalizingBittrex(None, None, calls_per_second=1e9, dispatch=fake_dispatch(results),
+                                  api_version=api_version)
+
+    def test_versions_agree(self):
+        v1, v2 = self.client(API_V1_1), self.client(API_V2_0)
+        for method in ('get_market_summaries', 'get_balances'):
+            self.assertEqual(getattr(v1, method)(), getattr(v2, method)(), method)
+        for method in ('get_marketsummary', 'get_ticker'):
+            self.assertEqual(getattr(v1, method)('BTC-LTC'), getattr(v2, method)('BTC-LTC'), method)
+
+    def test_orderbook_side(self):
+        v2 = self.client(API_V2_0)
+        self.assertEqual(ORDERBOOK['buy'], v2.get_orderbook('BTC-LTC', BUY_ORDERBOOK)['result'])
+        self.assertEqual(ORDERBOOK['sell'], v2.get_orderbook('BTC-LTC', SELL_ORDERBOOK)['result'])
+        self.assertEqual(ORDERBOOK, v2.get_orderbook('BTC-LTC')['result'])
+
+    def test_no_copies(self):
+        actual = self.client(API_V2_0).get_market_summaries()['result']
+        self.assertIs(SUMMARY, actual[0])
+
+    def test_v1_untouched(self):
+        response = {'success': True, 'message': '', 'result': [SUMMARY]}
+        self.assertIs(response, normalize('get_market_summaries', API_V1_1, response))
+
+    def test_invalid_and_failed_responses(self):
+        actual = normalize('get_market_summaries', API_V2_0, {'success': True, 'message': '', 'result': [{}]})
+        self.assertEqual({'success': False, 'message': 'INVALID_RESPONSE', 'result': None}, actual)
+        failed = {'success': False, 'message': 'NO_API_RESPONSE', 'result': None}
+        self.assertIs(failed, normalize('get_market_summaries', API_V2_0, failed))
+
+
+if __name__ == '__main__':
+    unittest.main()
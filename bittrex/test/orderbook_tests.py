@@ -0,0 +1,45 @@
+import unittest
+from bittrex.orderbook import OrderBook, estimate_markets, rank_by_depth
+
+ORDERBOOK = {
+    'buy': [{'Quantity': 10.0, 'Rate': 0.95}, {'Quantity': 5.0, 'Rate': 0.99}],
+    'sell': [{'Quantity': 5.0, 'Rate': 1.02}, {'Quantity': 5.0, 'Rate': 1.00}],
+}
+
+
+class TestOrderBook(unittest.TestCase):
+
+    def setUp(self):
+        self.book = OrderBook(ORDERBOOK, 'BTC-LTC')
+
+    def test_sides_are_sorted_best_first(self):
+        self.assertEqual([0.99, 0.95], list(self.book.bids.rates))
+        self.assertEqual([1.00, 1.02], list(self.book.asks.rates))
+        self.assertAlmostEqual(0.995, self.book.mid)
+
+    def test_estimate_buy(self):
+        small, large, too_large = self.book.estimate_buy([2.0, 8.0, 20.0])
+        self.assertAlmostEqual(1.0, small['price'])
+        self.assertEqual(0.0, small['slippage'])
+        self.assertAlmostEqual((5 * 1.00 + 3 * 1.02) / 8, large['price'])
+        self.assertAlmostEqual(0.02, large['impact'])
+        self.assertEqual(10.0, too_large['filled'])
+
+    def test_estimate_sell(self):
+        estimate = self.book.estimate_sell([10.0])[0]
+        self.assertAlmostEqual((5 * 0.99 + 5 * 0.95) / 10, estimate['price'])
+        self.assertAlmostEqual((0.99 - 0.97) / 0.99, estimate['slippage'])
+
+    def test_depth_within(self):
+        self.assertEqual([(1.0, 4.95, 5.0), (5.0, 14.45, 10.1)],
+                         [(p, round(b, 6), round(a, 6)) for p, b, a in self.book.depth_within([1.0, 5.0])])
+
+    def test_many_markets(self):
+        thin = {'buy': [{'Quantity': 1.0, 'Rate': 0.99}], 'sell': [{'Quantity': 1.0, 'Rate': 1.0}]}
+        self.assertEqual(['BTC-LTC', 'BTC-ETH'], [m for m, _ in rank_by_depth({'BTC-ETH': thin, 'BTC-LTC': ORDERBOOK})])
+        estimates = estimate_markets({'BTC-ETH': thin, 'BTC-LTC': self.book}, [1.0], buy=False)
+        self.assertAlmostEqual(0.99, estimates['BTC-ETH'][0]['price'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+from bittrex.bittrex import Bittrex, API_V2_0, ORDERTYPE_LIMIT, ORDERTYPE_MARKET, TIMEINEFFECT_FILL_OR_KILL, \
+    TIMEINEFFECT_IMMEDIATE_OR_CANCEL, TIMEINEFFECT_GOOD_TIL_CANCELLED, CONDITIONTYPE_LESS_THAN
+from bittrex.paper import PaperExchange
+
+ORDERBOOK = {
+    'buy': [{'Quantity': 10.0, 'Rate': 0.0099}, {'Quantity': 10.0, 'Rate': 0.0098}],
+    'sell': [{'Quantity': 5.0, 'Rate': 0.0101}, {'Quantity': 5.0, 'Rate': 0.0102}],
+}
+
+
+class TestPaperExchange(unittest.TestCase):
+
+    def setUp(self):
+        self.exchange = PaperExchange(balances={'BTC': 1.0, 'LTC': 20.0}, commission=0.0)
+        self.exchange.load_orderbook('BTC-LTC', ORDERBOOK)
+        self.bittrex = Bittrex(None, None, calls_per_second=1e9, dispatch=self.exchange)
+        self.bittrex_v2 = Bittrex(None, None, calls_per_second=1e9, dispatch=self.exchange, api_version=API_V2_0)
+
+    def balance(self, currency):
+        return self.bittrex.get_balance(currency)['result']
+
+    def test_buy_limit_takes_recorded_liquidity(self):
+        actual = self.bittrex.buy_limit('BTC-LTC', 7, 0.0102)
+        self.assertTrue(actual['success'])
+        order = self.bittrex.get_order(actual['result']['uuid'])['result']
+        self.assertFalse(order['IsOpen'])
+        self.assertAlmostEqual(5 * 0.0101 + 2 * 0.0102, order['Price'])
+        self.assertAlmostEqual(27.0, self.balance('LTC')['Balance'])
+        self.assertAlmostEqual(1.0 - order['Price'], self.balance('BTC')['Balance'])
+
+    def test_resting_order_reserves_and_cancel_releases(self):
+        uuid = self.bittrex.buy_limit('BTC-LTC', 10, 0.01)['result']['uuid']
+        self.assertEqual([uuid], [o['OrderUuid'] for o in self.bittrex.get_open_orders('BTC-LTC')['result']])
+        self.assertAlmostEqual(0.9, self.balance('BTC')['Available'])
+
+        self.assertTrue(self.bittrex.cancel(uuid)['success'])
+        self.assertEqual([], self.bittrex.get_open_orders()['result'])
+        self.assertAlmostEqual(1.0, self.balance('BTC')['Available'])
+        self.assertFalse(self.bittrex.cancel(uuid)['success'])
+
+    def test_price_time_priority_between_simulated_orders(self):
+        first = self.bittrex.sell_limit('BTC-LTC', 1, 0.0100)['result']['uuid']
+        second = self.bittrex.sell_limit('BTC-LTC', 1, 0.0100)['result']['uuid']
+        self.bittrex.buy_limit('BTC-LTC', 1, 0.0100)
+        self.assertFalse(self.bittrex.get_order(first)['result']['IsOpen'])
+        self.assertTrue(self.bittrex.get_order(second)['result']['IsOpen'])
+
+    def test_recorded_trades_fill_resting_orders(self):
+        uuid = self.bittrex.buy_limit('BTC-LTC', 3, 0.0100)['result']['uuid']
+        self.exchange.load_market_history('BTC-LTC', [
+            {'Id': 1, 'TimeStamp': '2017-08-31T01:29:50', 'Price': 0.0100, 'Quantity': 2.0, 'OrderType': 'SELL'},
+            {'Id': 2, 'TimeStamp': '2017-08-31T01:29:51', 'Price': 0.0101, 'Quantity': 2.0, 'OrderType': 'SELL'},
+        ])
+        self.assertAlmostEqual(1.0, self.bittrex.get_order(uuid)['result']['QuantityRemaining'])
+
+    def test_recorded_trades_only_fill_the_opposite_side(self):
+        bid = self.bittrex.buy_limit('BTC-LTC', 3, 0.00995)['result']['uuid']
+        ask = self.bittrex.sell_limit('BTC-LTC', 3, 0.01005)['result']['uuid']
+        self.exchange.load_market_history('BTC-LTC', [
+            # a seller hit a bid above the resting ask, a buyer lifted an ask below the resting bid
+            {'Id': 1, 'TimeStamp': '2017-08-31T01:29:50', 'Price': 0.0101, 'Quantity': 1.0, 'OrderType': 'SELL'},
+            {'Id': 2, 'TimeStamp': '2017-08-31T01:29:51', 'Price': 0.0099, 'Quantity': 1.0, 'OrderType': 'BUY'},
+        ])
+        self.assertAlmostEqual(3.0, self.bittrex.get_order(bid)['result']['QuantityRemaining'])
+        self.assertAlmostEqual(3.0, self.bittrex.get_order(ask)['result']['QuantityRemaining'])
+        self.exchange.load_market_history('BTC-LTC', [
+            {'Id': 3, 'TimeStamp': '2017-08-31T01:29:52', 'Price': 0.0099, 'Quantity': 1.0, 'OrderType': 'SELL'},
+            {'Id': 4, 'TimeStamp': '2017-08-31T01:29:53', 'Price': 0.0101, 'Quantity': 2.0, 'OrderType': 'BUY'},
+        ])
+        self.assertAlmostEqual(2.0, self.bittrex.get_order(bid)['result']['QuantityRemaining'])
+        self.assertAlmostEqual(1.0, self.bittrex.get_order(ask)['result']['QuantityRemaining'])
+
+    def test_time_in_effect(self):
+        ioc = self.bittrex_v2.trade_buy('BTC-LTC', ORDERTYPE_LIMIT, 8, 0.0101, TIMEINEFFECT_IMMEDIATE_OR_CANCEL)
+        order = self.bittrex.get_order(ioc['result']['OrderId'])['result']
+        self.assertFalse(order['IsOpen'])
+        self.assertAlmostEqual(3.0, order['QuantityRemaining'])
+
+        fok = self.bittrex_v2.trade_buy('BTC-LTC', ORDERTYPE_LIMIT, 8, 0.0102, TIMEINEFFECT_FILL_OR_KILL)
+        order = self.bittrex.get_order(fok['result']['OrderId'])['result']
+        self.assertFalse(order['IsOpen'])
+        self.assertAlmostEqual(8.0, order['QuantityRemaining'])
+
+        gtc = self.bittrex_v2.trade_buy('BTC-LTC', ORDERTYPE_LIMIT, 8, 0.0102, TIMEINEFFECT_GOOD_TIL_CANCELLED)
+        self.assertTrue(self.bittrex.get_order(gtc['result']['OrderId'])['result']['IsOpen'])
+
+    def test_market_order_and_insufficient_funds(self):
+        actual = self.bittrex_v2.trade_sell('BTC-LTC', ORDERTYPE_MARKET, 15)
+        order = self.bittrex.get_order(actual['result']['OrderId'])['result']
+        self.assertFalse(order['IsOpen'])
+        self.assertEqual('MARKET_SELL', order['Type'])
+        self.assertAlmostEqual(5.0, self.balance('LTC')['Balance'])
+        self.assertEqual('INSUFFICIENT_FUNDS', self.bittrex.sell_limit('BTC-LTC', 50, 0.01)['message'])
+        limit = self.bittrex.buy_limit('BTC-LTC', 1, 0.0101)['result']['uuid']
+        self.assertEqual('LIMIT_BUY', self.bittrex.get_order(limit)['result']['Type'])
+
+    def test_market_order_sweeps_levels_and_resting_orders_by_price(self):
+        resting = [self.bittrex.sell_limit('BTC-LTC', 1, rate)['result']['uuid'] for rate in (0.0103, 0.01015, 0.01012)]
+        actual = self.bittrex_v2.trade_buy('BTC-LTC', ORDERTYPE_MARKET, 7)
+        order = self.bittrex.get_order(actual['result']['OrderId'])['result']
+        self.assertEqual(0.0, order['QuantityRemaining'])
+        self.assertAlmostEqual(5 * 0.0101 + 0.01012 + 0.01015, order['Price'])
+        self.assertEqual([resting[0]], [o['OrderUuid'] for o in self.bittrex.get_open_orders('BTC-LTC')['result']])
+
+    def test_stop_loss(self):
+        actual = self.bittrex_v2.trade_sell('BTC-LTC', ORDERTYPE_LIMIT, 5, 0.0098, TIMEINEFFECT_GOOD_TIL_CANCELLED,
+                                            CONDITIONTYPE_LESS_THAN, 0.0099)
+        uuid = actual['result']['OrderId']
+        self.exchange.trade('BTC-LTC', 0.0100, 1.0)
+        self.assertAlmostEqual(5.0, self.bittrex.get_order(uuid)['result']['QuantityRemaining'])
+        self.exchange.trade('BTC-LTC', 0.0099, 1.0)
+        self.assertFalse(self.bittrex.get_order(uuid)['result']['IsOpen'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import gc
+import json
+import unittest
+from bittrex.bittrex import Bittrex, API_V2_0
+from bittrex.profiling import ProfilingDispatch, footprint
+
+SUMMARIES = json.dumps({'success': True, 'message': '', 'result': [
+    {'MarketName': 'BTC-LTC', 'Last': 0.01}, {'MarketName': 'BTC-ETH', 'Last': 0.1}]}).encode()
+TICKER = json.dumps({'success': True, 'message': '', 'result': {'Bid': 1.0, 'Ask': 1.1, 'Last': 1.05}}).encode()
+
+
+class FakeFetch(object):
+
+    def __call__(self, request_url, apisign):
+        if 'getmarketsummaries' in request_url:
+            return SUMMARIES
+        if 'getticker' in request_url:
+            return TICKER
+        raise IOError('connection refused')
+
+
+class TestProfilingDispatch(unittest.TestCase):
+
+    def setUp(self):
+        self.profiler = ProfilingDispatch(FakeFetch())
+        self.bittrex = Bittrex(None, None, calls_per_second=1e9, dispatch=self.profiler)
+
+    def test_counts_per_endpoint(self):
+        self.bittrex.get_market_summaries()
+        self.bittrex.get_market_summaries()
+        self.bittrex.get_ticker('BTC-LTC')
+        stats = self.profiler.stats
+        self.assertEqual(['/public/getmarketsummaries', '/public/getticker'], sorted(stats))
+        summaries = stats['/public/getmarketsummaries']
+        self.assertEqual(2, summaries['calls'])
+        self.assertEqual(2 * len(SUMMARIES), summaries['bytes'])
+        self.assertEqual(footprint(json.loads(SUMMARIES.decode()))[0], summaries['objects_per_response'])
+
+    def test_results_are_unchanged(self):
+        response = self.bittrex.get_market_summaries()
+        self.assertEqual(json.loads(SUMMARIES.decode()), response)
+        self.assertTrue(isinstance(response['result'], list))
+
+    def test_retained_results(self):
+        kept = self.bittrex.get_ticker('BTC-LTC')['result']
+        self.bittrex.get_ticker('BTC-LTC')
+        gc.collect()
+        retained = self.profiler.stats['/public/getticker']['retained']
+        self.assertEqual(footprint(kept)[0], retained)
+        del kept
+        gc.collect()
+        self.assertEqual(0, self.profiler.stats['/public/getticker']['retained'])
+        self.assertEqual(0, self.profiler.stats['/public/getticker']['retained_bytes'])
+
+    def test_retained_row(self):
+        kept = self.bittrex.get_market_summaries()['result'][1]
+        gc.collect()
+        stats = self.profiler.stats['/public/getmarketsummaries']
+        self.assertEqual(footprint(kept)[0], stats['retained'])
+        self.assertEqual(footprint(kept)[1], stats['retained_bytes'])
+        del kept
+        gc.collect()
+        self.assertEqual(0, self.profiler.stats['/public/getmarketsummaries']['retained'])
+
+    def test_errors(self):
+        bittrex = Bittrex(None, None, calls_per_second=1e9, dispatch=self.profiler, api_version=API_V2_0)
+        self.assertEqual('NO_API_RESPONSE', bittrex.get_currencies()['message'])
+        self.assertEqual(1, self.profiler.stats['/pub/Currencies/GetCurrencies']['errors'])
+
+    def test_traced_snapshot(self):
+        import tracemalloc
+
+        tracing = tracemalloc.is_tracing()
+        profiler = ProfilingDispatch(FakeFetch(), trace=True)
+        bittrex = Bittrex(None, None, calls_per_second=1e9, dispatch=profiler)
+        kept = [bittrex.get_market_summaries() for _ in range(100)]
+        snapshot = profiler.snapshot()
+        self.assertEqual(100, snapshot['endpoints']['/public/getmarketsummaries']['calls'])
+        self.assertTrue(snapshot['top'])
+        self.assertGreater(snapshot['traced'], 0)
+        self.assertEqual([snapshot], list(profiler.snapshots))
+        del kept
+        profiler.stop()
+        self.assertEqual(tracing, tracemalloc.is_tracing())
+
+    def test_footprint(self):
+        self.assertEqual(4, footprint({'a': [1]})[0])  # dict, key, list, int
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import threading
+import time
+from bittrex.bittrex import Bittrex, request_priority, PROTECTION_PUB, PROTECTION_PRV, PRIORITY_ORDER, \
+    PRIORITY_ORDER_STATUS, PRIORITY_ACCOUNT, PRIORITY_MARKET_DATA
+from bittrex.ratelimit import TokenBucket, SharedTokenBucket, PriorityLimiter
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_wait_spaces_calls(self):
+        for bucket in (TokenBucket(2, clock=self.clock, sleep=self.clock.sleep),
+                       SharedTokenBucket(2, clock=self.clock, sleep=self.clock.sleep)):
+            start = self.clock.now
+            for _ in range(5):
+                bucket.wait()
+            self.assertAlmostEqual(2.0, self.clock.now - start)
+
+    def test_burst_and_try_acquire(self):
+        bucket = TokenBucket(1, burst=3, clock=self.clock, sleep=self.clock.sleep)
+        self.assertEqual([True, True, True, False], [bucket.try_acquire() for _ in range(4)])
+        self.clock.now += 1
+        self.assertTrue(bucket.try_acquire())
+
+    def test_clients_share_a_limiter(self):
+        bucket = TokenBucket(1, clock=self.clock, sleep=self.clock.sleep)
+        dispatch = lambda request_url, apisign: {'success': True, 'message': '', 'result': []}
+        clients = [Bittrex(None, None, dispatch=dispatch, rate_limiter=bucket) for _ in range(2)]
+        for client in clients * 2:
+            client.get_markets()
+        self.assertAlmostEqual(3.0, self.clock.now - 1000.0)
+
+
+class TestPriorityLimiter(unittest.TestCase):
+
+    def test_request_priority(self):
+        self.assertEqual(PRIORITY_ORDER, request_priority(PROTECTION_PRV, '/market/cancel'))
+        self.assertEqual(PRIORITY_ORDER, request_priority(PROTECTION_PRV, '/key/market/tradesell'))
+        self.assertEqual(PRIORITY_ORDER_STATUS, request_priority(PROTECTION_PRV, '/account/getorder'))
+        self.assertEqual(PRIORITY_ACCOUNT, request_priority(PROTECTION_PRV, '/account/getbalances'))
+        self.assertEqual(PRIORITY_MARKET_DATA, request_priority(PROTECTION_PUB, '/public/getorderbook'))
+
+    def test_orders_go_first(self):
+        limiter = PriorityLimiter(10)
+        self.assertTrue(limiter.try_acquire())
+        served = []
+
+        def call(priority):
+            limiter.wait(priority)
+            served.append(priority)
+
+        threads = []
+        for priority in (PRIORITY_MARKET_DATA, PRIORITY_ACCOUNT, PRIORITY_ORDER):
+            threads.append(threading.Thread(target=call, args=(priority,)))
+            threads[-1].start()
+            time.sleep(0.01)
+        for thread in threads:
+            thread.join()
+        self.assertEqual([PRIORITY_ORDER, PRIORITY_ACCOUNT, PRIORITY_MARKET_DATA], served)
+
+    def test_stale_calls_are_dropped(self):
+        limiter = PriorityLimiter(2, deadlines={PRIORITY_MARKET_DATA: 0.05})
+        calls = []
+        dispatch = lambda request_url, apisign: calls.append(request_url) or {'success': True, 'message': '',
+                                                                             'result': []}
+        bittrex = Bittrex(None, None, dispatch=dispatch, rate_limiter=limiter)
+        self.assertTrue(bittrex.get_markets()['success'])
+        self.assertEqual({'success': False, 'message': 'REQUEST_DROPPED', 'result': None}, bittrex.get_markets())
+        self.assertEqual(1, len(calls))
+        self.assertEqual(1, limiter.dropped[PRIORITY_MARKET_DATA])
+        self.assertTrue(bittrex.get_order('uuid')['success'])
+
+    def test_dropped_call_leaves_the_queue(self):
+        limiter = PriorityLimiter(20, deadlines={PRIORITY_MARKET_DATA: 0.01})
+        self.assertTrue(limiter.wait(PRIORITY_MARKET_DATA))
+        self.assertFalse(limiter.wait(PRIORITY_MARKET_DATA))
+        self.assertEqual([], limiter._waiting)
+        time.sleep(0.06)
+        self.assertTrue(limiter.try_acquire())
+
+    def test_identical_public_calls_are_coalesced(self):
+        release, calls = threading.Event(), []
+
+        def dispatch(request_url, apisign):
+            calls.append(request_url)
+            release.wait()
+            return {'success': True, 'message': '', 'result': {'Last': 1.0}}
+
+        bittrex = Bittrex(None, None, calls_per_second=1e9, dispatch=dispatch, coalesce=True)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(bittrex.get_ticker('BTC-LTC'))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, len(calls))
+        self.assertEqual([{'Last': 1.0}] * 3, [result['result'] for result in results])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from bittrex.scheduler import PollScheduler
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def summary(market, volume, high=1.1, low=0.9, last=1.0):
+    return {'MarketName': market, 'High': high, 'Low': low, 'Last': last, 'BaseVolume': volume}
+
+
+class FakeBittrex(object):
+    call_rate = 1.0
+
+    def __init__(self, summaries):
+        self.summaries = summaries
+        self.calls = []
+
+    def get_market_summaries(self):
+        self.calls.append('summaries')
+        return {'success': True, 'message': '', 'result': self.summaries}
+
+    def get_marketsummary(self, market):
+        self.calls.append(market)
+        return {'success': True, 'message': '', 'result': [summary(market, 0.0)]}
+
+
+class TestPollScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bittrex = FakeBittrex([summary('BTC-LTC', 900.0), summary('BTC-ETH', 100.0, high=1.0, low=1.0)])
+        self.scheduler = PollScheduler(self.bittrex, budget=1.0, clock=self.clock, sleep=self.clock.sleep)
+        self.updates = []
+        for market in ('BTC-LTC', 'BTC-ETH'):
+            self.scheduler.register(market, lambda market, result: self.updates.append(market))
+
+    def test_rerank_delivers_summaries(self):
+        self.scheduler.step()
+        self.assertEqual(['summaries'], self.bittrex.calls)
+        self.assertEqual(['BTC-LTC', 'BTC-ETH'], self.updates)
+
+    def test_active_markets_are_polled_more(self):
+        self.scheduler.run(until=self.clock.now + 290)
+        polls = [call for call in self.bittrex.calls if call != 'summaries']
+        self.assertGreater(polls.count('BTC-LTC'), 10 * polls.count('BTC-ETH'))
+        self.assertLessEqual(len(self.bittrex.calls), 290 + 2)
+
+    def test_intervals_respect_bounds(self):
+        self.scheduler.step()
+        self.assertGreaterEqual(self.scheduler.intervals['BTC-LTC'], 1.0)
+        self.assertLessEqual(self.scheduler.intervals['BTC-ETH'], 300.0)
+
+    def test_unregister(self):
+        self.scheduler.step()
+        for market in ('BTC-LTC', 'BTC-ETH'):
+            self.scheduler.unregister(market, self.scheduler.callbacks[market][0])
+        self.scheduler.run()
+        self.assertEqual(['summaries'], self.bittrex.calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
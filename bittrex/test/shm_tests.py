@@ -0,0 +1,54 @@
+import unittest
+import os
+import tempfile
+from bittrex.shm import ShmTable, Feeder, _SEQ
+
+
+class FakeBittrex(object):
+    api_version = 'v1.1'
+
+    def get_ticker(self, market):
+        return {'success': True, 'message': '', 'result': {'Bid': 0.99, 'Ask': 1.01, 'Last': 1.0}}
+
+    def get_orderbook(self, market):
+        return {'success': True, 'message': '', 'result': {
+            'buy': [{'Quantity': 1.0, 'Rate': 0.98}, {'Quantity': 2.0, 'Rate': 0.99}],
+            'sell': [{'Quantity': 3.0, 'Rate': 1.01}]}}
+
+
+class TestShmTable(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'table')
+
+    def test_publish_and_read(self):
+        writer = ShmTable.create(self.path, ['BTC-LTC', 'BTC-ETH'], depth=2)
+        reader = ShmTable.open(self.path)
+        self.assertEqual(['BTC-LTC', 'BTC-ETH'], reader.markets)
+        self.assertIsNone(reader.read('BTC-ETH'))
+
+        writer.publish('BTC-ETH', 0.5, 0.6, 0.55, [(0.5, 1.0), (0.4, 2.0), (0.3, 3.0)], [(0.6, 4.0)], timestamp=1.0)
+        self.assertEqual({'TimeStamp': 1.0, 'Bid': 0.5, 'Ask': 0.6, 'Last': 0.55,
+                          'buy': [(0.5, 1.0), (0.4, 2.0)], 'sell': [(0.6, 4.0)]}, reader.read('BTC-ETH'))
+        self.assertEqual(2, reader.version('BTC-ETH'))
+        self.assertIsNone(reader.read('BTC-LTC'))
+
+    def test_writer_died_mid_write(self):
+        writer = ShmTable.create(self.path, ['BTC-LTC'], depth=2)
+        writer.publish('BTC-LTC', 0.5, 0.6, 0.55)
+        _SEQ.pack_into(writer.mm, writer.offsets['BTC-LTC'], 3)  # odd: the update never completed
+        with self.assertRaises(Exception) as raised:
+            ShmTable.open(self.path).read('BTC-LTC', timeout=0.05)
+        self.assertIn('still being written', str(raised.exception))
+
+    def test_feeder(self):
+        feeder = Feeder(FakeBittrex(), self.path, ['BTC-LTC'], depth=5)
+        feeder.publish_once()
+        actual = ShmTable.open(self.path).read('BTC-LTC')
+        self.assertEqual(1.0, actual['Last'])
+        self.assertEqual([(0.99, 2.0), (0.98, 1.0)], actual['buy'])
+        self.assertEqual([(1.01, 3.0)], actual['sell'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+"""
+   Soak test of a profiled client against a local mock server.
+
+   A threaded http.server answers market summaries, order books and market
+   histories of varying sizes.  A client loops over those endpoints through
+   ProfilingDispatch for the given duration, printing a snapshot every
+   interval.  Growth of traced memory after the warm-up, or results still
+   retained at the end, make the script exit with status 1 so it can guard
+   against regressions ::
+
+       python -m bittrex.test.soak --duration 14400 --interval 300
+       python -m bittrex.test.soak --duration 60 --interval 10 --leak   # keeps every result, must fail
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import threading
+import time
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlparse
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlparse
+
+from bittrex.bittrex import Bittrex, BOTH_ORDERBOOK
+from bittrex.profiling import ProfilingDispatch, using_raw_session
+
+MARKETS = ['BTC-C{}'.format(i) for i in range(250)]
+
+
+def _summaries():
+    return [{'MarketName': market, 'High': 1.1, 'Low': 0.9, 'Volume': random.random() * 1e4,
+             'Last': random.random(), 'BaseVolume': random.random() * 100, 'TimeStamp': '2018-01-01T00:00:00.123',
+             'Bid': 0.99, 'Ask': 1.01, 'OpenBuyOrders': 10, 'OpenSellOrders': 12, 'PrevDay': 1.0,
+             'Created': '2017-01-01T00:00:00'} for market in MARKETS]
+
+
+def _orderbook():
+    depth = random.randint(10, 500)
+    return {
+        'buy': [{'Quantity': random.random() * 10, 'Rate': 1.0 - i * 1e-4} for i in range(depth)],
+        'sell': [{'Quantity': random.random() * 10, 'Rate': 1.0 + i * 1e-4} for i in range(depth)],
+    }
+
+
+def _history():
+    return [{'Id': i, 'TimeStamp': '2018-01-01T00:00:00.5', 'Quantity': random.random(), 'Price': 1.0,
+             'Total': random.random(), 'FillType': 'FILL', 'OrderType': random.choice(('BUY', 'SELL'))}
+            for i in range(random.randint(1, 200))]
+
+
+RESPONSES = {
+    'getmarketsummaries': _summaries,
+    'getorderbook': _orderbook,
+    'getmarkethistory': _history,
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        build = RESPONSES.get(url.path.rsplit('/', 1)[1])
+        if build is None:
+            body = {'success': False, 'message': 'UNKNOWN_ENDPOINT', 'result': None}
+        else:
+            body = {'success': True, 'message': '', 'result': build()}
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def serve():
+    server = _Server(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, 'http://127.0.0.1:{}'.format(server.server_address[1])
+
+
+def redirect(fetch, base_url):
+    def redirected(request_url, apisign):
+        return fetch(request_url.replace('https://bittrex.com', base_url), apisign)
+
+    return redirected
+
+
+def report(snapshot):
+    print('{:>8.0f}s  rss {:>7.1f} MB  traced {:>7.1f} MB'.format(
+        snapshot['uptime'], (snapshot['rss'] or 0) / 1e6, snapshot.get('traced', 0) / 1e6))
+    for endpoint, stats in sorted(snapshot['endpoints'].items()):
+        print('    {:<28} {:>8} calls {:>9.0f} objects/response {:>8} retained {:>10} retained bytes'.format(
+            endpoint, stats['calls'], stats['objects_per_response'], stats['retained'], stats['retained_bytes']))
+    for site, size_diff, count_diff in snapshot.get('top', [])[:3]:
+        print('    {:+10d} B {:+7d} blocks  {}'.format(size_diff, count_diff, site))
+    sys.stdout.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bittrex.test.soak', description='Client memory soak test')
+    parser.add_argument('--duration', type=float, default=600.0, help='seconds')
+    parser.add_argument('--interval', type=float, default=60.0, help='seconds between snapshots')
+    parser.add_argument('--warmup', type=float, default=None,
+                        help='seconds before the baseline, one interval by default')
+    parser.add_argument('--calls-per-second', type=float, default=50.0)
+    parser.add_argument('--max-growth', type=float, default=5.0, help='traced MB allowed to grow after the warm-up')
+    parser.add_argument('--leak', action='store_true', help='keep every result, to check that leaks are caught')
+    args = parser.parse_args(argv)
+
+    server, url = serve()
+    profiler = ProfilingDispatch(redirect(using_raw_session(), url), interval=args.interval, trace=True,
+                                 on_snapshot=report)
+    bittrex = Bittrex(None, None, calls_per_second=args.calls_per_second, dispatch=profiler)
+    calls = [
+        lambda: bittrex.get_market_summaries(),
+        lambda: bittrex.get_orderbook(random.choice(MARKETS), BOTH_ORDERBOOK),
+        lambda: bittrex.get_market_history(random.choice(MARKETS)),
+    ]
+    kept = []
+    warmup = args.interval if args.warmup is None else args.warmup
+    baseline = None
+    result = None
+    started = time.time()
+    profiler.start()
+    try:
+        while time.time() - started < args.duration:
+            result = random.choice(calls)()['result']
+            if args.leak:
+                kept.append(result)
+            if baseline is None and time.time() - started >= warmup:
+                gc.collect()
+                baseline = profiler.snapshot()
+    finally:
+        profiler.stop()
+        server.shutdown()
+
+    del result
+    gc.collect()
+    final = profiler.snapshot()
+    report(final)
+    if baseline is None:
+        print('duration shorter than the warm-up, no baseline')
+        return 0
+    growth = (final['traced'] - baseline['traced']) / 1e6
+    retained = sum(stats['retained'] for stats in final['endpoints'].values())
+    print('traced growth after warm-up {:.1f} MB, {} objects retained'.format(growth, retained))
+    if growth > args.max_growth or retained:
+        print('FAILED')
+        return 1
+    print('OK')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import unittest
+try:
+    from urlparse import urlparse, parse_qs
+except ImportError:
+    from urllib.parse import urlparse, parse_qs
+from bittrex.bittrex import Bittrex, API_V2_0
+from bittrex.watcher import TransferWatcher, NEW, UPDATED, PAUSED, RESUMED, withdrawal_pending
+
+
+def withdrawal(uuid, currency, tx_id=None, pending=True):
+    return {'PaymentUuid': uuid, 'Currency': currency, 'Amount': 1.0, 'Opened': '2018-01-01T00:00:00',
+            'Authorized': True, 'PendingPayment': pending, 'TxId': tx_id, 'Canceled': False,
+            'InvalidAddress': False}
+
+
+def deposit(id, currency, confirmations):
+    return {'Id': id, 'Currency': currency, 'Amount': 1.0, 'Confirmations': confirmations,
+            'LastUpdated': '2018-01-01T00:00:00'}
+
+
+class FakeTransfers(object):
+    """
+    Dispatch answering the account transfer endpoints from lists
+    """
+
+    def __init__(self):
+        self.deposits = []
+        self.withdrawals = []
+        self.pending_deposits = []
+        self.pending_withdrawals = []
+        self.health = []
+        self.calls = []
+
+    def __call__(self, request_url, apisign):
+        url = urlparse(request_url)
+        endpoint = url.path.rsplit('/', 1)[1].lower()
+        query = parse_qs(url.query)
+        currency = (query.get('currency') or query.get('currencyname') or [None])[0]
+        self.calls.append((endpoint, currency))
+        records = {
+            'getdeposithistory': self.deposits,
+            'getwithdrawalhistory': self.withdrawals,
+            'getpendingdeposits': self.pending_deposits,
+            'getpendingwithdrawals': self.pending_withdrawals,
+            'getwallethealth': self.health,
+        }[endpoint]
+        if currency:
+            records = [record for record in records if record['Currency'] == currency]
+        return {'success': True, 'message': '', 'result': [dict(record) for record in records]}
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTransferWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.exchange = FakeTransfers()
+        self.clock = Clock()
+        self.events = []
+
+    def watcher(self, api_version='v1.1', **options):
+        bittrex = Bittrex(None, None, calls_per_second=1e9, dispatch=self.exchange, api_version=api_version)
+        return TransferWatcher(bittrex, on_event=self.events.append, fast_interval=10, sweep_interval=300,
+                               health_interval=300, clock=self.clock, **options)
+
+    def tick(self, watcher, seconds):
+        self.clock.now += seconds
+        return watcher.poll()
+
+    def test_first_sweep_only_records(self):
+        self.exchange.withdrawals = [withdrawal('w1', 'BTC', tx_id='tx', pending=False)]
+        watcher = self.watcher()
+        self.assertEqual([], watcher.poll())
+        self.assertEqual({}, watcher.pending)
+        self.assertEqual([('getdeposithistory', None), ('getwithdrawalhistory', None)], self.exchange.calls)
+
+    def test_idle_currencies_wait_for_the_sweep(self):
+        watcher = self.watcher()
+        watcher.poll()
+        for _ in range(29):
+            self.tick(watcher, 10)
+        self.assertEqual(2, len(self.exchange.calls))
+        self.tick(watcher, 10)
+        self.assertEqual(4, len(self.exchange.calls))
+
+    def test_pending_withdrawal_is_polled_fast(self):
+        watcher = self.watcher()
+        watcher.poll()
+        self.exchange.withdrawals = [withdrawal('w1', 'BTC')]
+        events = self.tick(watcher, 300)
+        self.assertEqual([('withdrawal', NEW, 'BTC')], [(e['type'], e['change'], e['currency']) for e in events])
+        self.assertEqual(['BTC'], [currency for _, currency in watcher.pending])
+
+        del self.exchange.calls[:]
+        self.assertEqual([], self.tick(watcher, 10))
+        self.assertEqual([('getwithdrawalhistory', 'BTC')], self.exchange.calls)
+
+        self.exchange.withdrawals = [withdrawal('w1', 'BTC', tx_id='tx', pending=False)]
+        events = self.tick(watcher, 10)
+        self.assertEqual([UPDATED], [e['change'] for e in events])
+        self.assertEqual('tx', events[0]['record']['TxId'])
+        self.assertEqual({}, watcher.pending)
+        self.assertEqual(2, len(self.events))
+
+    def test_v2_pending_deposits(self):
+        watcher = self.watcher(api_version=API_V2_0)
+        watcher.poll()
+        self.exchange.pending_deposits = [deposit(7, 'LTC', 1)]
+        self.tick(watcher, 300)
+        self.assertIn(('deposits', 'LTC'), watcher.pending)
+
+        self.exchange.pending_deposits = [deposit(7, 'LTC', 2)]
+        events = self.tick(watcher, 10)
+        self.assertEqual([(UPDATED, 2)], [(e['change'], e['record']['Confirmations']) for e in events])
+
+        self.exchange.pending_deposits = []
+        self.exchange.deposits = [deposit(7, 'LTC', 6)]
+        events = self.tick(watcher, 10)
+        self.assertEqual([(UPDATED, 6)], [(e['change'], e['record']['Confirmations']) for e in events])
+        self.assertEqual({}, watcher.pending)
+
+    def test_unhealthy_wallets_are_paused(self):
+        self.exchange.health = [{'Health': {'Currency': 'BTC', 'IsActive': False}}]
+        watcher = self.watcher(api_version=API_V2_0)
+        events = watcher.poll()
+        self.assertEqual([PAUSED], [e['change'] for e in events])
+        self.exchange.pending_withdrawals = [withdrawal('w1', 'BTC')]
+        self.tick(watcher, 300)
+        del self.exchange.calls[:]
+        self.tick(watcher, 10)
+        self.assertEqual([], self.exchange.calls)
+
+        self.exchange.health = [{'Health': {'Currency': 'BTC', 'IsActive': True}}]
+        events = self.tick(watcher, 300)
+        self.assertEqual([RESUMED], [e['change'] for e in events if e['type'] == 'health'])
+
+    def test_currency_filter(self):
+        watcher = self.watcher(currencies=['LTC'])
+        watcher.poll()
+        self.exchange.withdrawals = [withdrawal('w1', 'BTC'), withdrawal('w2', 'LTC')]
+        events = self.tick(watcher, 300)
+        self.assertEqual(['LTC'], [e['currency'] for e in events])
+        self.assertEqual([('withdrawals', 'LTC')], list(watcher.pending))
+
+    def test_failing_api_is_not_hammered(self):
+        bittrex = Bittrex(None, None, calls_per_second=1e9, api_version=API_V2_0,
+                          dispatch=lambda request_url, apisign: {'success': False, 'message': 'DOWN', 'result': None})
+        watcher = TransferWatcher(bittrex, fast_interval=10, sweep_interval=300, health_interval=300,
+                                  clock=self.clock)
+        watcher.poll()
+        self.assertEqual(2, watcher.calls)  # wallet health, deposit history
+        self.assertEqual(self.clock.now + 10, watcher.next_poll())
+        for _ in range(20):
+            self.tick(watcher, 0.1)
+        self.assertEqual(2, watcher.calls)
+        self.clock.now = watcher.next_poll()
+        watcher.poll()
+        self.assertEqual(3, watcher.calls)  # only the sweep is retried
+
+    def test_first_successful_sweep_only_records(self):
+        self.exchange.withdrawals = [withdrawal('w1', 'BTC', tx_id='tx', pending=False)]
+        failing = [True]
+
+        def dispatch(request_url, apisign):
+            if failing[0]:
+                return {'success': False, 'message': 'DOWN', 'result': None}
+            return self.exchange(request_url, apisign)
+
+        bittrex = Bittrex(None, None, calls_per_second=1e9, dispatch=dispatch)
+        watcher = TransferWatcher(bittrex, fast_interval=10, sweep_interval=300, clock=self.clock)
+        watcher.poll()
+        failing[0] = False
+        self.assertEqual([], self.tick(watcher, 10))
+
+    def test_withdrawal_pending(self):
+        self.assertTrue(withdrawal_pending(withdrawal('w', 'BTC')))
+        self.assertFalse(withdrawal_pending(withdrawal('w', 'BTC', tx_id='tx', pending=False)))
+        self.assertFalse(withdrawal_pending(dict(withdrawal('w', 'BTC'), Canceled=True)))
+
+
+if __name__ == '__main__':
+    unittest.main()
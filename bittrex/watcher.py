@@ -0,0 +1,267 @@
+"""
+   Deposit, withdrawal and wallet health watcher.
+
+   Polling the history and pending endpoints of every currency on a fixed
+   timer mostly returns nothing new.  TransferWatcher sweeps all currencies
+   at once on a slow cadence and polls a currency fast only while it has a
+   pending deposit or withdrawal.  Currencies whose wallet is reported
+   inactive by get_wallet_health (API v2.0) are paused until they recover.
+   Changes are emitted as events ::
+
+       watcher = TransferWatcher(my_bittrex, on_event=print).start()
+
+       {'type': 'withdrawal', 'change': 'updated', 'currency': 'BTC', 'record': {...}}
+"""
+
+import threading
+import time
+
+from bittrex.bittrex import API_V2_0
+from bittrex.history import DEPOSIT_HISTORY, WITHDRAWAL_HISTORY, RECORD_KEYS
+
+HEALTH = 'health'
+
+# event changes
+NEW = 'new'
+UPDATED = 'updated'
+PAUSED = 'paused'
+RESUMED = 'resumed'
+
+# event types
+EVENT_TYPES = {
+    DEPOSIT_HISTORY: 'deposit',
+    WITHDRAWAL_HISTORY: 'withdrawal',
+    HEALTH: 'health',
+}
+
+
+def withdrawal_pending(record):
+    """
+    Whether a withdrawal record is still waiting to be paid
+    """
+    if record.get('Canceled') or record.get('InvalidAddress'):
+        return False
+    return bool(record.get('PendingPayment')) or not record.get('TxId')
+
+
+def _wallet_health(entry):
+    # v2.0 wraps every entry as {'Health': {...}, 'Currency': {...}}
+    return entry.get('Health', entry)
+
+
+class TransferWatcher(object):
+    """
+    Emits deposit, withdrawal and wallet health changes of one account.
+
+    A sweep fetches the complete deposit and withdrawal histories, and the
+    pending deposits and withdrawals under v2.0, in one call each.  Any
+    (history, currency) with pending records is then polled every
+    fast_interval until nothing is pending anymore.  The first sweep only
+    records the existing history; events are emitted for what changes after.
+    A failed sweep is retried after fast_interval, a failed health check at
+    the next health_interval.
+    """
+
+    def __init__(self, bittrex, on_event=None, currencies=None, fast_interval=10.0, sweep_interval=300.0,
+                 health_interval=300.0, clock=time.time):
+        """
+        :param on_event: called with each event dict, events are only returned by poll when None
+        :type on_event: callable
+        :param currencies: currencies to watch, all when None
+        :type currencies: list
+        """
+        self.bittrex = bittrex
+        self.on_event = on_event
+        self.currencies = set(currencies) if currencies else None
+        self.fast_interval = fast_interval
+        self.sweep_interval = sweep_interval
+        self.health_interval = health_interval
+        self.clock = clock
+        self.records = {DEPOSIT_HISTORY: {}, WITHDRAWAL_HISTORY: {}}
+        self.pending = {}  # (history, currency) -> time of the next fast poll
+        self.paused = set()
+        self.calls = 0
+        self._synced = set()  # histories whose existing records were recorded
+        self._next_sweep = None
+        self._next_health = None
+        self._stop = threading.Event()
+        self._worker = None
+
+    def _watched(self, currency):
+        return self.currencies is None or currency in self.currencies
+
+    def _query(self, method, currency=None):
+        self.calls += 1
+        response = method(currency) if currency else method()
+        if not response['success']:
+            return None
+        return response['result'] or []
+
+    def _history_method(self, history):
+        if history == DEPOSIT_HISTORY:
+            return self.bittrex.get_deposit_history
+        return self.bittrex.get_withdrawal_history
+
+    def _pending_method(self, history):
+        if history == DEPOSIT_HISTORY:
+            return self.bittrex.get_pending_deposits
+        return self.bittrex.get_pending_withdrawals
+
+    def _merge(self, history, records, events, initial=False):
+        """
+        Record changes and return the currencies with pending records
+        """
+        id_field = RECORD_KEYS[history][0]
+        known = self.records[history]
+        pending = set()
+        for record in records:
+            currency = record.get('Currency')
+            if not self._watched(currency):
+                continue
+            if history == WITHDRAWAL_HISTORY and withdrawal_pending(record):
+                pending.add(currency)
+            previous = known.get(record[id_field])
+            if previous == record:
+                continue
+            known[record[id_field]] = record
+            if not initial:
+                events.append({
+                    'type': EVENT_TYPES[history],
+                    'change': NEW if previous is None else UPDATED,
+                    'currency': currency,
+                    'record': record,
+                })
+        return pending
+
+    def _pending(self, history, currency, events):
+        """
+        Whether (history, currency) still has pending records; None when a call failed
+        """
+        if self.bittrex.api_version == API_V2_0:
+            records = self._query(self._pending_method(history), currency)
+            if records is None:
+                return None
+            if records:
+                self._merge(history, records, events)
+                return True
+        # pending deposits are only listed by their own endpoint, the history shows them once credited
+        records = self._query(self._history_method(history), currency)
+        if records is None:
+            return None
+        return currency in self._merge(history, records, events)
+
+    def sweep(self, events=None):
+        """
+        Fetch the histories and pending records of all currencies
+
+        :return: events
+        :rtype: list
+        """
+        events = [] if events is None else events
+        # a failed sweep is retried sooner, but not on every poll
+        self._next_sweep = self.clock() + self.fast_interval
+        for history in (DEPOSIT_HISTORY, WITHDRAWAL_HISTORY):
+            initial = history not in self._synced
+            records = self._query(self._history_method(history))
+            if records is None:
+                return events
+            pending = self._merge(history, records, events, initial)
+            if self.bittrex.api_version == API_V2_0:
+                records = self._query(self._pending_method(history))
+                if records is None:
+                    return events
+                self._merge(history, records, events, initial)
+                pending.update(record.get('Currency') for record in records if self._watched(record.get('Currency')))
+            now = self.clock()
+            for currency in pending:
+                self.pending.setdefault((history, currency), now + self.fast_interval)
+            self._synced.add(history)
+        self._next_sweep = self.clock() + self.sweep_interval
+        return events
+
+    def check_health(self, events=None):
+        """
+        Pause currencies whose wallet is not active, resume recovered ones.
+        Only available under v2.0.
+
+        :return: events
+        :rtype: list
+        """
+        events = [] if events is None else events
+        self._next_health = self.clock() + self.health_interval
+        records = self._query(self.bittrex.get_wallet_health)
+        if records is None:
+            return events
+        for entry in records:
+            health = _wallet_health(entry)
+            currency = health.get('Currency')
+            if not self._watched(currency):
+                continue
+            active = health.get('IsActive', True)
+            if not active and currency not in self.paused:
+                self.paused.add(currency)
+                events.append({'type': EVENT_TYPES[HEALTH], 'change': PAUSED, 'currency': currency, 'record': health})
+            elif active and currency in self.paused:
+                self.paused.discard(currency)
+                events.append({'type': EVENT_TYPES[HEALTH], 'change': RESUMED, 'currency': currency,
+                               'record': health})
+        return events
+
+    def poll(self):
+        """
+        Make the calls that are due
+
+        :return: events, also passed to on_event
+        :rtype: list
+        """
+        events = []
+        now = self.clock()
+        if self.bittrex.api_version == API_V2_0 and (self._next_health is None or now >= self._next_health):
+            self.check_health(events)
+        if self._next_sweep is None or now >= self._next_sweep:
+            self.sweep(events)
+        else:
+            for key, due in sorted(self.pending.items()):
+                history, currency = key
+                if due > now or currency in self.paused:
+                    continue
+                still_pending = self._pending(history, currency, events)
+                if still_pending is False:
+                    del self.pending[key]
+                else:
+                    self.pending[key] = self.clock() + self.fast_interval
+        if self.on_event is not None:
+            for event in events:
+                self.on_event(event)
+        return events
+
+    def next_poll(self):
+        """
+        Time of the next call that is due
+        """
+        now = self.clock()
+        due = [now if self._next_sweep is None else self._next_sweep]
+        if self.bittrex.api_version == API_V2_0:
+            due.append(now if self._next_health is None else self._next_health)
+        due.extend(when for (_, currency), when in self.pending.items() if currency not in self.paused)
+        return min(due)
+
+    def run(self):
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(max(0.1, self.next_poll() - self.clock()))
+
+    def start(self):
+        """
+        Poll in a background thread
+        """
+        self._stop.clear()
+        self._worker = threading.Thread(target=self.run, name='bittrex-watcher')
+        self._worker.daemon = True
+        self._worker.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()